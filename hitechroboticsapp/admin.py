@@ -2,6 +2,7 @@ from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 from modeltranslation.admin import TranslationAdmin, InlineModelAdmin
 from .models import *
+from .pagination import EstimatedCountPaginator
 
 
 # --- Inline Images ---
@@ -47,6 +48,11 @@ class ProductAdmin(TranslationAdmin):
                      'is_available_for_sale')
     list_filter = ('product_category',
                    'created_at')
+    list_select_related = ('product_category',)
+    # Also what the product autocomplete widgets search.
+    search_fields = ('product_name_en', 'product_name_ru', 'product_name_uz', 'slug')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
     inlines = [NavigationShowcaseInline, ProductFeatureCardInline]
 
 
@@ -60,6 +66,12 @@ class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'full_name', 'product', 'order_type', 'created_at')
     list_display_links = ('full_name',)
     list_filter = ('order_type', 'created_at')
+    list_select_related = ('product',)
+    autocomplete_fields = ('product',)
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     # readonly_fields = ('product', 'full_name', 'company_name', 'email', 'phone', 'order_type', 'message', 'created_at')
 
 
@@ -67,6 +79,10 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ('id', 'full_name', 'created_at')
     list_display_links = ('id',)
     list_filter = ('created_at',)
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 class HighlightItemInline(admin.TabularInline):
@@ -77,6 +93,8 @@ class HighlightItemInline(admin.TabularInline):
 class HighlightAdmin(admin.ModelAdmin):
     inlines = [HighlightItemInline]
     list_display = ['product', 'title']
+    list_select_related = ('product',)
+    autocomplete_fields = ('product',)
     exclude = ('title',)
 
 
@@ -107,6 +125,8 @@ class ShowroomLocationAdmin(admin.ModelAdmin):
 class AdditionalDeviceAdmin(admin.ModelAdmin):
     list_display = ('title', 'product', 'order')
     list_display_links = ('title',)
+    list_select_related = ('product',)
+    autocomplete_fields = ('product',)
     exclude = ('title', 'description')
 
 
@@ -142,7 +162,12 @@ class ServiceInline(admin.TabularInline):
 
 @admin.register(RobotModel3D)
 class RobotModel3DAdmin(admin.ModelAdmin):
-    list_display = ('glb_file',)
+    list_display = ('glb_file', 'product', 'lod', 'byte_size', 'triangle_count', 'max_texture_size')
+    list_filter = ('lod',)
+    list_select_related = ('product',)
+    autocomplete_fields = ('product',)
+    readonly_fields = ('content_hash', 'byte_size', 'mesh_count', 'primitive_count', 'triangle_count',
+                       'max_texture_size', 'metadata')
 
 
 @admin.register(AboutCompany)
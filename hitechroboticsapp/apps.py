@@ -6,4 +6,6 @@ class HitechroboticsappConfig(AppConfig):
     name = 'hitechroboticsapp'
 
     def ready(self):
+        import hitechroboticsapp.checks
         import hitechroboticsapp.translation
+        import hitechroboticsapp.signals
@@ -0,0 +1,200 @@
+"""
+Async variant of ``spline_proxy`` for ASGI deployments (needs ``httpx``).
+
+Cached copies are served exactly like the sync view. On a cold cache the upstream
+body is streamed to the client chunk by chunk through a shared ``httpx.AsyncClient``
+while being written into the disk cache, so no worker thread is held for the
+download. Like the sync proxy the cold fetch is single-flight: one request per URL
+fetches (an ``asyncio.Event`` within the event loop, the cache's ``flock`` across
+workers) and the others wait for its copy. At most ``SPLINE_PROXY_MAX_UPSTREAM``
+upstream fetches run at once per event loop. Disk I/O runs in threads.
+
+The upstream slot, the lock and the upstream response are released in ``finally``
+blocks, from the request's arrival up to the hand-off to the streaming generator.
+The view primes the generator before returning it, so from then on its own
+``finally`` runs. That happens when the stream ends, when Django cancels it on a
+disconnect, or when the unstarted response is dropped and the event loop closes
+the generator.
+"""
+import asyncio
+from contextlib import suppress
+
+import httpx
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.views.decorators.clickjacking import xframe_options_exempt
+
+from .models import SplineModelUrl
+from .proxy import (
+    CHUNK_SIZE,
+    FORWARDED_HEADERS,
+    SPLINE_PROXY_TIMEOUT,
+    cached_response,
+    spline_cache,
+    spline_target_url,
+)
+
+SPLINE_PROXY_MAX_UPSTREAM = getattr(settings, 'SPLINE_PROXY_MAX_UPSTREAM', 8)
+SPLINE_PROXY_QUEUE_TIMEOUT = getattr(settings, 'SPLINE_PROXY_QUEUE_TIMEOUT', 10)
+# How often a request waiting on another worker's fetch looks for the new copy.
+LOCK_POLL_INTERVAL = 0.1
+
+# Clients and semaphores are bound to the event loop that created them.
+_loop_state = {}
+
+
+def loop_state():
+    loop = asyncio.get_running_loop()
+    state = _loop_state.get(loop)
+    if state is None:
+        connect, read = SPLINE_PROXY_TIMEOUT
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=SPLINE_PROXY_MAX_UPSTREAM),
+        )
+        # url -> Event set when the fetch in flight in this loop finishes.
+        state = _loop_state[loop] = (client, asyncio.Semaphore(SPLINE_PROXY_MAX_UPSTREAM), {})
+    return state
+
+
+def upstream_failed(message):
+    return HttpResponse(message, status=502, content_type="text/plain; charset=utf-8")
+
+
+def busy(message):
+    return HttpResponse(message, status=503, content_type="text/plain; charset=utf-8")
+
+
+async def serve_cached(request, url, headers):
+    """Response for the cached copy of ``url``, or None on a miss."""
+    meta = await asyncio.to_thread(spline_cache.load, url)
+    if meta is None:
+        return None
+    if not spline_cache.is_fresh(meta) and spline_cache.breaker.allow():
+        spline_cache.refresh_in_background(url, headers, meta)
+    return await asyncio.to_thread(cached_response, request, meta)
+
+
+@xframe_options_exempt
+async def spline_proxy_async(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    obj = await SplineModelUrl.objects.afirst()
+    spline_url = spline_target_url(obj)
+    headers = {
+        "User-Agent": request.META.get("HTTP_USER_AGENT", "Mozilla/5.0"),
+        "Accept": request.META.get("HTTP_ACCEPT", "*/*"),
+    }
+
+    response = await serve_cached(request, spline_url, headers)
+    if response is not None:
+        return response
+    if not spline_cache.breaker.allow():
+        return upstream_failed("Upstream request failed: upstream is failing, retry later")
+    return await fetch(request, spline_url, headers)
+
+
+async def fetch(request, url, headers):
+    client, slots, fetching = loop_state()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SPLINE_PROXY_QUEUE_TIMEOUT
+
+    while True:
+        done = fetching.get(url)
+        if done is None:
+            unlock = await asyncio.to_thread(spline_cache.try_lock, url)
+            if unlock is not None:
+                break
+        # Another request, here or in another worker, is fetching: wait for its copy.
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return busy("Upstream fetch in progress, retry later")
+        if done is not None:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(done.wait(), remaining)
+        else:
+            await asyncio.sleep(min(LOCK_POLL_INTERVAL, remaining))
+        response = await serve_cached(request, url, headers)
+        if response is not None:
+            return response
+
+    done = fetching[url] = asyncio.Event()
+    acquired = handed_off = False
+    upstream = None
+
+    def release():
+        if acquired:
+            slots.release()
+        unlock()
+        if fetching.get(url) is done:
+            del fetching[url]
+        done.set()
+
+    try:
+        # Whoever held the lock may have just filled the cache.
+        response = await serve_cached(request, url, headers)
+        if response is not None:
+            return response
+
+        try:
+            await asyncio.wait_for(slots.acquire(), max(0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            return busy("Too many upstream fetches in flight")
+        acquired = True
+
+        try:
+            upstream = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+        except httpx.HTTPError as e:
+            spline_cache.breaker.record_failure()
+            return upstream_failed(f"Upstream request failed: {e}")
+
+        content_type = upstream.headers.get("Content-Type", "text/html; charset=utf-8")
+        if upstream.status_code != 200:
+            content = await upstream.aread()
+            if upstream.status_code >= 500:
+                spline_cache.breaker.record_failure()
+            return HttpResponse(content, status=upstream.status_code, content_type=content_type)
+
+        body = await asyncio.to_thread(spline_cache.new_body_path, url)
+        stream = relay(upstream, url, body, release)
+        await anext(stream)
+        handed_off = True
+    finally:
+        if not handed_off:
+            try:
+                if upstream is not None:
+                    await upstream.aclose()
+            finally:
+                release()
+
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    for header in FORWARDED_HEADERS:
+        if header in upstream.headers:
+            response[header] = upstream.headers[header]
+    return response
+
+
+async def relay(upstream, url, body, release):
+    """Streams ``upstream`` to the client while writing it to ``body``, then commits the copy."""
+    complete = False
+    fh = None
+    try:
+        yield  # primed by fetch(); everything below runs as the client reads
+        fh = await asyncio.to_thread(open, body, "wb")
+        async for chunk in upstream.aiter_bytes(CHUNK_SIZE):
+            await asyncio.to_thread(fh.write, chunk)
+            yield chunk
+        await asyncio.to_thread(fh.close)
+        complete = True
+    finally:
+        try:
+            await upstream.aclose()
+            if fh is not None:
+                fh.close()
+            if complete:
+                await asyncio.to_thread(spline_cache.commit, url, body, upstream.headers)
+            else:
+                await asyncio.to_thread(body.unlink, missing_ok=True)
+        finally:
+            release()
@@ -0,0 +1,254 @@
+"""
+Endpoint benchmark over every route in ``hitechroboticsapp/urls.py``.
+
+Each route is requested through Django's test client (no network, no server):
+``warmup`` untimed requests, then ``iterations`` timed ones. Results hold the
+p50/p95/p99/mean latency, the SQL queries per request, the response size and
+the peak Python heap (``tracemalloc``) of one extra request, so the timed
+requests don't pay for tracing. ``--cold`` empties the cache and the in-process
+snapshot store before every request. Results are JSON and ``compare()`` flags
+regressions against a previous run.
+"""
+import math
+import platform
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+from django.utils.timezone import now
+
+from .caching import content_snapshots
+from .models import Category, ContactMessage, Order, Product, RobotModel3D
+from .urls import urlpatterns
+
+# Routes that need something outside the process.
+SKIPPED_ROUTES = {
+    'spline-proxy': "fetches the scene from the Spline CDN",
+}
+ADMIN_ROUTES = {'metrics'}
+
+
+@dataclass
+class Case:
+    name: str
+    path: str
+    method: str = 'get'
+    data: dict = None
+    admin: bool = False
+
+
+@dataclass
+class Result:
+    name: str
+    path: str
+    method: str
+    status: int
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    queries: int
+    bytes: int
+    peak_kb: float
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile: the ceil(fraction * n)-th value (rounded first so 0.07 * 100 stays rank 7).
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    index = max(0, min(len(sorted_values) - 1, rank - 1))
+    return sorted_values[index]
+
+
+def fixtures():
+    """Sample URL arguments and payloads taken from the database."""
+    product = Product.objects.order_by('id').first()
+    category = Category.objects.filter(product__isnull=False).order_by('id').first()
+    model = RobotModel3D.objects.exclude(content_hash='').order_by('id').first()
+    if product is None or category is None:
+        raise LookupError("No products to benchmark against; run seed_catalog first.")
+    return {
+        'slug': product.slug,
+        'category': category.slug,
+        'product_id': product.id,
+        'product_name': product.product_name_en.split()[0],
+        'digest': model.content_hash if model else None,
+    }
+
+
+def cases(language='en'):
+    """Benchmark cases for every named route, with the query strings worth timing separately."""
+    sample = fixtures()
+    variants = {
+        'product-list': ['', f'?category={sample["category"]}', '?is_available_for_sale=true', '?page=5',
+                         '?cursor='],
+        'product-search': [f'?q={sample["product_name"]}'],
+        'product-feed': ['?format=ndjson', '?format=csv'],
+        'category-products': ['', '?cursor='],
+        'robot_file': ['', '?lod=low'],
+    }
+    arguments = {
+        'product-detail': {'slug': sample['slug']},
+        'category-products': {'slug': sample['category']},
+        'robot-glb-file': {'digest': sample['digest']},
+    }
+    payloads = {
+        'submit-order': {'product': sample['product_id'], 'full_name': 'Benchmark Customer',
+                         'email': 'bench@seed.invalid', 'phone': '+998900000000', 'order_type': 'buy',
+                         'message': 'Benchmark order'},
+        'contact-message': {'full_name': 'Benchmark Visitor', 'email': 'bench@seed.invalid',
+                            'phone_number': '+998910000000', 'message': 'Benchmark message'},
+    }
+
+    found, skipped = [], {}
+    with translation.override(language):
+        for pattern in urlpatterns:
+            name = pattern.name
+            if name in SKIPPED_ROUTES:
+                skipped[name] = SKIPPED_ROUTES[name]
+                continue
+            kwargs = arguments.get(name, {})
+            if None in kwargs.values():
+                skipped[name] = "no sample data for its URL arguments"
+                continue
+            path = reverse(name, kwargs=kwargs)
+            if name in payloads:
+                found.append(Case(name, path, method='post', data=payloads[name]))
+                continue
+            for query in variants.get(name, ['']):
+                found.append(Case(f'{name}{query}', path + query, admin=name in ADMIN_ROUTES))
+    return found, skipped
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Runner:
+
+    def __init__(self, iterations=50, warmup=5, cold=False, staff_user=None):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.cold = cold
+        self.client = Client()
+        self.admin_client = Client()
+        if staff_user is not None:
+            self.admin_client.force_login(staff_user)
+        self._requests = 0
+
+    def request(self, case):
+        if self.cold:
+            cache.clear()
+            content_snapshots.clear()
+        self._requests += 1
+        n = self._requests
+        # A fresh client address per request keeps the throttles out of the numbers.
+        extra = {'REMOTE_ADDR': f'10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}'}
+        client = self.admin_client if case.admin else self.client
+        if case.method == 'post':
+            response = client.post(case.path, case.data, content_type='application/json', **extra)
+        else:
+            response = client.get(case.path, **extra)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response.status_code, len(body)
+
+    def run(self, case):
+        for _ in range(self.warmup):
+            self.request(case)
+
+        samples = []
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            for _ in range(self.iterations):
+                started = time.perf_counter()
+                status, size = self.request(case)
+                samples.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        try:
+            self.request(case)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        ordered = sorted(samples)
+        return Result(
+            name=case.name, path=case.path, method=case.method.upper(), status=status,
+            iterations=self.iterations,
+            p50_ms=round(percentile(ordered, 0.50), 3),
+            p95_ms=round(percentile(ordered, 0.95), 3),
+            p99_ms=round(percentile(ordered, 0.99), 3),
+            mean_ms=round(sum(samples) / len(samples), 3),
+            queries=round(counter.count / self.iterations),
+            bytes=size,
+            peak_kb=round(peak / 1024, 1),
+        )
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'revision': git_revision(),
+        'date': now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connections['default'].vendor,
+        'dataset': {
+            'products': Product.objects.count(),
+            'orders': Order.objects.count(),
+            'contact_messages': ContactMessage.objects.count(),
+        },
+    }
+
+
+def report(results, skipped, run_settings):
+    return {
+        'environment': environment(),
+        'settings': run_settings,
+        'results': {result.name: asdict(result) for result in results},
+        'skipped': skipped,
+    }
+
+
+def compare(baseline, current, threshold=0.2, min_delta_ms=1.0):
+    """
+    Regressions of ``current`` against ``baseline`` (both ``report()`` dicts):
+    more queries per request, a different status, or a p50/p95 slower by more
+    than ``threshold`` (relative) and ``min_delta_ms`` (absolute).
+    """
+    regressions = []
+    for name, after in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        if after['status'] != before['status']:
+            regressions.append(f"{name}: status {before['status']} -> {after['status']}")
+        if after['queries'] > before['queries']:
+            regressions.append(f"{name}: queries {before['queries']} -> {after['queries']}")
+        for metric in ('p50_ms', 'p95_ms'):
+            old, new = before[metric], after[metric]
+            if new - old > min_delta_ms and new > old * (1 + threshold):
+                regressions.append(f"{name}: {metric} {old:.2f} -> {new:.2f} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
@@ -0,0 +1,164 @@
+import hashlib
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.utils.timezone import now
+
+from .compression import compressed_variants
+from .models import CatalogVersion, ContentVersion
+from .renderers import EncodedResponse, encode_json
+
+PRODUCT_DETAIL_CACHE_TIMEOUT = getattr(settings, 'PRODUCT_DETAIL_CACHE_TIMEOUT', 60 * 60 * 24)
+CONTENT_SNAPSHOT_TTL = getattr(settings, 'CONTENT_SNAPSHOT_TTL', 5)
+CATALOG_VERSION_TTL = getattr(settings, 'CATALOG_VERSION_TTL', 5)
+
+
+class VersionStamp:
+    """
+    (version, modified-at) of a single-row version model (CatalogVersion,
+    ContentVersion), re-read at most once per ``ttl`` seconds in each process.
+    Versions are random tokens, so a row created afresh (empty or restored
+    database) never matches keys or ETags issued under an older one.
+    """
+
+    def __init__(self, model, ttl):
+        self.model = model
+        self.ttl = ttl
+        self._stamp = None
+        self._checked_at = 0.0
+
+    def current(self):
+        if self._stamp is None or time.monotonic() - self._checked_at >= self.ttl:
+            row, _ = self.model.objects.get_or_create(pk=1, defaults={'version': uuid4().hex})
+            self._stamp = (row.version, row.updated_at)
+            self._checked_at = time.monotonic()
+        return self._stamp
+
+    def bump(self):
+        version = uuid4().hex
+        if not self.model.objects.filter(pk=1).update(version=version, updated_at=now()):
+            self.model.objects.get_or_create(pk=1, defaults={'version': version})
+        self.expire()
+
+    def expire(self):
+        # Forces the next lookup in this process to re-read the version row.
+        self._stamp = None
+
+
+catalog_version = VersionStamp(CatalogVersion, CATALOG_VERSION_TTL)
+
+
+def get_catalog_stamp():
+    """Current catalog (version, modified-at) pair; other workers see a bump within CATALOG_VERSION_TTL."""
+    return catalog_version.current()
+
+
+def get_catalog_version():
+    return get_catalog_stamp()[0]
+
+
+def bump_catalog_version():
+    catalog_version.bump()
+
+
+def product_detail_cache_key(request, slug):
+    # Serializers build absolute media URLs, so the host is part of the payload.
+    return 'hitechrobotics:product-detail-body:{}:{}:{}:{}'.format(
+        get_catalog_version(),
+        request.LANGUAGE_CODE,
+        request.build_absolute_uri('/'),
+        slug,
+    )
+
+
+class ContentSnapshots:
+    """
+    Per-process store of rendered singleton payloads.
+
+    Every entry remembers the ContentVersion it was built under. The version row
+    is read at most once per ``ttl`` seconds, so a warm worker answers from memory
+    with no queries, and with a single one-row query once the TTL runs out.
+    """
+
+    def __init__(self, ttl):
+        self.version = VersionStamp(ContentVersion, ttl)
+        self._entries = {}
+
+    def current_stamp(self):
+        """(version, updated_at) of the ContentVersion row, re-read once per TTL."""
+        return self.version.current()
+
+    def current_version(self):
+        return self.current_stamp()[0]
+
+    def get(self, key, build):
+        version = self.current_version()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = build()
+        self._entries[key] = (version, value)
+        return value
+
+    def expire(self):
+        self.version.expire()
+
+    def clear(self):
+        # Drops every snapshot as well, so the next lookups rebuild them from the database.
+        self._entries.clear()
+        self.expire()
+
+
+content_snapshots = ContentSnapshots(CONTENT_SNAPSHOT_TTL)
+
+
+def bump_content_version():
+    content_snapshots.version.bump()
+
+
+def snapshot_response(request, name, build):
+    """
+    Returns the snapshot of ``name`` for the request's language and host, calling
+    ``build()`` (which returns a DRF Response) only when the snapshot is stale.
+    Snapshots hold the encoded JSON and its compressed copies, so a hit neither
+    serializes, encodes nor compresses.
+    """
+    def render():
+        response = build()
+        return compressed_variants(encode_json(response.data)), response.status_code
+
+    variants, status_code = content_snapshots.get(
+        (name, request.LANGUAGE_CODE, request.build_absolute_uri('/')),
+        render,
+    )
+    return EncodedResponse(variants, status=status_code)
+
+
+def _etag(version, request, *parts):
+    # One representation per version, language, host and query string (plus any ``parts``).
+    key = ':'.join(str(part) for part in (
+        version,
+        request.LANGUAGE_CODE,
+        request.build_absolute_uri('/'),
+        request.get_full_path(),
+        *parts,
+    ))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def catalog_etag(request, *args, **kwargs):
+    # List and search payloads label specs and categories by Accept-Language, not by the URL prefix.
+    return _etag(get_catalog_version(), request, request.META.get('HTTP_ACCEPT_LANGUAGE', 'en')[:2])
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    return get_catalog_stamp()[1]
+
+
+def content_etag(request, *args, **kwargs):
+    return _etag(content_snapshots.current_version(), request)
+
+
+def content_last_modified(request, *args, **kwargs):
+    return content_snapshots.current_stamp()[1]
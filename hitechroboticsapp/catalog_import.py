@@ -0,0 +1,362 @@
+"""
+Bulk catalog import from a bundle directory.
+
+A bundle is a ``catalog.json`` plus the image files it references::
+
+    {
+      "categories": [{"slug": "dogs", "name_en": "Dogs", "name_ru": "...", "description_en": "..."}],
+      "products": [{
+        "slug": "go2",                        # optional, derived from product_name_en
+        "category": "dogs",
+        "product_name_en": "...", "product_name_ru": "...", "product_description_en": "...",
+        "product_speed": 5, "weight_kg": 15.0, ...,   # any other Product field
+        "product_image": "images/go2.jpg",    # paths relative to the bundle
+        "features": {"title_en": "...", "subtitle_en": "...", "img1": "...", "img2": "...", "img3": "...",
+                     "paragraphs": [{"before_en": "...", "highlight_en": "...", "after_en": "..."}]},
+        "feature_cards": [{"title_en": "...", "desc_en": "..."}],
+        "showcases": [{"title_en": "...", "description_en": "...", "image": "..."}],
+        "accessories": [{"title_en": "...", "description_en": "...", "image": "...", "order": 0}]
+      }]
+    }
+
+Categories and products are upserted by slug; products whose derived slug
+repeats inside the bundle get ``-2``, ``-3``... suffixes. A child list given for
+a product replaces that product's rows, an omitted one (or an omitted
+translation) is left alone. Images are
+hashed and copied to content-hash storage names by a thread pool, and every
+table is written with batched ``bulk_create``/``bulk_update`` in one transaction.
+"""
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import translation
+from django.utils.text import slugify
+from django.utils.timezone import now
+
+from .caching import bump_catalog_version
+from .feed import PLAIN_FIELDS
+from .models import (
+    AdditionalDevice,
+    Category,
+    FeatureParagraph,
+    NavigationShowcase,
+    Product,
+    ProductFeature,
+    ProductFeatureCard,
+)
+from .specs import build_spec_sheets
+
+LANGUAGES = ('en', 'ru', 'uz')
+DEFAULT_LANGUAGE = 'en'
+IMPORT_BATCH_SIZE = 500
+
+PRODUCT_TRANSLATED = ('product_name', 'product_description')
+PRODUCT_IMAGES = ('product_image', 'landing_image')
+CATEGORY_TRANSLATED = ('name', 'description')
+FEATURE_TRANSLATED = ('title', 'subtitle')
+FEATURE_IMAGES = ('img1', 'img2', 'img3')
+PARAGRAPH_TRANSLATED = ('before', 'highlight', 'after')
+# bundle key -> (model, translated fields, plain fields, image fields)
+CHILD_LISTS = {
+    'feature_cards': (ProductFeatureCard, ('title', 'desc'), (), ()),
+    'showcases': (NavigationShowcase, ('title', 'description'), (), ('image',)),
+    'accessories': (AdditionalDevice, ('title', 'description'), ('order',), ('image',)),
+}
+
+
+class BundleError(Exception):
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} problem(s) in the bundle:\n" + "\n".join(errors[:50]))
+
+
+def translated_fields(fields):
+    return [f'{field}_{lang}' for field in fields for lang in LANGUAGES]
+
+
+class CatalogImport:
+
+    def __init__(self, root, workers=8, batch_size=IMPORT_BATCH_SIZE, storage=default_storage):
+        self.root = Path(root)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.storage = storage
+        self.errors = []
+        self.images = {}  # (bundle path, upload_to) -> storage name
+        self.copies = []  # (bundle path, storage name) still to write
+
+    # -- reading and validation --
+
+    def load(self):
+        path = self.root / 'catalog.json'
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as exc:
+            raise BundleError([f"{path}: {exc}"])
+        self.categories = [self.category_values(r, f"categories[{i}]") for i, r in enumerate(data.get('categories', []))]
+        self.products = [self.product_plan(r, f"products[{i}]") for i, r in enumerate(data.get('products', []))]
+        self.resolve_slugs()
+        self.hash_images()
+        if self.errors:
+            raise BundleError(self.errors)
+        return self
+
+    def translated(self, record, fields, where, required=True):
+        values = {}
+        for field in fields:
+            default = record.get(f'{field}_{DEFAULT_LANGUAGE}', record.get(field))
+            if default not in (None, ''):
+                values[f'{field}_{DEFAULT_LANGUAGE}'] = default
+            elif required:
+                self.errors.append(f"{where}: {field}_{DEFAULT_LANGUAGE} is required")
+            # Languages missing from the record keep their current value on update.
+            for lang in LANGUAGES:
+                if lang != DEFAULT_LANGUAGE and f'{field}_{lang}' in record:
+                    values[f'{field}_{lang}'] = record[f'{field}_{lang}']
+        return values
+
+    def plain(self, model, record, fields, where):
+        values = {}
+        for name in fields:
+            if name not in record:
+                continue
+            field = model._meta.get_field(name)
+            try:
+                values[name] = field.clean(record[name], None)
+            except ValidationError as exc:
+                self.errors.append(f"{where}.{name}: {'; '.join(exc.messages)}")
+        return values
+
+    def image(self, record, name, model, where, required=False):
+        relative = record.get(name)
+        if not relative:
+            if required:
+                self.errors.append(f"{where}: {name} is required")
+            return {}
+        if not (self.root / relative).is_file():
+            self.errors.append(f"{where}.{name}: {relative} not found in the bundle")
+            return {}
+        key = (relative, model._meta.get_field(name).upload_to)
+        self.images.setdefault(key, None)
+        return {name: key}
+
+    def category_values(self, record, where):
+        values = self.translated(record, CATEGORY_TRANSLATED, where)
+        values['slug'] = record.get('slug') or slugify(values[f'name_{DEFAULT_LANGUAGE}'] or '')
+        return values
+
+    def children(self, record, key, where):
+        model, translated, plain, images = CHILD_LISTS[key]
+        rows = []
+        for i, child in enumerate(record[key]):
+            child_where = f"{where}.{key}[{i}]"
+            values = self.translated(child, translated, child_where)
+            values.update(self.plain(model, child, plain, child_where))
+            for name in images:
+                values.update(self.image(child, name, model, child_where, required=True))
+            rows.append(values)
+        return rows
+
+    def product_plan(self, record, where):
+        # Checked against the database later: updates may leave these out.
+        values = self.translated(record, PRODUCT_TRANSLATED, where, required=False)
+        values.update(self.plain(Product, record, PLAIN_FIELDS, where))
+        for name in PRODUCT_IMAGES:
+            values.update(self.image(record, name, Product, where))
+        plan = {
+            'where': where,
+            'slug': record.get('slug'),
+            'category': record.get('category'),
+            'values': values,
+            'children': {key: self.children(record, key, where) for key in CHILD_LISTS if key in record},
+            'features': None,
+        }
+        if not plan['category']:
+            self.errors.append(f"{where}: category is required")
+        if 'features' in record:
+            feature = record['features']
+            feature_values = self.translated(feature, FEATURE_TRANSLATED, f"{where}.features")
+            for name in FEATURE_IMAGES:
+                feature_values.update(self.image(feature, name, ProductFeature, f"{where}.features", required=True))
+            paragraphs = [
+                self.translated(p, PARAGRAPH_TRANSLATED, f"{where}.features.paragraphs[{i}]")
+                for i, p in enumerate(feature.get('paragraphs', []))
+            ]
+            plan['features'] = (feature_values, paragraphs)
+        return plan
+
+    def resolve_slugs(self):
+        """Upsert keys: explicit or derived slugs, made unique within the bundle in memory."""
+        wanted = [plan['slug'] or slugify(plan['values'].get(f'product_name_{DEFAULT_LANGUAGE}', '')) or 'product'
+                  for plan in self.products]
+        taken = set()
+        for plan, slug in zip(self.products, wanted):
+            if plan['slug'] and slug in taken:
+                self.errors.append(f"{plan['where']}: slug {slug!r} appears twice in the bundle")
+            candidate, n = slug, 1
+            while candidate in taken:
+                n += 1
+                candidate = f"{slug}-{n}"
+            taken.add(candidate)
+            plan['slug'] = candidate
+        # Suffixes follow bundle order, so re-importing the same bundle updates the same rows.
+        existing = dict(Product.objects.filter(slug__in=taken).values_list('slug', 'id'))
+        for plan in self.products:
+            plan['existing_id'] = existing.get(plan['slug'])
+        required = [f'{field}_{DEFAULT_LANGUAGE}' for field in PRODUCT_TRANSLATED] + [
+            name for name in PLAIN_FIELDS
+            if not Product._meta.get_field(name).null and not Product._meta.get_field(name).has_default()
+        ]
+        for plan in self.products:
+            missing = [name for name in required if name not in plan['values']]
+            if plan['existing_id'] is None and missing:
+                self.errors.append(f"{plan['where']}: new product needs {', '.join(missing)}")
+
+        known = {c['slug'] for c in self.categories}
+        known |= set(Category.objects.filter(
+            slug__in={p['category'] for p in self.products if p['category']}
+        ).values_list('slug', flat=True))
+        for plan in self.products:
+            if plan['category'] and plan['category'] not in known:
+                self.errors.append(f"{plan['where']}: unknown category {plan['category']!r}")
+
+    def hash_images(self):
+        def name_for(key):
+            relative, upload_to = key
+            source = self.root / relative
+            digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+            return key, f"{upload_to}{digest}-{source.name}"
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for key, name in pool.map(name_for, list(self.images)):
+                self.images[key] = name
+        # Content-hash names: a stored file with the same name is the same image.
+        self.copies = [(relative, name) for (relative, _), name in self.images.items()
+                       if not self.storage.exists(name)]
+
+    # -- reporting --
+
+    def summary(self):
+        updates = sum(1 for p in self.products if p['existing_id'])
+        existing_categories = set(Category.objects.filter(
+            slug__in=[c['slug'] for c in self.categories]).values_list('slug', flat=True))
+        lines = [
+            f"Categories: {len(self.categories) - len(existing_categories)} to create, "
+            f"{len(existing_categories)} to update",
+            f"Products: {len(self.products) - updates} to create, {updates} to update",
+        ]
+        for plan in self.products:
+            lines.append(f"  {'~' if plan['existing_id'] else '+'} {plan['slug']}")
+        counts = {key: sum(len(p['children'].get(key, ())) for p in self.products) for key in CHILD_LISTS}
+        features = [p['features'] for p in self.products if p['features']]
+        lines.append(
+            f"Child rows: {len(features)} features ({sum(len(f[1]) for f in features)} paragraphs), "
+            + ", ".join(f"{count} {key.replace('_', ' ')}" for key, count in counts.items())
+        )
+        lines.append(f"Images: {len(self.images)} referenced, {len(self.copies)} to copy, "
+                     f"{len(self.images) - len(self.copies)} already stored")
+        return lines
+
+    # -- writing --
+
+    def copy_images(self):
+        def copy(item):
+            relative, name = item
+            with open(self.root / relative, 'rb') as fh:
+                return (relative, name), self.storage.save(name, File(fh))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            saved = dict(pool.map(copy, self.copies))
+        for key, name in list(self.images.items()):
+            self.images[key] = saved.get((key[0], name), name)
+
+    def resolve(self, values):
+        """Replaces image keys in ``values`` with their storage names."""
+        return {k: self.images[v] if isinstance(v, tuple) else v for k, v in values.items()}
+
+    def apply(self):
+        self.copy_images()
+        with translation.override(DEFAULT_LANGUAGE), transaction.atomic():
+            self.write_categories()
+            product_ids = self.write_products()
+            self.write_children(product_ids)
+            transaction.on_commit(bump_catalog_version)
+
+    def write_categories(self):
+        fields = translated_fields(CATEGORY_TRANSLATED) + list(CATEGORY_TRANSLATED) + ['updated_at']
+        existing = Category.objects.in_bulk([c['slug'] for c in self.categories], field_name='slug')
+        stamp = now()
+        new, changed = [], []
+        for values in self.categories:
+            category = existing.get(values['slug'])
+            if category is None:
+                new.append(Category(**values))
+            else:
+                for name, value in values.items():
+                    setattr(category, name, value)
+                # bulk_update skips save() and auto_now.
+                category.updated_at = stamp
+                changed.append(category)
+        Category.objects.bulk_create(new, batch_size=self.batch_size)
+        Category.objects.bulk_update(changed, fields, batch_size=self.batch_size)
+        # Products embed their category's names: resend them in incremental feeds as well.
+        Product.objects.filter(product_category__in=changed).update(updated_at=stamp)
+
+    def write_products(self):
+        categories = dict(Category.objects.filter(
+            slug__in={p['category'] for p in self.products}).values_list('slug', 'id'))
+        existing = Product.objects.in_bulk([p['existing_id'] for p in self.products if p['existing_id']])
+        stamp = now()
+        new, changed, update_fields = [], [], {'product_category', 'spec_sheets', 'updated_at'}
+        for plan in self.products:
+            values = self.resolve(plan['values'])
+            values['product_category_id'] = categories[plan['category']]
+            product = existing.get(plan['existing_id'])
+            if product is None:
+                product = Product(slug=plan['slug'], **values)
+                new.append(product)
+            else:
+                for name, value in values.items():
+                    setattr(product, name, value)
+                update_fields.update(name for name in values if name != 'product_category_id')
+                changed.append(product)
+            # bulk_* skip save(): fill in what it would have.
+            product.spec_sheets = build_spec_sheets(product)
+            product.updated_at = stamp
+
+        Product.objects.bulk_create(new, batch_size=self.batch_size)
+        if changed:
+            update_fields.update(PRODUCT_TRANSLATED)
+            Product.objects.bulk_update(changed, sorted(update_fields), batch_size=self.batch_size)
+        return dict(Product.objects.filter(slug__in=[p['slug'] for p in self.products]).values_list('slug', 'id'))
+
+    def write_children(self, product_ids):
+        for key, (model, *_rest) in CHILD_LISTS.items():
+            plans = [p for p in self.products if key in p['children']]
+            model.objects.filter(product_id__in=[product_ids[p['slug']] for p in plans]).delete()
+            model.objects.bulk_create(
+                [model(product_id=product_ids[p['slug']], **self.resolve(values))
+                 for p in plans for values in p['children'][key]],
+                batch_size=self.batch_size,
+            )
+
+        plans = [p for p in self.products if p['features']]
+        ids = [product_ids[p['slug']] for p in plans]
+        ProductFeature.objects.filter(product_id__in=ids).delete()
+        ProductFeature.objects.bulk_create(
+            [ProductFeature(product_id=product_ids[p['slug']], **self.resolve(p['features'][0])) for p in plans],
+            batch_size=self.batch_size,
+        )
+        feature_ids = dict(ProductFeature.objects.filter(product_id__in=ids).values_list('product_id', 'id'))
+        FeatureParagraph.objects.bulk_create(
+            [FeatureParagraph(feature_id=feature_ids[product_ids[p['slug']]], **values)
+             for p in plans for values in p['features'][1]],
+            batch_size=self.batch_size,
+        )
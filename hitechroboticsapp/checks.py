@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries are visible only to the worker that wrote them.
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Rendered product bodies live in the default cache; with a process-local one every worker renders its own."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f"The default cache ({backend}) is local to each process.",
+        hint="Cached product bodies stay correct, but every worker renders and keeps its own copy of each. "
+             "Set CACHE_BACKEND to a backend shared by all workers (file-based, Redis, Memcached) to share them.",
+        id='hitechroboticsapp.W001',
+    )]
@@ -0,0 +1,68 @@
+"""
+Content-coding helpers shared by the GLB files and the cached API payloads.
+
+``compressed_variants`` turns an encoded JSON body into ``{encoding: bytes}``
+once, when the body is cached, so ``EncodedResponse`` can answer every later
+request in the client's preferred coding without compressing again. Bodies
+under ``API_COMPRESSION_MIN_SIZE`` bytes are kept only as identity, and so are
+encodings that save less than ``MIN_SAVING``.
+"""
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional: gzip only
+    brotli = None
+
+API_COMPRESSION_MIN_SIZE = getattr(settings, 'API_COMPRESSION_MIN_SIZE', 1024)
+API_BROTLI_QUALITY = getattr(settings, 'API_BROTLI_QUALITY', 9)
+
+# Encoded copies that save less than this fraction of the original are not kept.
+MIN_SAVING = 0.05
+# Preferred first when the client accepts several.
+ENCODINGS = ('br', 'gzip')
+
+
+def compress(data, encoding, brotli_quality):
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return data
+
+
+def available_encodings():
+    return tuple(encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None)
+
+
+def compressed_variants(body):
+    """``{'identity': body, ...}`` plus the encodings worth keeping for ``body``."""
+    variants = {'identity': body}
+    if len(body) < API_COMPRESSION_MIN_SIZE:
+        return variants
+    for encoding in available_encodings():
+        compressed = compress(body, encoding, API_BROTLI_QUALITY)
+        if len(compressed) <= len(body) * (1 - MIN_SAVING):
+            variants[encoding] = compressed
+    return variants
+
+
+def accepted_encodings(request):
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(request, encodings):
+    accepted = accepted_encodings(request)
+    for encoding in ENCODINGS:
+        if encoding in encodings and (encoding in accepted or '*' in accepted):
+            return encoding
+    return 'identity'
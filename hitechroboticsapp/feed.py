@@ -0,0 +1,129 @@
+"""
+Streaming catalog feed for partners and the marketing site.
+
+Every product is written as one record with all translated fields, its
+category, the stored spec sheets of each language and absolute media URLs, as
+NDJSON (one JSON object per line) or CSV. Rows come from
+``QuerySet.iterator(chunk_size=...)`` and are encoded one at a time, so memory
+use does not grow with the catalog. ``since`` limits the feed to products
+updated after a timestamp (editing a category stamps its products, whose
+records embed its names); the watermark to pass next time is returned up front
+(``X-Feed-Watermark``), since the end of a stream cannot carry headers.
+"""
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .images import variant_urls
+from .media import media_resolver
+from .models import Product
+from .search import WATERMARK_SLACK
+from .specs import spec_sheet
+
+FEED_CHUNK_SIZE = 500
+FEED_FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+LANGUAGES = ('en', 'ru', 'uz')
+TRANSLATED_FIELDS = ('product_name', 'product_description')
+PLAIN_FIELDS = (
+    'product_quantity', 'product_speed', 'product_weight_lifting', 'weight_kg', 'dimensions_cm',
+    'protection_level', 'voice_recognition', 'front_light', 'carrying_strap', 'processor',
+    'cameras_sensors', 'camera_specs', 'wifi', 'bluetooth_version', 'battery_life_hours',
+    'battery_model', 'battery_capacity', 'battery_protection', 'is_available_for_rent',
+    'is_available_for_sale',
+)
+
+CSV_COLUMNS = (
+    ['id', 'slug', 'created_at', 'updated_at']
+    + [f'{field}_{lang}' for field in TRANSLATED_FIELDS for lang in LANGUAGES]
+    + ['category_slug'] + [f'category_name_{lang}' for lang in LANGUAGES]
+    + list(PLAIN_FIELDS)
+    + ['product_image', 'landing_image']
+    + [f'specs_{lang}' for lang in LANGUAGES]
+)
+
+
+def parse_since(value):
+    """Aware datetime from an ISO 8601 timestamp or date; ValueError when unparseable."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid since value: {value!r}")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def feed_queryset(since=None):
+    products = Product.objects.select_related('product_category').order_by('updated_at', 'id')
+    if since is not None:
+        products = products.filter(updated_at__gt=since)
+    return products
+
+
+def next_watermark():
+    # Rows are stamped before their transaction commits; look back a little next time.
+    return timezone.now() - WATERMARK_SLACK
+
+
+def product_record(product, request=None):
+    resolver = media_resolver(request)
+    category = product.product_category
+    record = {
+        'id': product.id,
+        'slug': product.slug,
+        'created_at': product.created_at,
+        'updated_at': product.updated_at,
+    }
+    for field in TRANSLATED_FIELDS:
+        for lang in LANGUAGES:
+            record[f'{field}_{lang}'] = getattr(product, f'{field}_{lang}')
+    record['category'] = {
+        'slug': category.slug,
+        **{f'name_{lang}': getattr(category, f'name_{lang}') for lang in LANGUAGES},
+    }
+    for field in PLAIN_FIELDS:
+        record[field] = getattr(product, field)
+    record['product_image'] = resolver.url(product.product_image)
+    record['landing_image'] = resolver.url(product.landing_image)
+    record['product_image_variants'] = variant_urls(product.product_image, request)
+    record['specs'] = {lang: spec_sheet(product, lang) for lang in LANGUAGES}
+    return record
+
+
+def csv_row(record):
+    row = dict(record, created_at=record['created_at'].isoformat(), updated_at=record['updated_at'].isoformat())
+    category = row.pop('category')
+    row['category_slug'] = category['slug']
+    for lang in LANGUAGES:
+        row[f'category_name_{lang}'] = category[f'name_{lang}']
+        row[f'specs_{lang}'] = json.dumps(record['specs'][lang], ensure_ascii=False)
+    return [row[column] for column in CSV_COLUMNS]
+
+
+class Echo:
+    """File-like object whose ``write`` hands the line back to the csv writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def feed_lines(products, fmt, request=None):
+    """Encoded feed lines (str) for ``products``, one product per line after the CSV header."""
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(CSV_COLUMNS)
+        for product in products.iterator(chunk_size=FEED_CHUNK_SIZE):
+            yield writer.writerow(csv_row(product_record(product, request)))
+    else:
+        for product in products.iterator(chunk_size=FEED_CHUNK_SIZE):
+            yield json.dumps(product_record(product, request), ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
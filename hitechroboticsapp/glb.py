@@ -0,0 +1,325 @@
+"""
+Delivery of RobotModel3D GLB files.
+
+Each RobotModel3D row is one level-of-detail variant of a robot (or of the
+site-wide model). At upload the GLB header and JSON chunk are parsed for mesh,
+primitive, triangle and texture figures, and ``client_lod`` maps the client's
+hints (Save-Data, device memory, viewport width) to the variant it should get.
+
+On upload the GLB is copied to a content-hash name under ``models/delivery/``
+together with gzip and (when the ``brotli`` package is installed) brotli encoded
+copies, so every URL can be cached immutably. ``glb_response`` negotiates the
+encoding, answers conditional and single ``Range`` requests with 304/206/416,
+and either streams the file from Django or hands it to the front server with
+``X-Accel-Redirect`` / ``X-Sendfile`` (which then does the range handling itself).
+"""
+import hashlib
+import io
+import json
+import logging
+import re
+import struct
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from PIL import Image, UnidentifiedImageError
+
+from .caching import bump_content_version
+from .compression import MIN_SAVING, available_encodings, choose_encoding, compress
+from .models import RobotModel3D
+
+logger = logging.getLogger(__name__)
+
+GLB_SENDFILE = getattr(settings, 'GLB_SENDFILE', None)
+GLB_ACCEL_PREFIX = getattr(settings, 'GLB_ACCEL_PREFIX', '/protected-media/')
+GLB_BROTLI_QUALITY = getattr(settings, 'GLB_BROTLI_QUALITY', 11)
+
+CONTENT_TYPE = 'model/gltf-binary'
+DIGEST_LENGTH = 16
+CHUNK_SIZE = 64 * 1024
+EXTENSIONS = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+GLB_MAGIC = b'glTF'
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+# Triangles drawn by a primitive of each mode for ``count`` indices/vertices.
+TRIANGLE_MODES = {
+    4: lambda count: count // 3,            # TRIANGLES
+    5: lambda count: max(0, count - 2),     # TRIANGLE_STRIP
+    6: lambda count: max(0, count - 2),     # TRIANGLE_FAN
+}
+
+LOD_NAMES = {
+    RobotModel3D.LOD_HIGH: 'high',
+    RobotModel3D.LOD_MEDIUM: 'medium',
+    RobotModel3D.LOD_LOW: 'low',
+}
+# Client hints the model endpoint varies on (and asks browsers to send via Accept-CH).
+HINT_HEADERS = ('Save-Data', 'Device-Memory', 'Sec-CH-Device-Memory', 'Viewport-Width', 'Sec-CH-Viewport-Width')
+LOW_MEMORY_GB = 2
+MEDIUM_MEMORY_GB = 4
+MEDIUM_VIEWPORT_PX = 1024
+
+
+def encode(data, encoding):
+    return compress(data, encoding, GLB_BROTLI_QUALITY)
+
+
+def image_info(image, gltf, binary):
+    info = {'mimeType': image.get('mimeType'), 'width': None, 'height': None, 'bytes': None}
+    view_index = image.get('bufferView')
+    if view_index is None or binary is None:
+        return info  # external or data: URI image
+    view = gltf['bufferViews'][view_index]
+    start = view.get('byteOffset', 0)
+    blob = binary[start:start + view['byteLength']]
+    info['bytes'] = len(blob)
+    try:
+        # Only the image header is decoded.
+        with Image.open(io.BytesIO(blob)) as picture:
+            info['width'], info['height'] = picture.size
+    except (UnidentifiedImageError, OSError):
+        pass  # KTX2 and other formats Pillow can't read
+    return info
+
+
+def glb_metadata(data):
+    """Model field values read from the GLB header, JSON chunk and embedded images."""
+    if len(data) < 20 or data[:4] != GLB_MAGIC:
+        raise ValueError("not a binary glTF file")
+    version, _length, json_length, json_type = struct.unpack_from('<IIII', data, 4)
+    if json_type != CHUNK_JSON:
+        raise ValueError("first GLB chunk is not JSON")
+    gltf = json.loads(data[20:20 + json_length])
+
+    binary = None
+    offset = 20 + json_length
+    if offset + 8 <= len(data):
+        bin_length, bin_type = struct.unpack_from('<II', data, offset)
+        if bin_type == CHUNK_BIN:
+            binary = memoryview(data)[offset + 8:offset + 8 + bin_length]
+
+    accessors = gltf.get('accessors', [])
+    meshes = gltf.get('meshes', [])
+    primitives = [primitive for mesh in meshes for primitive in mesh.get('primitives', [])]
+    triangles = 0
+    for primitive in primitives:
+        triangles_for = TRIANGLE_MODES.get(primitive.get('mode', 4))
+        index = primitive.get('indices', primitive.get('attributes', {}).get('POSITION'))
+        if triangles_for and index is not None and index < len(accessors):
+            triangles += triangles_for(accessors[index].get('count', 0))
+
+    textures = [image_info(image, gltf, binary) for image in gltf.get('images', [])]
+    edges = [max(t['width'], t['height']) for t in textures if t['width']]
+    return {
+        'byte_size': len(data),
+        'mesh_count': len(meshes),
+        'primitive_count': len(primitives),
+        'triangle_count': triangles,
+        'max_texture_size': max(edges, default=None),
+        'metadata': {
+            'version': version,
+            'generator': gltf.get('asset', {}).get('generator'),
+            'extensionsUsed': gltf.get('extensionsUsed', []),
+            'textures': textures,
+        },
+    }
+
+
+def build_glb_variants(instance, force=False):
+    """
+    Writes the content-hash copies of ``instance.glb_file`` and records them on the
+    row together with its GLB metadata. Skips files that already have variants
+    unless ``force`` is set.
+    """
+    glb = instance.glb_file
+    if not glb or (not force and instance.variants.get('source') == glb.name):
+        return False
+
+    storage = glb.storage
+    with storage.open(glb.name, 'rb') as fh:
+        data = fh.read()
+    digest = hashlib.sha256(data).hexdigest()[:DIGEST_LENGTH]
+
+    encodings = {}
+    for encoding in ('identity',) + available_encodings():
+        body = encode(data, encoding)
+        if encoding != 'identity' and len(body) > len(data) * (1 - MIN_SAVING):
+            continue
+        name = f"models/delivery/{digest}.glb{EXTENSIONS[encoding]}"
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(body))
+        encodings[encoding] = {'name': name, 'size': len(body)}
+
+    try:
+        fields = glb_metadata(data)
+    except (ValueError, KeyError, IndexError, struct.error) as exc:
+        logger.warning("Could not read GLB metadata of %s: %s", glb.name, exc)
+        fields = {'byte_size': len(data)}
+    fields.update(content_hash=digest, variants={'source': glb.name, 'encodings': encodings})
+    RobotModel3D.objects.filter(pk=instance.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(instance, name, value)
+    bump_content_version()
+    return True
+
+
+def generate_glb_variants(instance):
+    try:
+        build_glb_variants(instance)
+    except Exception:
+        logger.exception("Could not build GLB variants for %s", instance.glb_file.name)
+
+
+# digest -> variants; content-addressed, so entries never go stale.
+_manifests = {}
+
+
+def glb_variants(digest):
+    variants = _manifests.get(digest)
+    if variants is None:
+        row = RobotModel3D.objects.filter(content_hash=digest).values_list('variants', flat=True).first()
+        if not row or not row.get('encodings'):
+            return None
+        variants = _manifests[digest] = row
+    return variants
+
+
+def hint(request, header, param):
+    """Numeric client hint from ``Sec-CH-<header>``/``<header>`` or the ``param`` query parameter."""
+    meta_name = header.upper().replace('-', '_')
+    for value in (
+        request.META.get(f'HTTP_SEC_CH_{meta_name}'),
+        request.META.get(f'HTTP_{meta_name}'),
+        request.GET.get(param),
+    ):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def client_lod(request):
+    """
+    LOD for the client: ``?lod=`` wins, then Save-Data or little memory gets the low
+    variant, a mid-range device or narrow viewport the medium one. Hints can also be
+    passed as ``?save_data=1&memory=2&viewport=390`` by clients on another origin.
+    """
+    forced = {name: lod for lod, name in LOD_NAMES.items()}.get(request.GET.get('lod'))
+    if forced is not None:
+        return forced
+    save_data = request.META.get('HTTP_SAVE_DATA', '').strip().lower() == 'on' or request.GET.get('save_data') == '1'
+    memory = hint(request, 'Device-Memory', 'memory')
+    viewport = hint(request, 'Viewport-Width', 'viewport')
+    if save_data or (memory is not None and memory <= LOW_MEMORY_GB):
+        return RobotModel3D.LOD_LOW
+    if (memory is not None and memory <= MEDIUM_MEMORY_GB) or (viewport is not None and viewport < MEDIUM_VIEWPORT_PX):
+        return RobotModel3D.LOD_MEDIUM
+    return RobotModel3D.LOD_HIGH
+
+
+def pick_lod(models, wanted):
+    """
+    The newest model of each LOD, and among those the most detailed one that is not
+    heavier than ``wanted`` (the lightest available when all of them are).
+    """
+    by_lod = {}
+    for model in sorted(models, key=lambda m: m.pk, reverse=True):
+        by_lod.setdefault(model.lod, model)
+    if not by_lod:
+        return None, []
+    fitting = [lod for lod in by_lod if lod >= wanted]
+    chosen = by_lod[min(fitting) if fitting else max(by_lod)]
+    return chosen, [by_lod[lod] for lod in sorted(by_lod)]
+
+
+def byte_range(header, size):
+    """
+    Inclusive ``(start, end)`` of a single ``bytes=`` range, or None when the whole
+    file should be sent (no header, several ranges, malformed). Raises ValueError
+    when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None  # invalid range-spec: ignore the header
+    if start >= size:
+        raise ValueError(header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def read_range(fh, start, length):
+    try:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def glb_response(request, digest):
+    """Serves the content-hash GLB ``digest`` in the best encoding the client accepts."""
+    variants = glb_variants(digest)
+    if variants is None:
+        return None
+    encodings = variants['encodings']
+    encoding = choose_encoding(request, encodings)
+    variant = encodings[encoding]
+    storage = RobotModel3D._meta.get_field('glb_file').storage
+    size = variant['size']
+    etag = f'"{digest}"' if encoding == 'identity' else f'"{digest}-{encoding}"'
+
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    elif GLB_SENDFILE:
+        response = HttpResponse(content_type=CONTENT_TYPE)
+        if GLB_SENDFILE == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = GLB_ACCEL_PREFIX + variant['name']
+        else:
+            response['X-Sendfile'] = storage.path(variant['name'])
+    else:
+        if_range = request.META.get('HTTP_IF_RANGE')
+        try:
+            span = byte_range(request.META.get('HTTP_RANGE'), size) if if_range in (None, etag) else None
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        else:
+            fh = storage.open(variant['name'], 'rb')
+            if span is None:
+                # FileResponse lets the WSGI server use sendfile() where it can.
+                response = FileResponse(fh, content_type=CONTENT_TYPE)
+                response.headers.pop('Content-Disposition', None)
+            else:
+                start, end = span
+                response = StreamingHttpResponse(read_range(fh, start, end - start + 1),
+                                                 status=206, content_type=CONTENT_TYPE)
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+                response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    if encoding != 'identity' and response.status_code != 416:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -0,0 +1,145 @@
+"""
+Responsive image derivatives.
+
+Every uploaded product/highlight/accessory/showcase image is resized to a fixed
+width ladder in WebP and JPEG. Variants are written next to the media files under
+``derivatives/`` and recorded in ImageDerivative; serializers expose them as
+``{"webp": {"320": url, ...}, "jpeg": {...}}`` maps so clients can build a srcset
+instead of downloading the original.
+"""
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .caching import bump_catalog_version, get_catalog_version
+from .media import media_resolver, storage_url
+from .models import (
+    AdditionalDevice,
+    HighlightItem,
+    ImageDerivative,
+    NavigationShowcase,
+    Product,
+    ProductFeature,
+)
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+FORMATS = (
+    # (key, Pillow format, extension, save options)
+    ('webp', 'WEBP', 'webp', {'quality': 80, 'method': 4}),
+    ('jpeg', 'JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+IMAGE_FIELDS = {
+    Product: ('product_image', 'landing_image'),
+    ProductFeature: ('img1', 'img2', 'img3'),
+    HighlightItem: ('image',),
+    AdditionalDevice: ('image',),
+    NavigationShowcase: ('image',),
+}
+
+
+def derivative_name(source, width, extension):
+    stem, _ = os.path.splitext(source)
+    return f"derivatives/{stem}_{width}.{extension}"
+
+
+def ladder(width):
+    """Ladder widths not larger than the original (at least one variant per image)."""
+    return [w for w in WIDTHS if w <= width] or [width]
+
+
+def render_derivatives(source, storage=default_storage):
+    """
+    Writes every variant of ``source`` to storage and returns
+    ``(width, height, variants)``. Touches no database, so it is safe to run in a
+    worker process.
+    """
+    with storage.open(source, 'rb') as fh:
+        image = ImageOps.exif_transpose(Image.open(fh))
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    width, height = image.size
+
+    variants = {key: {} for key, *_ in FORMATS}
+    for target in ladder(width):
+        resized = image if target == width else image.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        for key, pil_format, extension, options in FORMATS:
+            frame = resized.convert('RGB') if pil_format == 'JPEG' else resized
+            buffer = io.BytesIO()
+            frame.save(buffer, pil_format, **options)
+            name = derivative_name(source, target, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            variants[key][str(target)] = storage.save(name, ContentFile(buffer.getvalue()))
+    return width, height, variants
+
+
+def save_derivatives(source, width, height, variants):
+    ImageDerivative.objects.update_or_create(
+        source=source,
+        defaults={'width': width, 'height': height, 'variants': variants},
+    )
+
+
+def generate_derivatives(source):
+    try:
+        save_derivatives(source, *render_derivatives(source))
+    except Exception:
+        logger.exception("Could not build image derivatives for %s", source)
+        return False
+    return True
+
+
+def generate_missing_derivatives(instance):
+    """Builds variants for any image field of ``instance`` that has none yet (called on upload)."""
+    sources = [
+        getattr(instance, field).name
+        for field in IMAGE_FIELDS[type(instance)]
+        if getattr(instance, field)
+    ]
+    known = set(ImageDerivative.objects.filter(source__in=sources).values_list('source', flat=True))
+    built = [generate_derivatives(source) for source in sources if source not in known]
+    if any(built):
+        bump_catalog_version()
+
+
+class DerivativeManifest:
+    """Per-process ``source -> variants`` map, reloaded when the catalog version changes."""
+
+    def __init__(self):
+        self.version = None
+        self.variants = {}
+
+    def get(self, source):
+        version = get_catalog_version()
+        if version != self.version:
+            self.variants = dict(ImageDerivative.objects.values_list('source', 'variants'))
+            self.version = version
+        return self.variants.get(source)
+
+
+derivative_manifest = DerivativeManifest()
+
+
+def variant_urls(field_file, request=None):
+    """``{"webp": {"320": url, ...}, "jpeg": {...}}`` for an image field, or None."""
+    if not field_file:
+        return None
+    variants = derivative_manifest.get(field_file.name)
+    if not variants:
+        return None
+    resolver = media_resolver(request)
+    storage = field_file.storage
+    return {
+        key: {width: resolver.absolute(storage_url(storage, name)) for width, name in widths.items()}
+        for key, widths in variants.items()
+    }
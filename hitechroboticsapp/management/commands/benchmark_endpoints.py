@@ -0,0 +1,80 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from hitechroboticsapp.benchmarks import Runner, cases, compare, report
+
+BENCHMARK_USER = 'benchmark-admin'
+
+
+class Command(BaseCommand):
+    help = ("Time every API route through the test client (p50/p95/p99, queries, size, peak memory) "
+            "and write the results as JSON; with --compare, fail on regressions against an earlier run. "
+            "Seed the database with seed_catalog first.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--cold', action='store_true', help="Clear caches and snapshots before every request")
+        parser.add_argument('--language', default='en')
+        parser.add_argument('--only', action='append', default=[], metavar='NAME',
+                            help="Run only cases whose name contains NAME (repeatable)")
+        parser.add_argument('--output', help="Write the JSON results here (default: stdout)")
+        parser.add_argument('--compare', metavar='BASELINE', help="Results file of an earlier run")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Relative p50/p95 slowdown counted as a regression (default 0.2)")
+
+    def handle(self, *args, **options):
+        # Lets the test client through ALLOWED_HOSTS.
+        setup_test_environment()
+        try:
+            self.benchmark(options)
+        finally:
+            teardown_test_environment()
+
+    def benchmark(self, options):
+        try:
+            found, skipped = cases(options['language'])
+        except LookupError as exc:
+            raise CommandError(str(exc))
+        if options['only']:
+            found = [case for case in found if any(part in case.name for part in options['only'])]
+
+        staff, _ = get_user_model().objects.get_or_create(
+            username=BENCHMARK_USER, defaults={'is_staff': True, 'is_active': True})
+        runner = Runner(iterations=options['iterations'], warmup=options['warmup'], cold=options['cold'],
+                        staff_user=staff)
+        results = []
+        for case in found:
+            result = runner.run(case)
+            results.append(result)
+            self.stderr.write(f"{result.name:<48} {result.status}  p50 {result.p50_ms:8.2f}  "
+                              f"p95 {result.p95_ms:8.2f}  p99 {result.p99_ms:8.2f} ms  "
+                              f"{result.queries:3d} q  {result.bytes:>9} B  {result.peak_kb:>9.1f} KiB")
+        for name, reason in skipped.items():
+            self.stderr.write(f"{name:<48} skipped: {reason}")
+
+        run_settings = {key: options[key] for key in ('iterations', 'warmup', 'cold', 'language')}
+        data = report(results, skipped, run_settings)
+        encoded = json.dumps(data, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(encoded + '\n')
+        else:
+            sys.stdout.write(encoded + '\n')
+
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+            if baseline.get('settings') != data['settings']:
+                self.stderr.write(self.style.WARNING(
+                    f"{options['compare']} was run with {baseline.get('settings')}; the numbers may not compare."))
+            regressions = compare(baseline, data, threshold=options['threshold'])
+            for line in regressions:
+                self.stderr.write(self.style.ERROR(line))
+            if regressions:
+                raise CommandError(f"{len(regressions)} regressions against {options['compare']}.")
+            self.stderr.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from hitechroboticsapp.media import media_resolver
+from hitechroboticsapp.models import HighlightItem, Product, ProductFeature
+
+
+class Command(BaseCommand):
+    help = "Compare per-image URL cost of build_absolute_uri(field.url) against the shared media resolver."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100)
+        parser.add_argument('--rounds', type=int, default=20)
+
+    def images(self, count):
+        # Unsaved instances: the benchmark measures URL building only, no queries.
+        files = []
+        for i in range(count):
+            product = Product(
+                product_image=f'product_image/robot-{i}.jpg',
+                landing_image=f'product_card_images/robot-{i}.jpg',
+            )
+            feature = ProductFeature(
+                img1=f'product_images/robot-{i}-1.jpg',
+                img2=f'product_images/robot-{i}-2.jpg',
+                img3=f'product_images/robot-{i}-3.jpg',
+            )
+            slides = [HighlightItem(image=f'highlights/robot-{i}-{n}.jpg') for n in range(3)]
+            files += [product.product_image, product.landing_image, feature.img1, feature.img2, feature.img3]
+            files += [slide.image for slide in slides]
+        return files
+
+    def handle(self, *args, **options):
+        files = self.images(options['products'])
+        rounds = options['rounds']
+        factory = RequestFactory()
+
+        def legacy():
+            request = factory.get('/en/api/products/')
+            return [request.build_absolute_uri(f.url) if f and hasattr(f, 'url') else None for f in files]
+
+        def resolver():
+            request = factory.get('/en/api/products/')
+            resolve = media_resolver(request).url
+            return [resolve(f) for f in files]
+
+        assert legacy() == resolver()
+        for label, func in (('build_absolute_uri', legacy), ('media_resolver', resolver)):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                func()
+            elapsed = time.perf_counter() - started
+            per_image = elapsed / (rounds * len(files)) * 1e6
+            self.stdout.write(f"{label:>20}: {per_image:7.2f} µs/image ({len(files)} images x {rounds} rounds)")
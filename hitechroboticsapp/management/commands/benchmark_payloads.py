@@ -0,0 +1,98 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import translation
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from hitechroboticsapp.payloads import CompiledProductDetailSerializer, CompiledProductSerializer
+from hitechroboticsapp.serializers import ProductDetailSerializer, ProductSerializer
+from hitechroboticsapp.views import product_detail_queryset, product_queryset
+
+LANGUAGES = ('en', 'ru', 'uz')
+
+
+def api_request(language):
+    request = RequestFactory().get(f'/{language}/api/products/', HTTP_ACCEPT_LANGUAGE=language)
+    request.LANGUAGE_CODE = language
+    return Request(request)
+
+
+class Command(BaseCommand):
+    help = ("Check that the compiled product payloads render the same JSON bytes as ProductSerializer and "
+            "ProductDetailSerializer in every language, and time both. With --golden, also compare against "
+            "(or record) a golden file.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help="Products to render (default 500)")
+        parser.add_argument('--repeat', type=int, default=3, help="Timed passes per serializer (default 3)")
+        parser.add_argument('--golden', metavar='PATH',
+                            help="Golden JSON file; written from the reference serializers if missing")
+
+    def handle(self, *args, **options):
+        # Lets the media URLs resolve against the test server host.
+        setup_test_environment()
+        try:
+            self.check_payloads(options)
+        finally:
+            teardown_test_environment()
+
+    def check_payloads(self, options):
+        limit, repeat = options['limit'], max(1, options['repeat'])
+        renderer = JSONRenderer()
+        golden, mismatches = {}, []
+        for language in LANGUAGES:
+            with translation.override(language):
+                request = api_request(language)
+                context = {'request': request}
+                products = list(product_queryset()[:limit])
+                details = list(product_detail_queryset().filter(pk__in=[p.pk for p in products]).order_by('pk'))
+                if not products:
+                    raise CommandError("No products to render; run seed_catalog first.")
+
+                for label, reference, compiled, rows in (
+                        ('list', ProductSerializer, CompiledProductSerializer, products),
+                        ('detail', ProductDetailSerializer, CompiledProductDetailSerializer, details)):
+                    timings = {}
+                    output = {}
+                    for serializer_class in (reference, compiled):
+                        best = None
+                        for _ in range(repeat):
+                            started = time.perf_counter()
+                            data = serializer_class(rows, many=True, context=context).data
+                            encoded = renderer.render(data)
+                            elapsed = time.perf_counter() - started
+                            best = elapsed if best is None else min(best, elapsed)
+                        timings[serializer_class] = best
+                        output[serializer_class] = encoded
+
+                    if output[reference] != output[compiled]:
+                        mismatches.append(f"{language} {label}")
+                    golden[f'{language} {label}'] = output[reference].decode()
+                    speedup = timings[reference] / timings[compiled]
+                    self.stdout.write(
+                        f"{language} {label:<6} {len(rows):>5} products  "
+                        f"reference {len(rows) / timings[reference]:>9.0f}/s  "
+                        f"compiled {len(rows) / timings[compiled]:>9.0f}/s  x{speedup:.1f}")
+
+        if mismatches:
+            raise CommandError(f"Compiled payloads differ from the reference serializers: {', '.join(mismatches)}")
+
+        path = options['golden']
+        if path:
+            try:
+                with open(path) as fh:
+                    recorded = json.load(fh)
+            except FileNotFoundError:
+                with open(path, 'w') as fh:
+                    json.dump(golden, fh, ensure_ascii=False, indent=1, sort_keys=True)
+                self.stdout.write(f"Recorded {path}.")
+            else:
+                changed = sorted(key for key in golden.keys() | recorded.keys() if golden.get(key) != recorded.get(key))
+                if changed:
+                    raise CommandError(f"Payloads differ from {path}: {', '.join(changed)}")
+                self.stdout.write(f"Payloads match {path}.")
+        self.stdout.write(self.style.SUCCESS("Compiled payloads match the reference serializers."))
@@ -0,0 +1,80 @@
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.throttling import AnonRateThrottle
+
+from hitechroboticsapp.throttling import SlidingWindowStore, SlidingWindowThrottle
+
+
+class BenchView:
+    throttle_scope = 'bench'
+
+
+def make_throttles(rate, store):
+    stock = type('StockThrottle', (AnonRateThrottle,), {'rate': rate})
+    sliding = type('BenchSlidingWindowThrottle', (SlidingWindowThrottle,), {
+        'THROTTLE_RATES': {'bench': rate},
+        'store': store,
+    })
+    return {'AnonRateThrottle': stock, 'SlidingWindowThrottle': sliding}
+
+
+def run(throttle_class, requests, clients):
+    # Runs in a worker process too: one request object per simulated client IP.
+    factory = RequestFactory()
+    batch = [Request(factory.get('/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}')) for i in range(clients)]
+    for request in batch:
+        request.user  # authenticate outside the timed loop
+    view = BenchView()
+    allowed = 0
+    started = time.perf_counter()
+    for n in range(requests):
+        allowed += throttle_class().allow_request(batch[n % clients], view)
+    return time.perf_counter() - started, allowed
+
+
+def run_named(args):
+    rate, path, name, requests, clients = args
+    return run(make_throttles(rate, SlidingWindowStore(path))[name], requests, clients)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's AnonRateThrottle (cache history lists) with SlidingWindowThrottle: cost per "
+        "request as the allowed rate grows, and how many requests several worker processes let through."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000)
+        parser.add_argument('--rates', default='100/min,1000/min,10000/min')
+        parser.add_argument('--clients', type=int, default=1, help="Distinct client IPs to spread requests over")
+        parser.add_argument('--workers', type=int, default=4, help="Processes for the shared-limit check")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for rate in options['rates'].split(','):
+                cache.clear()
+                path = f"{directory}/{rate.replace('/', '-')}.sqlite3"
+                for name, throttle in make_throttles(rate, SlidingWindowStore(path)).items():
+                    elapsed, allowed = run(throttle, options['requests'], options['clients'])
+                    per_request = elapsed / options['requests'] * 1e6
+                    self.stdout.write(f"{rate:>11} {name:>22}: {per_request:8.1f} µs/request, {allowed} allowed")
+
+            # Each process gets its own local-memory cache; the SQLite file is shared.
+            rate = options['rates'].split(',')[0]
+            limit = int(rate.split('/')[0])
+            workers = options['workers']
+            per_worker = limit * 2
+            self.stdout.write(f"\n{workers} processes x {per_worker} requests from one client, limit {rate}:")
+            for name in ('AnonRateThrottle', 'SlidingWindowThrottle'):
+                cache.clear()  # forked workers start from the parent's cache contents
+                path = f"{directory}/shared-{name}.sqlite3"
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(run_named, [(rate, path, name, per_worker, 1)] * workers))
+                allowed = sum(result[1] for result in results)
+                self.stdout.write(f"{name:>22}: {allowed} allowed (limit {limit})")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from hitechroboticsapp.glb import build_glb_variants
+from hitechroboticsapp.models import RobotModel3D
+
+
+class Command(BaseCommand):
+    help = "Write the content-hash GLB copies (plain, gzip, brotli) served by the range-capable model endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Rebuild models that already have variants")
+
+    def handle(self, *args, **options):
+        built = 0
+        for model in RobotModel3D.objects.exclude(glb_file=''):
+            try:
+                if build_glb_variants(model, force=options['force']):
+                    built += 1
+            except OSError as exc:
+                self.stderr.write(f"{model.glb_file.name}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Built GLB variants for {built} models."))
@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from hitechroboticsapp.caching import bump_catalog_version
+from hitechroboticsapp.images import IMAGE_FIELDS, render_derivatives, save_derivatives
+from hitechroboticsapp.models import ImageDerivative
+
+
+def _render(source):
+    # Runs in a worker process: storage I/O and Pillow only, no database access.
+    try:
+        return source, render_derivatives(source), None
+    except Exception as exc:
+        return source, None, exc
+
+
+class Command(BaseCommand):
+    help = "Backfill resized WebP/JPEG variants for every product, highlight, accessory and showcase image."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+        parser.add_argument('--force', action='store_true', help="Regenerate images that already have variants")
+
+    def handle(self, *args, **options):
+        sources = set()
+        for model, fields in IMAGE_FIELDS.items():
+            for row in model.objects.values_list(*fields):
+                sources.update(name for name in row if name)
+        if not options['force']:
+            sources -= set(ImageDerivative.objects.values_list('source', flat=True))
+
+        if not sources:
+            self.stdout.write("All images already have derivatives.")
+            return
+
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        built = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = [pool.submit(_render, source) for source in sorted(sources)]
+            for future in as_completed(futures):
+                source, result, error = future.result()
+                if error is not None:
+                    failed += 1
+                    self.stderr.write(f"{source}: {error}")
+                    continue
+                save_derivatives(source, *result)
+                built += 1
+
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"Built derivatives for {built} images ({failed} failed)."))
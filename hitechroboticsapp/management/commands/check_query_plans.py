@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from hitechroboticsapp.query_plans import explain, full_scans, hot_queries, is_top_n
+
+
+class Command(BaseCommand):
+    help = ("EXPLAIN every hot catalog and order query and fail when one reads a whole table, or walks a "
+            "whole index without a condition outside a top-N page. Run it in CI after schema changes.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--only', action='append', default=[], metavar='NAME',
+                            help="Check only queries whose name contains NAME (repeatable)")
+
+    def handle(self, *args, **options):
+        using = options['database']
+        vendor = connections[using].vendor
+        queries = {
+            name: queryset for name, queryset in hot_queries().items()
+            if not options['only'] or any(part in name for part in options['only'])
+        }
+
+        failures = []
+        with transaction.atomic(using=using):
+            for name, queryset in queries.items():
+                plan = explain(queryset, using)
+                scans = full_scans(plan, vendor, is_top_n(queryset))
+                if scans is None:
+                    raise CommandError(f"Don't know how to read {vendor} query plans.")
+                if scans:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {', '.join(scans)}"))
+                else:
+                    self.stdout.write(f"ok         {name}")
+                if scans or options['verbosity'] > 1:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+            # Nothing was written; this just drops SET LOCAL.
+            transaction.set_rollback(True, using=using)
+
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(queries)} queries fall back to a full scan.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(queries)} queries use indexes."))
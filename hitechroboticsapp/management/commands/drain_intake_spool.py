@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from hitechroboticsapp.spool import intake_spool
+
+
+class Command(BaseCommand):
+    help = "Move spooled orders and contact messages into the database (once, or continuously with --watch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help="Keep draining every flush interval")
+
+    def handle(self, *args, **options):
+        while True:
+            moved = intake_spool.drain()
+            if moved or not options['watch']:
+                self.stdout.write(f"Moved {moved} submissions ({intake_spool.pending()} pending).")
+            if not options['watch']:
+                return
+            close_old_connections()
+            time.sleep(intake_spool.interval)
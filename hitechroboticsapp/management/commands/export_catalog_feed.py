@@ -0,0 +1,42 @@
+import sys
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from hitechroboticsapp.feed import FEED_FORMATS, feed_lines, feed_queryset, next_watermark, parse_since
+
+
+class Command(BaseCommand):
+    help = "Stream the catalog feed (all languages, specs, media URLs) as NDJSON or CSV to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FEED_FORMATS), default='ndjson')
+        parser.add_argument('--since', help="Only products updated after this ISO 8601 timestamp or date")
+        parser.add_argument('--output', help="File to write (default: stdout)")
+        parser.add_argument('--base-url', help="Make media URLs absolute, e.g. https://api.hitechrobotics.uz")
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_since(options['since']) if options['since'] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        request = None
+        if options['base_url']:
+            url = urlsplit(options['base_url'])
+            request = RequestFactory().get('/', HTTP_HOST=url.netloc, secure=url.scheme == 'https')
+
+        watermark = next_watermark()
+        out = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            count = 0
+            for line in feed_lines(feed_queryset(since), options['format'], request):
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        if options['format'] == 'csv':
+            count -= 1  # header
+        self.stderr.write(f"Exported {count} products. Next --since: {watermark.isoformat()}")
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from hitechroboticsapp.catalog_import import IMPORT_BATCH_SIZE, BundleError, CatalogImport
+
+
+class Command(BaseCommand):
+    help = "Upsert categories, products and their translations, features, cards, showcases, accessories and images from a bundle directory (see catalog_import.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('bundle', help="Directory containing catalog.json and the images it references")
+        parser.add_argument('--dry-run', action='store_true', help="Validate and report the planned changes only")
+        parser.add_argument('--workers', type=int, default=8, help="Threads hashing and copying images")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--skip-derivatives', action='store_true',
+                            help="Don't build responsive image variants for the imported images")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            catalog = CatalogImport(options['bundle'], workers=options['workers'],
+                                    batch_size=options['batch_size']).load()
+        except BundleError as exc:
+            raise CommandError(str(exc))
+
+        for line in catalog.summary():
+            self.stdout.write(line)
+        if options['dry_run']:
+            self.stdout.write("Dry run: nothing was written.")
+            return
+
+        catalog.apply()
+        self.stdout.write(self.style.SUCCESS(f"Imported in {time.perf_counter() - started:.1f}s."))
+        if not options['skip_derivatives']:
+            call_command('build_image_derivatives', stdout=self.stdout, stderr=self.stderr)
@@ -0,0 +1,176 @@
+import asyncio
+import contextvars
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import AsyncRequestFactory, RequestFactory
+
+from hitechroboticsapp.proxy import spline_cache
+from hitechroboticsapp.views import spline_proxy
+
+
+def slow_upstream(delay, size):
+    """Local stand-in for Spline that trickles ``size`` bytes over ``delay`` seconds."""
+    chunks = 8
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            for _ in range(chunks):
+                time.sleep(delay / chunks)
+                self.wfile.write(b'x' * (size // chunks))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class InFlight:
+    """Counts requests being served at once and remembers the peak."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the Spline proxy against a local slow upstream: the blocking spline_proxy view on "
+        "WSGI-style worker threads versus the async streaming view on one event loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=40)
+        parser.add_argument('--workers', type=int, default=4, help="Sync worker threads (gunicorn workers)")
+        parser.add_argument('--delay', type=float, default=1.0, help="Seconds the upstream takes per response")
+        parser.add_argument('--size', type=int, default=256 * 1024, help="Upstream body size in bytes")
+
+    def handle(self, *args, **options):
+        try:
+            from hitechroboticsapp.async_proxy import spline_proxy_async
+        except ImportError:
+            raise CommandError("httpx is required for the async proxy")
+
+        server = slow_upstream(options['delay'], options['size'])
+        upstream_url = f"http://127.0.0.1:{server.server_port}/scene/"
+        self.stdout.write(f"{options['requests']} requests, upstream {options['delay']}s / {options['size']} bytes")
+
+        # Each request proxies its own upstream URL (?n=...), so every one is a cold miss that
+        # goes to the upstream, and the single-flight fetch never merges them.
+        target = contextvars.ContextVar('target')
+        factory, async_factory = RequestFactory(), AsyncRequestFactory()
+        original_directory = spline_cache.directory
+        try:
+            with tempfile.TemporaryDirectory() as directory, \
+                    mock.patch('hitechroboticsapp.views.spline_target_url', lambda obj: target.get()), \
+                    mock.patch('hitechroboticsapp.async_proxy.spline_target_url', lambda obj: target.get()):
+                spline_cache.directory = type(original_directory)(directory)
+                self.run_sync(options, lambda n: f"{upstream_url}?sync={n}", target, factory)
+                self.run_async(options, lambda n: f"{upstream_url}?async={n}", target, async_factory,
+                               spline_proxy_async)
+        finally:
+            spline_cache.directory = original_directory
+            server.shutdown()
+
+    def run_sync(self, options, url, target, factory):
+        in_flight = InFlight()
+        statuses = []
+
+        def sync_fetch(n):
+            # The worker thread is held for the whole request, download included.
+            target.set(url(n))
+            started = time.perf_counter()
+            try:
+                with in_flight:
+                    response = spline_proxy(factory.get('/en/api/spline-proxy/'))
+                    statuses.append(response.status_code)
+                    if response.status_code == 200:
+                        for _chunk in response.streaming_content:
+                            pass
+                    response.close()
+                return time.perf_counter() - started
+            finally:
+                close_old_connections()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            latencies = list(pool.map(sync_fetch, range(options['requests'])))
+        wall = time.perf_counter() - started
+        self.report(f"sync, {options['workers']} workers", latencies, wall, in_flight.peak, statuses,
+                    f"{sum(latencies):.1f} worker-s held")
+
+    def run_async(self, options, url, target, factory, view):
+        in_flight = InFlight()
+        statuses = []
+
+        async def async_fetch(n):
+            target.set(url(n))  # gather() runs each coroutine in its own copy of the context
+            started = time.perf_counter()
+            with in_flight:
+                response = await view(factory.get('/en/api/spline-proxy/'))
+                statuses.append(response.status_code)
+                if response.status_code == 200:
+                    if response.is_async:
+                        async for _chunk in response.streaming_content:
+                            pass
+                    else:
+                        for _chunk in response.streaming_content:
+                            pass
+                response.close()
+            return time.perf_counter() - started
+
+        async def heartbeat(stop, lags):
+            # How late the loop wakes a 10 ms timer: time it spent blocked instead of serving.
+            while not stop.is_set():
+                expected = time.perf_counter() + 0.01
+                await asyncio.sleep(0.01)
+                lags.append(max(0.0, time.perf_counter() - expected))
+
+        async def run():
+            stop, lags = asyncio.Event(), []
+            beat = asyncio.create_task(heartbeat(stop, lags))
+            latencies = await asyncio.gather(*(async_fetch(n) for n in range(options['requests'])))
+            stop.set()
+            await beat
+            return latencies, lags
+
+        started = time.perf_counter()
+        latencies, lags = asyncio.run(run())
+        wall = time.perf_counter() - started
+        # The event loop thread is the only worker; it is held only while it is not awaiting.
+        self.report("async, 1 event loop", latencies, wall, in_flight.peak, statuses,
+                    f"loop lag max {max(lags, default=0) * 1000:.0f} ms")
+
+    def report(self, label, latencies, wall, peak_in_flight, statuses, occupancy):
+        latencies = sorted(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        failed = sum(status != 200 for status in statuses)
+        self.stdout.write(
+            f"{label:>22}: wall {wall:6.2f}s  p50 {statistics.median(latencies):5.2f}s  "
+            f"p95 {p95:5.2f}s  peak in-flight {peak_in_flight:3d}  {occupancy}"
+            + (f"  {failed} non-200" if failed else "")
+        )
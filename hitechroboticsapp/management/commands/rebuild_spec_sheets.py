@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hitechroboticsapp.caching import bump_catalog_version
+from hitechroboticsapp.models import Product
+from hitechroboticsapp.specs import build_spec_sheets
+
+
+class Command(BaseCommand):
+    help = "Re-render the stored per-language spec sheets of every product (run after editing specs_translations.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch = []
+        total = 0
+        with transaction.atomic():
+            for product in Product.objects.iterator(chunk_size=batch_size):
+                product.spec_sheets = build_spec_sheets(product)
+                batch.append(product)
+                if len(batch) >= batch_size:
+                    Product.objects.bulk_update(batch, ['spec_sheets'])
+                    total += len(batch)
+                    batch = []
+            if batch:
+                Product.objects.bulk_update(batch, ['spec_sheets'])
+                total += len(batch)
+        # bulk_update sends no signals, so drop cached product payloads explicitly.
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt spec sheets for {total} products."))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hitechroboticsapp.models import Product
+from hitechroboticsapp.seeding import SEED_BATCH_SIZE, SEED_SLUG_PREFIX, CatalogSeeder, clear
+
+
+class Command(BaseCommand):
+    help = ("Fill the database with synthetic products (all translations and child rows), content, "
+            "orders and contact messages for benchmarking. Never run this against production.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=5000)
+        parser.add_argument('--categories', type=int, default=8)
+        parser.add_argument('--orders', type=int, default=1_000_000)
+        parser.add_argument('--contacts', type=int, default=100_000)
+        parser.add_argument('--seed', type=int, default=0, help="RNG seed; the same seed gives the same data")
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE)
+        parser.add_argument('--clear', action='store_true', help="Delete previously seeded rows first")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            clear()
+            self.stdout.write("Removed previously seeded rows.")
+        elif options['products'] and Product.objects.filter(slug__startswith=SEED_SLUG_PREFIX).exists():
+            raise CommandError("The database already holds seeded products; pass --clear to replace them.")
+
+        started = time.perf_counter()
+        seeder = CatalogSeeder(seed=options['seed'], batch_size=options['batch_size'], log=self.stdout.write)
+        seeder.seed(options['products'], options['orders'], options['contacts'], categories=options['categories'])
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {time.perf_counter() - started:.1f}s."))
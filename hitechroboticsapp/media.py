@@ -0,0 +1,70 @@
+"""
+Media URL resolution shared by all serializers.
+
+``storage.url(name)`` is memoized per (storage, file name) for the whole process
+(with a TTL, so signed object-storage URLs are refreshed before they expire), and
+the absolute ``scheme://host`` prefix is computed once per request instead of
+calling ``request.build_absolute_uri`` for every image field.
+"""
+import time
+
+from django.conf import settings
+from django.utils.encoding import iri_to_uri
+
+MEDIA_URL_CACHE_TTL = getattr(settings, 'MEDIA_URL_CACHE_TTL', 300)
+MEDIA_URL_CACHE_SIZE = 10000
+
+_storage_urls = {}
+
+
+def storage_url(storage, name):
+    key = (id(storage), name)
+    entry = _storage_urls.get(key)
+    now = time.monotonic()
+    if entry is None or now - entry[1] >= MEDIA_URL_CACHE_TTL:
+        if len(_storage_urls) >= MEDIA_URL_CACHE_SIZE:
+            _storage_urls.clear()
+        entry = (storage.url(name), now)
+        _storage_urls[key] = entry
+    return entry[0]
+
+
+class MediaURLResolver:
+
+    def __init__(self, request=None):
+        self.request = request
+        # Same prefix request.build_absolute_uri() prepends to "/..." locations.
+        self.base = request.build_absolute_uri('/')[:-1] if request is not None else None
+        self._absolute = {}
+
+    def absolute(self, url):
+        """Absolute form of a media path, or the path itself when there is no request."""
+        if self.base is None:
+            return url
+        resolved = self._absolute.get(url)
+        if resolved is None:
+            if url.startswith('/') and not url.startswith('//'):
+                resolved = iri_to_uri(self.base + url)
+            else:
+                resolved = self.request.build_absolute_uri(url)
+            self._absolute[url] = resolved
+        return resolved
+
+    def url(self, field_file, default=None):
+        """URL of a FileField value, falling back to the ``default`` path when it is empty."""
+        if field_file:
+            return self.absolute(storage_url(field_file.storage, field_file.name))
+        if default is not None:
+            return self.absolute(default)
+        return None
+
+
+def media_resolver(request):
+    """The resolver for ``request``, created on first use and reused by every serializer."""
+    if request is None:
+        return MediaURLResolver()
+    resolver = getattr(request, '_media_url_resolver', None)
+    if resolver is None:
+        resolver = MediaURLResolver(request)
+        request._media_url_resolver = resolver
+    return resolver
@@ -0,0 +1,189 @@
+"""
+Per-request timings: Server-Timing headers and an in-process Prometheus registry.
+
+``RequestMetricsMiddleware`` samples ``METRICS_SAMPLE_RATE`` of the requests. For
+a sampled request it records, under the resolved view name:
+
+* ``db``: query count and time, through a ``connection.execute_wrapper``;
+* ``app``: view and serializer work (``SerializerMethodField`` included),
+  i.e. from ``process_view`` until rendering starts, minus the SQL in between;
+* ``render``: DRF/template rendering, from ``process_template_response`` to
+  the post-render callback;
+* ``total`` and the response size.
+
+Streaming responses (the feed, GLB files) are timed up to the first byte; the
+queries and time spent producing the body afterwards are not included.
+
+The numbers go out in a ``Server-Timing`` header and into histograms served as
+Prometheus text by ``views.MetricsView`` (admin users only). The registry is per
+process; scrape every worker or aggregate by instance. With the rate at 0 the
+middleware removes itself at startup.
+"""
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+METRICS_SAMPLE_RATE = getattr(settings, 'METRICS_SAMPLE_RATE', 0)
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HISTOGRAMS = {
+    'http_request_duration_seconds': ("Time spent handling the request", SECONDS_BUCKETS),
+    'http_request_db_queries': ("SQL queries per request", COUNT_BUCKETS),
+    'http_request_db_seconds': ("Time spent in SQL", SECONDS_BUCKETS),
+    'http_request_app_seconds': ("View and serializer time, excluding SQL", SECONDS_BUCKETS),
+    'http_request_render_seconds': ("Response rendering time", SECONDS_BUCKETS),
+    'http_response_size_bytes': ("Response body size", BYTES_BUCKETS),
+}
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+
+    def __init__(self, histograms=HISTOGRAMS):
+        self.histograms = histograms
+        self._series = {}  # (metric, view) -> Histogram
+        self._lock = threading.Lock()
+
+    def observe(self, view, values):
+        with self._lock:
+            for metric, value in values.items():
+                series = self._series.get((metric, view))
+                if series is None:
+                    series = self._series[(metric, view)] = Histogram(self.histograms[metric][1])
+                series.observe(value)
+
+    def render(self):
+        """The registry in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            snapshot = {key: (list(h.counts), h.sum) for key, h in self._series.items()}
+        lines = []
+        for metric, (help_text, buckets) in self.histograms.items():
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for (name, view), (counts, total) in sorted(snapshot.items()):
+                if name != metric:
+                    continue
+                label = view.replace('\\', '\\\\').replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(buckets + ('+Inf',), counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{view="{label}"}} {total:g}')
+                lines.append(f'{metric}_count{{view="{label}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+registry = MetricsRegistry()
+
+
+class RequestTimings:
+    __slots__ = ('started', 'queries', 'db', 'view_started', 'view_db', 'render_started', 'render_db',
+                 'render_finished')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.view_started = self.render_started = self.render_finished = None
+        self.view_db = self.render_db = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def finished(self, response):
+        now = time.perf_counter()
+        values = {
+            'http_request_duration_seconds': now - self.started,
+            'http_request_db_queries': self.queries,
+            'http_request_db_seconds': self.db,
+        }
+        if self.view_started is not None:
+            view_finished = self.render_started if self.render_started is not None else now
+            view_db = (self.render_db if self.render_started is not None else self.db) - self.view_db
+            values['http_request_app_seconds'] = max(0.0, view_finished - self.view_started - view_db)
+        if self.render_finished is not None:
+            values['http_request_render_seconds'] = self.render_finished - self.render_started
+        if not response.streaming:
+            values['http_response_size_bytes'] = len(response.content)
+        elif response.has_header('Content-Length'):
+            values['http_response_size_bytes'] = int(response['Content-Length'])
+        return values
+
+
+def server_timing(timings, values):
+    parts = [f'db;dur={values["http_request_db_seconds"] * 1000:.2f};desc="{timings.queries} queries"']
+    for name, metric in (('app', 'http_request_app_seconds'), ('render', 'http_request_render_seconds'),
+                         ('total', 'http_request_duration_seconds')):
+        if metric in values:
+            parts.append(f'{name};dur={values[metric] * 1000:.2f}')
+    return ', '.join(parts)
+
+
+class RequestMetricsMiddleware:
+
+    def __init__(self, get_response):
+        if not METRICS_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        timings = request._timings = RequestTimings()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+
+        values = timings.finished(response)
+        match = request.resolver_match
+        registry.observe(match.view_name if match else '<unresolved>', values)
+        response['Server-Timing'] = server_timing(timings, values)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = getattr(request, '_timings', None)
+        if timings is not None:
+            timings.view_started, timings.view_db = time.perf_counter(), timings.db
+
+    def process_template_response(self, request, response):
+        timings = getattr(request, '_timings', None)
+        if timings is not None:
+            timings.render_started, timings.render_db = time.perf_counter(), timings.db
+
+            def rendered(response):
+                timings.render_finished = time.perf_counter()
+
+            response.add_post_render_callback(rendered)
+        return response
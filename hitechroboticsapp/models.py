@@ -2,6 +2,8 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from .specs import build_spec_sheets
+
 
 # Create your models here.
 
@@ -11,6 +13,7 @@ class Category(models.Model):
     description = models.TextField()
 
     slug = models.SlugField(unique=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -71,15 +74,35 @@ class Product(models.Model):
     is_available_for_sale = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     # Slug
     slug = models.SlugField(unique=True, blank=True)
 
+    # Per-language spec blocks rendered at save time, see specs.py
+    spec_sheets = models.JSONField(default=dict, blank=True, editable=False)
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.product_name)
+        self.spec_sheets = build_spec_sheets(self)
         super().save(*args, **kwargs)
 
+    class Meta:
+        indexes = [
+            # Backs the keyset (cursor) pagination order of the catalog endpoints.
+            models.Index(fields=['-created_at', '-id'], name='product_created_id_idx'),
+            # Category pages and ?category= in the same order.
+            models.Index(fields=['product_category', '-created_at', '-id'], name='product_category_created_idx'),
+            # ?is_available_for_sale=true / ?is_available_for_rent=true.
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_available_for_sale=True),
+                         name='product_for_sale_idx'),
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_available_for_rent=True),
+                         name='product_for_rent_idx'),
+            # Incremental feed and search index syncs (updated_at > watermark).
+            models.Index(fields=['updated_at', 'id'], name='product_updated_id_idx'),
+        ]
+
     def __str__(self):
         return self.product_name
 
@@ -131,6 +154,16 @@ class Order(models.Model):
     order_type = models.CharField(max_length=15, choices=ORDER_TYPE_CHOICES)
     message = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set for submissions that went through the intake spool (see spool.py).
+    intake_ref = models.CharField(max_length=32, unique=True, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Admin changelist order and date_hierarchy ranges.
+            models.Index(fields=['-created_at', '-id'], name='order_created_id_idx'),
+            # The order_type admin filter, in the same order.
+            models.Index(fields=['order_type', '-created_at', '-id'], name='order_type_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.order_type} {self.product.product_name}"
@@ -142,6 +175,13 @@ class ContactMessage(models.Model):
     phone_number = models.CharField(max_length=15)
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    intake_ref = models.CharField(max_length=32, unique=True, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Admin changelist order and date_hierarchy ranges.
+            models.Index(fields=['-created_at', '-id'], name='contact_created_id_idx'),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -163,6 +203,10 @@ class HighlightItem(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            # Slides are fetched per highlight in display order.
+            models.Index(fields=['highlight', 'order'], name='highlightitem_order_idx'),
+        ]
 
     @property
     def type(self):
@@ -182,6 +226,7 @@ class AboutCompany(models.Model):
     section_title = models.CharField(max_length=255)
     section_subtitle = models.TextField()
     conclusion = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -211,6 +256,7 @@ class ContactInfo(models.Model):
     subtitle = models.TextField()
     map_src = models.URLField()
     locations = models.ManyToManyField(ShowroomLocation, related_name='contacts')
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -226,6 +272,9 @@ class AdditionalDevice(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['product', 'order'], name='additionaldevice_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} (for {self.product.product_name})"
@@ -279,7 +328,41 @@ class ProductFeatureCard(models.Model):
 
 
 class RobotModel3D(models.Model):
+    """One level-of-detail variant of a robot's GLB; metadata is filled in after upload (glb.py)."""
+    LOD_HIGH, LOD_MEDIUM, LOD_LOW = 0, 1, 2
+    LOD_CHOICES = [
+        (LOD_HIGH, 'High (desktop)'),
+        (LOD_MEDIUM, 'Medium'),
+        (LOD_LOW, 'Low (phones, Save-Data)'),
+    ]
+
+    product = models.ForeignKey('Product', null=True, blank=True, on_delete=models.CASCADE,
+                                related_name='models_3d', help_text="Leave empty for the site-wide model")
+    lod = models.PositiveSmallIntegerField(choices=LOD_CHOICES, default=LOD_HIGH)
     glb_file = models.FileField(upload_to='models/')
+    byte_size = models.PositiveBigIntegerField(null=True, editable=False)
+    mesh_count = models.PositiveIntegerField(null=True, editable=False)
+    primitive_count = models.PositiveIntegerField(null=True, editable=False)
+    triangle_count = models.PositiveIntegerField(null=True, editable=False)
+    max_texture_size = models.PositiveIntegerField(null=True, editable=False,
+                                                   help_text="Largest embedded texture edge in pixels")
+    metadata = models.JSONField(default=dict, blank=True, editable=False,
+                                help_text='{"version": 2, "textures": [{"mimeType": ..., "width": ..., "height": ..., "bytes": ...}], ...}')
+    # Content-hash copies written after upload, see glb.py.
+    content_hash = models.CharField(max_length=16, blank=True, db_index=True, editable=False)
+    variants = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text='{"source": "<upload>", "encodings": {"identity": {"name": ..., "size": ...}, "gzip": ..., "br": ...}}',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', 'lod'], name='robotmodel3d_product_lod_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product or 'Site-wide'} ({self.get_lod_display()})"
 
 
 class RoboticsHero(models.Model):
@@ -289,6 +372,7 @@ class RoboticsHero(models.Model):
     title = models.CharField(max_length=255)
     subtitle = models.CharField(max_length=255)
     cta_text = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -296,7 +380,48 @@ class RoboticsHero(models.Model):
 
 class SplineModelUrl(models.Model):
     spline_url = models.CharField(max_length=500)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class PhoneNumber(models.Model):
     phone_number = models.CharField(max_length=300)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class CatalogVersion(models.Model):
+    """
+    Single-row stamp replaced whenever catalog data (products and their child
+    rows, categories, image derivatives) changes. Cached product bodies, the
+    search index and the derivative manifest are keyed by it, so it lives in the
+    database where every worker reads the same value.
+    """
+    version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Catalog version {self.version}"
+
+
+class ContentVersion(models.Model):
+    """
+    Single-row stamp replaced whenever singleton site content (about us, contacts,
+    hero, phone numbers, 3D models) changes. Workers compare it against their
+    in-process snapshots instead of re-reading the content tables.
+    """
+    version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Content version {self.version}"
+
+
+class ImageDerivative(models.Model):
+    """Resized WebP/JPEG variants generated for one uploaded image, see images.py."""
+    source = models.CharField(max_length=255, unique=True, help_text="Storage name of the original upload")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    variants = models.JSONField(default=dict, help_text='{"webp": {"320": "<storage name>", ...}, "jpeg": {...}}')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.source
@@ -0,0 +1,49 @@
+"""
+Admin changelist pagination for large tables.
+
+``Paginator.count`` runs ``SELECT COUNT(*)``, a full scan on PostgreSQL and
+MySQL/InnoDB. For an unfiltered changelist of a table bigger than
+``ESTIMATED_COUNT_THRESHOLD`` rows the planner's row estimate is used instead;
+filtered, searched and date-drilled changelists (and small tables, and other
+backends) keep the exact count.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+ESTIMATED_COUNT_THRESHOLD = getattr(settings, 'ESTIMATED_COUNT_THRESHOLD', 100_000)
+
+ESTIMATE_SQL = {
+    'postgresql': "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+    'mysql': "SELECT table_rows FROM information_schema.tables "
+             "WHERE table_schema = DATABASE() AND table_name = %s",
+}
+
+
+def estimated_count(model, using='default'):
+    """Planner row estimate for ``model``'s table, or None where the backend has none."""
+    connection = connections[using]
+    sql = ESTIMATE_SQL.get(connection.vendor)
+    if sql is None:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model._meta.db_table])
+        row = cursor.fetchone()
+    # reltuples is -1 for a table that was never analyzed.
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
@@ -0,0 +1,280 @@
+"""
+Compiled product payloads for the catalog list, search and detail endpoints.
+
+``ProductSerializer`` and ``ProductDetailSerializer`` stay the reference for
+the product JSON. Rendering through them costs a DRF field walk per row, and
+their method fields build nested serializers on every call. The
+``Compiled*Serializer`` subclasses used by the views produce the same dicts.
+Each uses a plan compiled once per process from the reference serializer's
+declared fields: a ``(key, getter)`` tuple per field, in field order.
+
+* Plain model fields keep DRF's own ``to_representation``, so numbers,
+  booleans and timestamps format exactly as before.
+* Method fields and nested serializers are replaced by the getters given to
+  ``planned()``, which read the prefetched rows directly.
+
+A reference field without a getter (a new ``SerializerMethodField``, say), or
+an override for a field that no longer exists, fails when the plan is
+compiled, so the two cannot drift silently. ``benchmark_payloads`` checks the
+JSON byte for byte against the reference serializers in every language.
+"""
+from operator import attrgetter
+
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
+from rest_framework import serializers
+
+from .images import variant_urls
+from .media import media_resolver
+from .serializers import (
+    ACCORDION_TITLES,
+    DEFAULT_ADDITIONAL_IMAGE,
+    DEFAULT_CARD_IMAGE,
+    FEATURE_CARDS_TITLE,
+    HERO_TEXTS,
+    SPEC_LANGUAGES,
+    AdditionalDeviceSerializer,
+    FeatureCardSerializer,
+    FeatureParagraphSerializer,
+    HighlightItemSerializer,
+    HighlightSerializer,
+    MediaImageField,
+    NavigationShowcaseSerializer,
+    ProductDetailSerializer,
+    ProductFeatureSerializer,
+    ProductSerializer,
+)
+from .specs import spec_sheet
+
+
+class PayloadContext:
+    """Per-request values the reference serializers recompute for every field of every row."""
+    __slots__ = ('request', 'resolver', 'lang', 'header_lang', 'spec_lang')
+
+    def __init__(self, request):
+        self.request = request
+        self.resolver = media_resolver(request)
+        # ProductDetailSerializer.lang
+        self.lang = request.LANGUAGE_CODE if request else 'en'
+        # ProductSerializer reads the Accept-Language header instead.
+        self.header_lang = request.META.get('HTTP_ACCEPT_LANGUAGE', 'en')[:2]
+        self.spec_lang = self.header_lang if self.header_lang in SPEC_LANGUAGES else 'en'
+
+
+# -- getters: (obj, context) -> value --
+
+def plain(field):
+    get = attrgetter(field.source)
+    to_representation = field.to_representation
+
+    def value(obj, context):
+        attribute = get(obj)
+        return None if attribute is None else to_representation(attribute)
+    return value
+
+
+def media(name):
+    get = attrgetter(name)
+
+    def value(obj, context):
+        field_file = get(obj)
+        return context.resolver.url(field_file) if field_file else None
+    return value
+
+
+def media_url(name, default=None):
+    get = attrgetter(name)
+    return lambda obj, context: context.resolver.url(get(obj), default=default)
+
+
+def variants(name):
+    get = attrgetter(name)
+    return lambda obj, context: variant_urls(get(obj), context.request)
+
+
+def constant(result):
+    return lambda obj, context: result
+
+
+def related(name, plan):
+    """A nested one-to-one serializer: None when the row has no related object."""
+    def value(obj, context):
+        try:
+            instance = getattr(obj, name)
+        except ObjectDoesNotExist:
+            return None
+        return None if instance is None else render(plan(), instance, context)
+    return value
+
+
+def many(name, plan):
+    def value(obj, context):
+        rows = getattr(obj, name).all()
+        compiled = plan()
+        return [render(compiled, row, context) for row in rows]
+    return value
+
+
+def spec(key, lang_attr):
+    get_lang = attrgetter(lang_attr)
+    return lambda obj, context: spec_sheet(obj, get_lang(context))[key]
+
+
+def translated(base, lang_attr):
+    """``getattr(obj, f'{base}_{lang}', obj.{base})`` as the reference serializers write it."""
+    get_lang = attrgetter(lang_attr)
+    return lambda obj, context: getattr(obj, f'{base}_{get_lang(context)}', getattr(obj, base))
+
+
+def category_name(lang_attr):
+    name = translated('name', lang_attr)
+    return lambda obj, context: name(obj.product_category, context)
+
+
+def feature_cards(obj, context):
+    return {
+        "title": FEATURE_CARDS_TITLE.format(name=getattr(obj, f'product_name_{context.lang}', obj.product_name)),
+        "features": cards(obj, context),
+    }
+
+
+def integration_accordion(obj, context):
+    return {
+        "title": ACCORDION_TITLES.get(context.lang, ACCORDION_TITLES["en"]),
+        "items": accessories(obj, context),
+    }
+
+
+def unitree_hero(obj, context):
+    texts = HERO_TEXTS[context.lang]
+    name = getattr(obj, f'product_name_{context.lang}', obj.product_name)
+    return {
+        "title": name,
+        "subtitle": texts["subtitle"],
+        "priceText": texts["priceText"],
+        "ctaText": texts["ctaText"],
+        "imageSrc": context.resolver.url(obj.product_image, default=DEFAULT_CARD_IMAGE),
+        "imageAlt": name,
+        "showParticles": True,
+    }
+
+
+# -- plans --
+
+def compile_plan(serializer_class, overrides):
+    """``((key, getter), ...)`` in ``serializer_class``'s field order."""
+    fields = serializer_class().fields
+    stale = set(overrides) - set(fields)
+    if stale:
+        raise ImproperlyConfigured(f"{serializer_class.__name__} has no fields {sorted(stale)}")
+    plan = []
+    for name, field in fields.items():
+        getter = overrides.get(name)
+        if getter is None:
+            if isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer, MediaImageField)):
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name} has no compiled getter")
+            getter = plain(field)
+        plan.append((name, getter))
+    return tuple(plan)
+
+
+def render(plan, obj, context):
+    return {name: getter(obj, context) for name, getter in plan}
+
+
+def planned(serializer_class, overrides):
+    """Plan compiled on first use (serializer fields need the app registry)."""
+    compiled = None
+
+    def plan():
+        nonlocal compiled
+        if compiled is None:
+            compiled = compile_plan(serializer_class, overrides)
+        return compiled
+    return plan
+
+
+slide_plan = planned(HighlightItemSerializer, {
+    'type': constant("image"),
+    'image': media('image'),
+    'imageVariants': variants('image'),
+})
+highlight_plan = planned(HighlightSerializer, {
+    'slides': many('slides', slide_plan),
+})
+paragraph_plan = planned(FeatureParagraphSerializer, {})
+feature_plan = planned(ProductFeatureSerializer, {
+    **{f'img{n}': media_url(f'img{n}') for n in (1, 2, 3)},
+    **{f'img{n}_variants': variants(f'img{n}') for n in (1, 2, 3)},
+    'paragraphs': many('paragraphs', paragraph_plan),
+})
+feature_card_plan = planned(FeatureCardSerializer, {})
+accessory_plan = planned(AdditionalDeviceSerializer, {
+    'image': media_url('image', default=DEFAULT_ADDITIONAL_IMAGE),
+    'imageVariants': variants('image'),
+})
+showcase_plan = planned(NavigationShowcaseSerializer, {
+    'title': translated('title', 'lang'),
+    'description': translated('description', 'lang'),
+    'image': media_url('image', default=DEFAULT_CARD_IMAGE),
+    'imageVariants': variants('image'),
+})
+cards = many('feature_cards', feature_card_plan)
+accessories = many('additionals', accessory_plan)
+
+product_plan = planned(ProductSerializer, {
+    'highlights': related('highlight', highlight_plan),
+    'features': related('features', feature_plan),
+    'product_image': media('product_image'),
+    'product_image_variants': variants('product_image'),
+    'product_category_name': category_name('header_lang'),
+    'specs': spec('specs', 'spec_lang'),
+})
+
+product_detail_plan = planned(ProductDetailSerializer, {
+    'unitreeHero': unitree_hero,
+    'infoModel': spec('infoModel', 'lang'),
+    'specs': spec('specs', 'lang'),
+    'navigationShowcase': many('navigation_showcase', showcase_plan),
+    'product_image': media('product_image'),
+    'product_image_variants': variants('product_image'),
+    'product_category_name': category_name('lang'),
+    'techSpecs': spec('techSpecs', 'lang'),
+    'featureCards': feature_cards,
+    'integrationAccordion': integration_accordion,
+    'features': related('features', feature_plan),
+    'highlights': related('highlight', highlight_plan),
+    'specifications': spec('specifications', 'lang'),
+})
+
+
+# -- serializers used by the views --
+
+class CompiledListSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        rows = data.all() if hasattr(data, 'all') else data
+        context = PayloadContext(self.context.get('request'))
+        plan = self.child.plan()
+        return [render(plan, row, context) for row in rows]
+
+
+class CompiledProductSerializer(ProductSerializer):
+    """ProductSerializer output through the compiled plan."""
+    plan = staticmethod(product_plan)
+
+    class Meta(ProductSerializer.Meta):
+        list_serializer_class = CompiledListSerializer
+
+    def to_representation(self, instance):
+        return render(self.plan(), instance, PayloadContext(self.context.get('request')))
+
+
+class CompiledProductDetailSerializer(ProductDetailSerializer):
+    """ProductDetailSerializer output through the compiled plan."""
+    plan = staticmethod(product_detail_plan)
+
+    class Meta(ProductDetailSerializer.Meta):
+        list_serializer_class = CompiledListSerializer
+
+    def to_representation(self, instance):
+        return render(self.plan(), instance, PayloadContext(self.context.get('request')))
@@ -0,0 +1,293 @@
+"""
+Disk-backed cache in front of the Spline scene used by ``spline_proxy``.
+
+* One pooled ``requests.Session`` per process, so upstream connections are reused.
+* Bodies are kept on disk per upstream URL together with the upstream validators
+  (ETag / Last-Modified); stale copies are revalidated with a conditional GET.
+* Refreshes are single-flight across threads and worker processes (``flock`` on a
+  per-URL lock file). A stale copy is served immediately while one worker refreshes
+  it in the background (stale-while-revalidate), and kept on upstream errors
+  (stale-if-error).
+* A circuit breaker stops calling an upstream that keeps failing for a cooldown.
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+SPLINE_PROXY_CACHE_DIR = getattr(settings, 'SPLINE_PROXY_CACHE_DIR', Path(settings.BASE_DIR) / 'cache' / 'spline')
+SPLINE_PROXY_TTL = getattr(settings, 'SPLINE_PROXY_TTL', 300)
+SPLINE_PROXY_TIMEOUT = getattr(settings, 'SPLINE_PROXY_TIMEOUT', (5, 15))
+SPLINE_PROXY_BREAKER_THRESHOLD = getattr(settings, 'SPLINE_PROXY_BREAKER_THRESHOLD', 3)
+SPLINE_PROXY_BREAKER_COOLDOWN = getattr(settings, 'SPLINE_PROXY_BREAKER_COOLDOWN', 30)
+
+DEFAULT_SPLINE_URL = "https://my.spline.design/nexbotrobotcharacterconcept-U710QbcCaueudeie1QgVOCuU/"
+
+FORWARDED_HEADERS = ("Cache-Control", "ETag", "Last-Modified")
+CHUNK_SIZE = 64 * 1024
+
+
+def spline_target_url(obj):
+    """Upstream to proxy: SPLINE_PROXY_UPSTREAM if set, else the stored URL, else the default scene."""
+    override = getattr(settings, 'SPLINE_PROXY_UPSTREAM', None)
+    if override:
+        return override
+    return obj.spline_url if obj and obj.spline_url else DEFAULT_SPLINE_URL
+
+
+class UpstreamError(Exception):
+    """Upstream answered with a non-200 status and nothing is cached to fall back on."""
+
+    def __init__(self, status, content, content_type):
+        super().__init__(f"Upstream returned {status}")
+        self.status = status
+        self.content = content
+        self.content_type = content_type
+
+
+class UpstreamUnavailable(Exception):
+    """The circuit breaker is open and nothing is cached."""
+
+
+class CircuitBreaker:
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # Half-open: let this call through and hold everyone else for another cooldown.
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class SplineProxyCache:
+
+    def __init__(self, directory, ttl, timeout, breaker):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.breaker = breaker
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self.session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+    # -- storage --
+
+    def _path(self, url, suffix):
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}{suffix}"
+
+    def load(self, url):
+        """Cached metadata for ``url`` (with ``body`` pointing at the body file), or None."""
+        try:
+            meta = json.loads(self._path(url, '.json').read_text())
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(meta['body']):
+            return None
+        return meta
+
+    def _write_meta(self, url, meta):
+        path = self._path(url, '.json')
+        tmp = path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path)
+
+    def is_fresh(self, meta):
+        return time.time() - meta['fetched_at'] < self.ttl
+
+    @contextmanager
+    def _flock(self, url, blocking):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._path(url, '.lock'), 'a') as fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def try_lock(self, url):
+        """
+        Non-blocking ``_flock`` for callers that cannot hold it in a ``with`` block:
+        returns the function that releases it, or None when another worker holds it.
+        """
+        stack = ExitStack()
+        if stack.enter_context(self._flock(url, blocking=False)):
+            return stack.close
+        stack.close()
+        return None
+
+    # -- upstream --
+
+    def refresh(self, url, headers, meta):
+        """Fetches (or revalidates) ``url`` and returns the new metadata. Caller holds the lock."""
+        request_headers = dict(headers)
+        if meta:
+            if meta.get('ETag'):
+                request_headers['If-None-Match'] = meta['ETag']
+            if meta.get('Last-Modified'):
+                request_headers['If-Modified-Since'] = meta['Last-Modified']
+        try:
+            upstream = self.session.get(url, timeout=self.timeout, stream=True, headers=request_headers)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+
+        with upstream:
+            if upstream.status_code == 304 and meta:
+                self.breaker.record_success()
+                meta = dict(meta, fetched_at=time.time())
+                self._write_meta(url, meta)
+                return meta
+
+            content_type = upstream.headers.get("Content-Type", "text/html; charset=utf-8")
+            if upstream.status_code != 200:
+                if upstream.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                raise UpstreamError(upstream.status_code, upstream.content, content_type)
+
+            body = self.new_body_path(url)
+            try:
+                with open(body, 'wb') as fh:
+                    for chunk in upstream.iter_content(chunk_size=CHUNK_SIZE):
+                        fh.write(chunk)
+            except (OSError, requests.RequestException):
+                body.unlink(missing_ok=True)
+                self.breaker.record_failure()
+                raise
+
+        return self.commit(url, body, upstream.headers, meta)
+
+    def new_body_path(self, url):
+        # Each version gets its own body file so readers never see a half-written one.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self._path(url, f'.{uuid.uuid4().hex}.body')
+
+    def commit(self, url, body, upstream_headers, previous=None):
+        """Publishes a fully written body file as the cached copy of ``url``."""
+        self.breaker.record_success()
+        meta = {
+            'url': url,
+            'body': str(body),
+            'fetched_at': time.time(),
+            'Content-Type': upstream_headers.get("Content-Type", "text/html; charset=utf-8"),
+        }
+        for header in FORWARDED_HEADERS:
+            if header in upstream_headers:
+                meta[header] = upstream_headers[header]
+        self._write_meta(url, meta)
+        if previous and previous['body'] != meta['body']:
+            Path(previous['body']).unlink(missing_ok=True)
+        return meta
+
+    def refresh_in_background(self, url, headers, meta):
+        with self._refreshing_lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def run():
+            try:
+                with self._flock(url, blocking=False) as acquired:
+                    if not acquired:
+                        return  # another worker is already refreshing
+                    current = self.load(url)
+                    if current and self.is_fresh(current):
+                        return
+                    try:
+                        self.refresh(url, headers, current or meta)
+                    except (requests.RequestException, UpstreamError, OSError) as exc:
+                        logger.warning("Spline refresh failed, keeping stale copy: %s", exc)
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get(self, url, headers):
+        """Metadata of a servable copy of ``url``, fetching it first if nothing is cached."""
+        meta = self.load(url)
+        if meta is not None:
+            if not self.is_fresh(meta) and self.breaker.allow():
+                self.refresh_in_background(url, headers, meta)
+            return meta
+
+        if not self.breaker.allow():
+            raise UpstreamUnavailable("Upstream is failing, retry later")
+        with self._flock(url, blocking=True):
+            # Whoever held the lock may have just filled the cache.
+            meta = self.load(url)
+            if meta is not None:
+                return meta
+            return self.refresh(url, headers, None)
+
+
+spline_cache = SplineProxyCache(
+    SPLINE_PROXY_CACHE_DIR,
+    SPLINE_PROXY_TTL,
+    SPLINE_PROXY_TIMEOUT,
+    CircuitBreaker(SPLINE_PROXY_BREAKER_THRESHOLD, SPLINE_PROXY_BREAKER_COOLDOWN),
+)
+
+
+def cached_response(request, meta):
+    """
+    Serves a cached copy, answering 304 when the client already has this ETag.
+    Returns None when the body file is gone, i.e. a refresh in another thread or
+    process replaced it after ``meta`` was loaded; callers treat that as a miss.
+    """
+    etag = meta.get("ETag")
+    if etag and request.META.get("HTTP_IF_NONE_MATCH") == etag:
+        response = HttpResponseNotModified()
+    else:
+        try:
+            body = open(meta["body"], "rb")
+        except FileNotFoundError:
+            return None
+        response = FileResponse(body, content_type=meta["Content-Type"])
+        response.headers.pop("Content-Disposition", None)
+    # Forward a few useful headers if present
+    for header in FORWARDED_HEADERS:
+        if header in meta:
+            response[header] = meta[header]
+    return response
@@ -0,0 +1,127 @@
+"""
+The hot catalog and order queries, and a check of their ``EXPLAIN`` plans.
+
+``check_query_plans`` (and the ``test_query_plans`` test case) runs every query
+in ``hot_queries()`` through ``QuerySet.explain()`` and flags the ones whose plan
+reads a whole table. A table access must narrow the rows through an index
+condition (a ``SEARCH`` on SQLite, an ``Index Cond`` on PostgreSQL). Walking a
+whole index in order (``SCAN ... USING INDEX``, an index scan without a
+condition) is accepted only for sliced top-N queries, which stop after the
+first rows. On PostgreSQL the check runs with ``enable_seqscan`` off, so a small
+seeded table still shows whether an index *can* serve the query rather than
+whether the planner prefers one today.
+"""
+import re
+from datetime import timedelta
+
+from django.db import connections
+from django.utils import timezone
+
+from .feed import feed_queryset
+from .filters import ProductFilter
+from .models import AdditionalDevice, ContactMessage, HighlightItem, Order, Product, RobotModel3D
+from .views import product_detail_queryset, product_queryset
+
+CHANGELIST_PAGE = 100
+LISTING_ORDER = ('-created_at', '-id')
+
+SQLITE_ACCESS = re.compile(r'\b(SCAN|SEARCH) (\S+)(.*)')
+SQLITE_INDEX_ORDER = re.compile(r'\bUSING (?:COVERING )?INDEX\b')
+POSTGRESQL_SEQ_SCAN = re.compile(r'Seq Scan on (\S+)')
+POSTGRESQL_INDEX_SCAN = re.compile(r'Index (?:Only )?Scan (?:Backward )?using \S+ on (\S+)')
+
+
+def hot_queries():
+    """Name -> queryset for every query a page, feed or admin changelist runs per request."""
+    now = timezone.now()
+    listing = product_queryset()
+
+    def filtered(**params):
+        return ProductFilter(params, queryset=listing).qs[:12]
+
+    return {
+        'catalog page': listing[:12],
+        'catalog page ?category=': filtered(category='robot-dogs'),
+        'catalog page ?is_available_for_sale=': filtered(is_available_for_sale='true'),
+        'catalog page ?is_available_for_rent=': filtered(is_available_for_rent='true'),
+        'category page': Product.objects.filter(product_category_id=1).order_by(*LISTING_ORDER)[:12],
+        'product detail': product_detail_queryset().filter(slug='go2'),
+        'highlight slides prefetch': HighlightItem.objects.filter(highlight_id__in=[1, 2, 3]).order_by('order'),
+        'accessories prefetch': AdditionalDevice.objects.filter(product_id__in=[1, 2, 3]).order_by('order'),
+        'robot GLB models': RobotModel3D.objects.exclude(glb_file='').filter(product__slug='go2'),
+        'site-wide GLB models': RobotModel3D.objects.exclude(glb_file='').filter(product__isnull=True),
+        'feed since watermark': feed_queryset(now - timedelta(days=1)),
+        'admin orders': Order.objects.select_related('product').order_by(*LISTING_ORDER)[:CHANGELIST_PAGE],
+        'admin orders by type': Order.objects.select_related('product')
+                                     .filter(order_type='rent').order_by(*LISTING_ORDER)[:CHANGELIST_PAGE],
+        'admin orders by month': Order.objects.select_related('product')
+                                      .filter(created_at__gte=now - timedelta(days=30), created_at__lt=now)
+                                      .order_by(*LISTING_ORDER)[:CHANGELIST_PAGE],
+        'admin contact messages': ContactMessage.objects.order_by(*LISTING_ORDER)[:CHANGELIST_PAGE],
+    }
+
+
+def explain(queryset, using='default'):
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.using(using).explain()
+
+
+def is_top_n(queryset):
+    return queryset.query.high_mark is not None
+
+
+def sqlite_full_scans(plan, top_n):
+    tables = []
+    for line in plan.splitlines():
+        match = SQLITE_ACCESS.search(line)
+        if match is None:
+            continue
+        operation, table, rest = match.groups()
+        # "SEARCH t USING INDEX i (col=?)" is an index lookup; "SCAN CONSTANT ROW" reads no table.
+        if operation == 'SEARCH' or table == 'CONSTANT':
+            continue
+        if top_n and SQLITE_INDEX_ORDER.search(rest):
+            continue
+        tables.append(table)
+    return tables
+
+
+def postgresql_full_scans(plan, top_n):
+    tables = []
+    lines = plan.splitlines()
+    for i, line in enumerate(lines):
+        match = POSTGRESQL_SEQ_SCAN.search(line)
+        if match:
+            tables.append(match.group(1))
+            continue
+        match = POSTGRESQL_INDEX_SCAN.search(line)
+        if match and not top_n:
+            # The node's own details come before the next "->" child node.
+            details = []
+            for detail in lines[i + 1:]:
+                if '->' in detail:
+                    break
+                details.append(detail)
+            if not any('Index Cond:' in detail for detail in details):
+                tables.append(match.group(1))
+    return tables
+
+
+FULL_SCAN_READERS = {
+    'postgresql': postgresql_full_scans,
+    'sqlite': sqlite_full_scans,
+}
+
+
+def full_scans(plan, vendor, top_n=False):
+    """
+    Tables the plan reads in full (in index order counts, unless ``top_n``); None
+    when the backend's plans are not understood.
+    """
+    reader = FULL_SCAN_READERS.get(vendor)
+    if reader is None:
+        return None
+    return reader(plan, top_n)
@@ -0,0 +1,89 @@
+"""
+JSON rendering for the API.
+
+``FastJSONRenderer`` is DRF's ``JSONRenderer`` with orjson doing the encoding
+when it is installed. Its output keeps DRF's format: compact separators, UTF-8
+rather than ``\\u`` escapes, escaped U+2028/U+2029, and datetimes, decimals and
+lazy strings through DRF's encoder. Indented output and anything orjson cannot
+encode (integers over 64 bits, say) go through the stdlib encoder. One difference
+remains: orjson writes NaN and Infinity as ``null`` where DRF raises.
+
+``encode_json()`` and ``EncodedResponse`` let cached views keep the encoded
+bytes rather than the data, so a hit skips both the serializers and the encoder.
+Cached bodies are kept with their gzip/brotli copies (``compression.py``), and
+the response sends the copy the client accepts.
+"""
+import json
+
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .compression import choose_encoding
+
+try:
+    import orjson
+except ImportError:  # orjson is optional: stdlib json
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def encode_json(data):
+    """``data`` as the API's JSON renderer would send it."""
+    return FastJSONRenderer().render(data)
+
+
+class EncodedResponse(Response):
+    """
+    A Response built from ``compression.compressed_variants(encode_json(...))``.
+    JSON clients get the stored bytes in the best coding they accept; the
+    browsable API and ``?indent`` requests render ``data``, which is decoded
+    from the identity bytes on first access.
+    """
+
+    def __init__(self, variants, status=None, headers=None):
+        super().__init__(None, status=status, headers=headers)
+        self.variants = variants
+        self.encoded = variants['identity']
+
+    @property
+    def data(self):
+        if self._data is None and self.encoded:
+            self._data = json.loads(self.encoded)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        if len(self.variants) > 1:
+            patch_vary_headers(self, ('Accept-Encoding',))
+        renderer = getattr(self, 'accepted_renderer', None)
+        if not (isinstance(renderer, JSONRenderer) and self.content_type is None and self.encoded
+                and renderer.get_indent(self.accepted_media_type, self.renderer_context) is None):
+            return super().rendered_content
+
+        self['Content-Type'] = renderer.media_type
+        encoding = choose_encoding(self.renderer_context['request'], self.variants)
+        if encoding != 'identity':
+            self['Content-Encoding'] = encoding
+            # The validators are computed before the coding is chosen, so like
+            # GZipMiddleware the ETag is weakened for the compressed body.
+            etag = self.get('ETag')
+            if etag and etag.startswith('"'):
+                self['ETag'] = 'W/' + etag
+        return self.variants[encoding]
@@ -0,0 +1,225 @@
+"""
+In-process multilingual product search.
+
+Every worker keeps an inverted index over the translated product names,
+descriptions, category names and the main spec strings. Text in any of the three
+site languages is folded into one Latin form (Uzbek Cyrillic and Russian are
+transliterated, Uzbek apostrophes dropped), so "робот", "robot" and "rabot" all
+land on the same postings. The index is synced lazily against the catalog version:
+after an edit only the products whose ``updated_at`` moved are re-indexed.
+"""
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils.timezone import now
+
+from .caching import get_catalog_version
+from .models import Product
+
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+UZBEK_APOSTROPHES = "'`‘’ʻʼ"
+TOKEN_RE = re.compile(r'\w+')
+
+# Field weights: names matter most, free-text descriptions least.
+NAME_WEIGHT = 3.0
+CATEGORY_WEIGHT = 2.0
+SPEC_WEIGHT = 1.5
+DESCRIPTION_WEIGHT = 1.0
+
+# Match quality multipliers for a query token against an indexed term.
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+FUZZY_MATCH = 0.6
+
+MIN_PREFIX_LENGTH = 3
+MIN_FUZZY_LENGTH = 4
+
+# Rows are stamped before their transaction commits, so incremental syncs look a
+# little further back than the previous sync started.
+WATERMARK_SLACK = timedelta(minutes=1)
+
+LANGUAGES = ('en', 'ru', 'uz')
+SPEC_FIELDS = (
+    'processor',
+    'cameras_sensors',
+    'camera_specs',
+    'battery_model',
+    'battery_capacity',
+    'bluetooth_version',
+    'protection_level',
+    'product_weight_lifting',
+)
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    for mark in UZBEK_APOSTROPHES:
+        text = text.replace(mark, '')
+    return ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+def deletes(term):
+    """Single-character deletions of ``term``; two terms within edit distance one share one."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))} | {term}
+
+
+class IndexData:
+    """
+    One version of the index. Built (or copied and patched) while the sync lock is
+    held and never changed once published, so searches read it without the lock.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)    # term -> {product_id: weighted tf}
+        self.documents = {}                  # product_id -> set of terms
+        self.neighbours = defaultdict(set)   # deletion variant -> terms
+        self.sorted_terms = []
+
+    def copy(self):
+        data = IndexData()
+        data.postings.update((term, dict(postings)) for term, postings in self.postings.items())
+        data.documents.update(self.documents)  # term sets are replaced by add(), never changed in place
+        data.neighbours.update((variant, set(terms)) for variant, terms in self.neighbours.items())
+        return data
+
+    def add(self, product_id, weights):
+        self.remove(product_id)
+        for term, weight in weights.items():
+            if term not in self.postings:
+                for variant in deletes(term):
+                    self.neighbours[variant].add(term)
+            self.postings[term][product_id] = weight
+        self.documents[product_id] = set(weights)
+
+    def remove(self, product_id):
+        for term in self.documents.pop(product_id, ()):
+            postings = self.postings[term]
+            postings.pop(product_id, None)
+            if not postings:
+                del self.postings[term]
+                for variant in deletes(term):
+                    self.neighbours[variant].discard(term)
+
+
+class ProductSearchIndex:
+
+    def __init__(self):
+        self.data = IndexData()
+        self.version = None
+        self.watermark = None
+        self._lock = threading.Lock()
+
+    # -- indexing --
+
+    def document_terms(self, product):
+        weights = defaultdict(float)
+        category = product.product_category
+        for lang in LANGUAGES:
+            fields = (
+                (getattr(product, f'product_name_{lang}', None), NAME_WEIGHT),
+                (getattr(category, f'name_{lang}', None), CATEGORY_WEIGHT),
+                (getattr(product, f'product_description_{lang}', None), DESCRIPTION_WEIGHT),
+            )
+            for text, weight in fields:
+                for token in tokenize(text):
+                    weights[token] += weight
+        for field in SPEC_FIELDS:
+            for token in tokenize(getattr(product, field)):
+                weights[token] += SPEC_WEIGHT
+        return weights
+
+    def sync(self):
+        """
+        Brings the index up to date with the catalog; a no-op while the version is
+        unchanged. The new state is built on the side and swapped in, so concurrent
+        searches keep reading the previous one meanwhile.
+        """
+        version = get_catalog_version()
+        if version == self.version:
+            return
+        with self._lock:
+            if version == self.version:
+                return
+            started = now()
+            products = Product.objects.select_related('product_category')
+            if self.watermark is None:
+                data = IndexData()
+            else:
+                data = self.data.copy()
+                live = set(Product.objects.values_list('pk', flat=True))
+                for product_id in set(data.documents) - live:
+                    data.remove(product_id)
+                products = products.filter(updated_at__gte=self.watermark) | products.filter(
+                    product_category__updated_at__gte=self.watermark
+                )
+            for product in products.iterator(chunk_size=500):
+                data.add(product.pk, self.document_terms(product))
+            data.sorted_terms = sorted(data.postings)
+            # Data before version: whoever sees the new version also sees its data.
+            self.data = data
+            self.version = version
+            self.watermark = started - WATERMARK_SLACK
+
+    # -- querying --
+
+    def expand(self, token, data=None):
+        """Indexed terms a query token may stand for, with their match quality."""
+        if data is None:
+            data = self.data
+        matches = {}
+        if token in data.postings:
+            matches[token] = EXACT_MATCH
+        if len(token) >= MIN_FUZZY_LENGTH:
+            for variant in deletes(token):
+                for term in data.neighbours.get(variant, ()):
+                    matches.setdefault(term, FUZZY_MATCH)
+        if len(token) >= MIN_PREFIX_LENGTH:
+            terms = data.sorted_terms
+            for term in terms[bisect.bisect_left(terms, token):]:
+                if not term.startswith(token):
+                    break
+                matches[term] = max(matches.get(term, 0), PREFIX_MATCH)
+        return matches
+
+    def search(self, query):
+        """Product ids matching ``query``, best first."""
+        self.sync()
+        data = self.data  # one consistent snapshot for the whole query
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        total = max(len(data.documents), 1)
+        scores = defaultdict(float)
+        hits = defaultdict(int)
+        for token in tokens:
+            best = {}
+            for term, quality in self.expand(token, data).items():
+                postings = data.postings.get(term, {})
+                idf = math.log(1 + total / len(postings))
+                for product_id, weight in postings.items():
+                    score = quality * idf * (1 + math.log(weight))
+                    if score > best.get(product_id, 0):
+                        best[product_id] = score
+            for product_id, score in best.items():
+                scores[product_id] += score
+                hits[product_id] += 1
+        # Products matching more of the query rank first, then by score.
+        return sorted(scores, key=lambda product_id: (-hits[product_id], -scores[product_id], product_id))
+
+
+product_index = ProductSearchIndex()
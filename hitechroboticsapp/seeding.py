@@ -0,0 +1,287 @@
+"""
+Synthetic catalog, content and intake data at production-like volumes.
+
+Used by ``seed_catalog`` to fill a benchmark database: categories and products
+with all three translations, their features, paragraphs, highlight slides,
+cards, showcases and accessories, the site-wide singletons, a 3D model, and
+orders and contact messages spread over the last two years. Everything is
+written with batched ``bulk_create`` and generated from a seeded RNG, so the
+same arguments produce the same data. Seeded products use the ``seed-`` slug
+prefix and seeded messages an ``@seed.invalid`` address, which is how
+``clear()`` finds them again.
+"""
+import io
+import json
+import random
+import struct
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import translation
+from django.utils.timezone import now
+from PIL import Image
+
+from .caching import bump_catalog_version, bump_content_version
+from .models import (
+    AboutCompany, AboutFeature, AdditionalDevice, Category, ContactInfo, ContactMessage, CountStat,
+    FeatureParagraph, Highlight, HighlightItem, NavigationShowcase, Order, PhoneNumber, Product,
+    ProductFeature, ProductFeatureCard, RobotModel3D, RoboticsHero, ShowroomLocation, SplineModelUrl,
+)
+from .specs import build_spec_sheets
+
+SEED_SLUG_PREFIX = 'seed-'
+SEED_EMAIL_DOMAIN = 'seed.invalid'
+SEED_BATCH_SIZE = 2000
+# Orders and messages get created_at spread over this period.
+SEED_HISTORY = timedelta(days=730)
+
+LANGUAGES = ('en', 'ru', 'uz')
+WORDS = {
+    'en': 'robot quadruped payload sensor lidar battery terrain autonomous mapping inspection agile '
+          'industrial navigation camera stable rugged carry compact module smart'.split(),
+    'ru': 'робот четвероногий нагрузка датчик лидар батарея рельеф автономный картография инспекция '
+          'ловкий промышленный навигация камера устойчивый прочный перенос компактный модуль умный'.split(),
+    'uz': "robot to'rt oyoqli yuk sensor lidar batareya relyef avtonom xaritalash tekshiruv chaqqon "
+          "sanoat navigatsiya kamera barqaror mustahkam tashish ixcham modul aqlli".split(),
+}
+# Children per product.
+PARAGRAPHS, SLIDES, CARDS, SHOWCASES, ACCESSORIES = 3, 4, 4, 2, 3
+
+PLACEHOLDER_IMAGES = {
+    'product_image/': (1200, 900),
+    'landing_image/': (1600, 900),
+    'product_images/': (1200, 900),
+    'highlights/': (1600, 900),
+    'navigation_showcase/': (1200, 800),
+    'additional_devices/': (800, 800),
+    'aboutcompany/': (1600, 900),
+    'robotImg/': (1200, 1200),
+}
+
+
+@contextmanager
+def explicit_timestamps(model, field_name='created_at'):
+    """Lets bulk_create keep the given ``auto_now_add`` value instead of stamping now()."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def minimal_glb():
+    document = json.dumps({'asset': {'version': '2.0'}, 'scenes': [{'nodes': []}]}).encode()
+    document += b' ' * (-len(document) % 4)
+    return (struct.pack('<4sII', b'glTF', 2, 12 + 8 + len(document))
+            + struct.pack('<II', len(document), 0x4E4F534A) + document)
+
+
+class CatalogSeeder:
+
+    def __init__(self, seed=0, batch_size=SEED_BATCH_SIZE, log=print):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.log = log
+        self.images = {}
+
+    def text(self, lang, words):
+        return ' '.join(self.random.choice(WORDS[lang]) for _ in range(words)).capitalize()
+
+    def translations(self, words, *fields):
+        """``{field_lang: text}`` of ``words`` random words for every field and language."""
+        return {f'{field}_{lang}': self.text(lang, words) for field in fields for lang in LANGUAGES}
+
+    def image(self, upload_to):
+        # One real file per upload directory, shared by every seeded row.
+        name = self.images.get(upload_to)
+        if name is None:
+            name = f'{upload_to}seed-placeholder.jpg'
+            if not default_storage.exists(name):
+                buffer = io.BytesIO()
+                Image.new('RGB', PLACEHOLDER_IMAGES[upload_to], (90, 110, 130)).save(buffer, 'JPEG', quality=80)
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+            self.images[upload_to] = name
+        return name
+
+    def moment(self, horizon):
+        return horizon - timedelta(seconds=self.random.randrange(int(SEED_HISTORY.total_seconds())))
+
+    # -- writers --
+
+    def seed(self, products, orders, contacts, categories=8):
+        # Translated model fields read the active language in bulk_create.
+        with translation.override('en'):
+            self.seed_content()
+            product_ids = self.seed_catalog(products, categories) if products else []
+            product_ids = product_ids or list(Product.objects.values_list('id', flat=True))
+            self.seed_orders(orders, product_ids)
+            self.seed_contacts(contacts)
+        bump_catalog_version()
+        bump_content_version()
+
+    def seed_content(self):
+        if not AboutCompany.objects.exists():
+            about = AboutCompany.objects.create(
+                image=self.image('aboutcompany/'),
+                **self.translations(2, 'title', 'section_title', 'depth_hero_title'),
+                **self.translations(40, 'subtitle', 'main_paragraph', 'section_subtitle', 'conclusion'),
+            )
+            AboutFeature.objects.bulk_create(AboutFeature(about=about, **self.translations(8, 'text'))
+                                             for _ in range(6))
+            CountStat.objects.bulk_create(CountStat(about=about, value=f'{self.random.randrange(10, 500)}+',
+                                                    **self.translations(2, 'title', 'desc'))
+                                          for _ in range(4))
+        if not ContactInfo.objects.exists():
+            contact = ContactInfo.objects.create(map_src='https://maps.example.com/embed',
+                                                 **self.translations(3, 'title', 'subtitle'))
+            contact.locations.add(ShowroomLocation.objects.create(
+                city='Tashkent', address='Amir Temur 1', lat=41.31, lon=69.27, map_src='https://maps.example.com/embed'))
+        if not RoboticsHero.objects.exists():
+            RoboticsHero.objects.create(image=self.image('robotImg/'), image_alt='Robot',
+                                        **self.translations(3, 'title', 'subtitle', 'cta_text'))
+        if not PhoneNumber.objects.exists():
+            PhoneNumber.objects.create(phone_number='+998 71 000 00 00')
+        if not SplineModelUrl.objects.exists():
+            SplineModelUrl.objects.create(spline_url='https://prod.spline.design/seed/scene.splinecode')
+        if not RobotModel3D.objects.filter(product__isnull=True).exists():
+            # Saved normally so the GLB variants get built.
+            model = RobotModel3D(lod=RobotModel3D.LOD_HIGH)
+            model.glb_file.save('seed.glb', ContentFile(minimal_glb()), save=True)
+
+    def seed_catalog(self, count, category_count):
+        stamp = now()
+        category_rows = []
+        for i in range(category_count):
+            slug = f'{SEED_SLUG_PREFIX}category-{i}'
+            category_rows.append(Category(slug=slug, **self.translations(2, 'name'),
+                                          **self.translations(20, 'description')))
+        Category.objects.bulk_create(category_rows, batch_size=self.batch_size)
+        category_ids = list(Category.objects.filter(slug__startswith=SEED_SLUG_PREFIX).values_list('id', flat=True))
+
+        product_ids = []
+        for start in range(0, count, self.batch_size):
+            batch = []
+            for i in range(start, min(start + self.batch_size, count)):
+                product = Product(
+                    slug=f'{SEED_SLUG_PREFIX}robot-{i}',
+                    product_category_id=self.random.choice(category_ids),
+                    product_quantity=self.random.randrange(0, 50),
+                    product_image=self.image('product_image/'),
+                    landing_image=self.image('landing_image/'),
+                    product_speed=self.random.randrange(1, 20),
+                    product_weight_lifting=f'{self.random.randrange(5, 100)} kg',
+                    weight_kg=round(self.random.uniform(5, 80), 1),
+                    dimensions_cm='70 x 31 x 40',
+                    protection_level=self.random.choice([None, 'IP54', 'IP67']),
+                    processor='8-core ARM',
+                    cameras_sensors='Lidar, depth camera',
+                    wifi=True,
+                    bluetooth_version='5.2',
+                    battery_life_hours=round(self.random.uniform(1, 5), 1),
+                    battery_capacity='15000 mAh',
+                    is_available_for_rent=self.random.random() < 0.4,
+                    is_available_for_sale=self.random.random() < 0.8,
+                    updated_at=stamp,
+                    **self.translations(2, 'product_name'),
+                    **self.translations(60, 'product_description'),
+                )
+                product.spec_sheets = build_spec_sheets(product)
+                batch.append(product)
+            with transaction.atomic():
+                Product.objects.bulk_create(batch, batch_size=self.batch_size)
+                ids = list(Product.objects.filter(slug__in=[p.slug for p in batch]).values_list('id', flat=True))
+                self.seed_children(ids)
+            product_ids.extend(ids)
+            self.log(f"Products: {len(product_ids)}/{count}")
+        return product_ids
+
+    def seed_children(self, product_ids):
+        features = [ProductFeature(product_id=pk, img1=self.image('product_images/'),
+                                   img2=self.image('product_images/'), img3=self.image('product_images/'),
+                                   **self.translations(3, 'title'), **self.translations(12, 'subtitle'))
+                    for pk in product_ids]
+        ProductFeature.objects.bulk_create(features, batch_size=self.batch_size)
+        feature_ids = ProductFeature.objects.filter(product_id__in=product_ids).values_list('id', flat=True)
+        FeatureParagraph.objects.bulk_create(
+            (FeatureParagraph(feature_id=pk, **self.translations(8, 'before', 'highlight', 'after'))
+             for pk in feature_ids for _ in range(PARAGRAPHS)),
+            batch_size=self.batch_size,
+        )
+
+        Highlight.objects.bulk_create((Highlight(product_id=pk, **self.translations(3, 'title'))
+                                       for pk in product_ids), batch_size=self.batch_size)
+        highlight_ids = Highlight.objects.filter(product_id__in=product_ids).values_list('id', flat=True)
+        HighlightItem.objects.bulk_create(
+            (HighlightItem(highlight_id=pk, image=self.image('highlights/'), order=n)
+             for pk in highlight_ids for n in range(SLIDES)),
+            batch_size=self.batch_size,
+        )
+
+        ProductFeatureCard.objects.bulk_create(
+            (ProductFeatureCard(product_id=pk, **self.translations(3, 'title'), **self.translations(15, 'desc'))
+             for pk in product_ids for _ in range(CARDS)),
+            batch_size=self.batch_size,
+        )
+        NavigationShowcase.objects.bulk_create(
+            (NavigationShowcase(product_id=pk, image=self.image('navigation_showcase/'),
+                                **self.translations(3, 'title'), **self.translations(15, 'description'))
+             for pk in product_ids for _ in range(SHOWCASES)),
+            batch_size=self.batch_size,
+        )
+        AdditionalDevice.objects.bulk_create(
+            (AdditionalDevice(product_id=pk, image=self.image('additional_devices/'), order=n,
+                              **self.translations(3, 'title'), **self.translations(15, 'description'))
+             for pk in product_ids for n in range(ACCESSORIES)),
+            batch_size=self.batch_size,
+        )
+
+    def seed_orders(self, count, product_ids):
+        horizon = now()
+        order_types = [value for value, _ in Order.ORDER_TYPE_CHOICES]
+        with explicit_timestamps(Order):
+            for start in range(0, count, self.batch_size):
+                batch = [
+                    Order(
+                        product_id=self.random.choice(product_ids),
+                        full_name=f'Customer {i}',
+                        company_name=self.random.choice([None, f'Company {i % 997}']),
+                        email=f'customer{i}@{SEED_EMAIL_DOMAIN}',
+                        phone=f'+998 90 {i % 10_000_000:07d}',
+                        order_type=self.random.choice(order_types),
+                        message=self.text('en', 12),
+                        created_at=self.moment(horizon),
+                    )
+                    for i in range(start, min(start + self.batch_size, count))
+                ]
+                Order.objects.bulk_create(batch)
+                if (start // self.batch_size) % 50 == 49 or start + self.batch_size >= count:
+                    self.log(f"Orders: {min(start + self.batch_size, count)}/{count}")
+
+    def seed_contacts(self, count):
+        horizon = now()
+        with explicit_timestamps(ContactMessage):
+            for start in range(0, count, self.batch_size):
+                ContactMessage.objects.bulk_create(
+                    ContactMessage(
+                        full_name=f'Visitor {i}',
+                        email=f'visitor{i}@{SEED_EMAIL_DOMAIN}',
+                        phone_number=f'+998 91 {i % 10_000_000:07d}',
+                        message=self.text('en', 30),
+                        created_at=self.moment(horizon),
+                    )
+                    for i in range(start, min(start + self.batch_size, count))
+                )
+            self.log(f"Contact messages: {count}")
+
+
+def clear():
+    """Deletes what ``CatalogSeeder`` wrote; products cascade to their children and orders."""
+    ContactMessage.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').delete()
+    Order.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').delete()
+    Product.objects.filter(slug__startswith=SEED_SLUG_PREFIX).delete()
+    Category.objects.filter(slug__startswith=SEED_SLUG_PREFIX).delete()
+    bump_catalog_version()
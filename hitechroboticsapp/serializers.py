@@ -4,23 +4,63 @@ from typing import Any, Dict
 from modeltranslation.utils import get_language
 from rest_framework import serializers
 from modeltranslation.utils import get_translation_fields
-from .specs_translations import SPECS_TRANSLATIONS
+from django.urls import reverse
+from .glb import LOD_NAMES
+from .images import variant_urls
+from .media import media_resolver
+from .specs import spec_sheet
 from .models import *
 import re
 from functools import cached_property
 
+# Literal texts and fallbacks of the product payloads; payloads.py renders the same ones.
+SPEC_LANGUAGES = ('en', 'ru', 'uz')
+DEFAULT_CARD_IMAGE = '/media/defaults/default-card.jpg'
+DEFAULT_ADDITIONAL_IMAGE = '/media/defaults/default-additional.jpg'
+FEATURE_CARDS_TITLE = "Advantages of {name}"
+ACCORDION_TITLES = {
+    "en": "Purchase additionally:",
+    "ru": "Купить дополнительно:",
+    "uz": "Qo‘shimcha xarid qilish:",
+}
+HERO_TEXTS = {
+    "en": {"subtitle": "Bionic robot in basic configuration", "priceText": "Available for rent",
+           "ctaText": "Make an order"},
+    "ru": {"subtitle": "Бионический робот в базовой комплектации", "priceText": "Доступен для аренды",
+           "ctaText": "Сделать заказ"},
+    "uz": {"subtitle": "Asosiy konfiguratsiyadagi bionik robot", "priceText": "Ijaraga olish mumkin",
+           "ctaText": "Buyurtma berish"},
+}
+
+
+class MediaImageField(serializers.ImageField):
+    """Read-only ImageField that resolves its URL through the per-request media resolver."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return media_resolver(self.context.get('request')).url(value)
 
 
 class HighlightItemSerializer(serializers.ModelSerializer):
     type = serializers.SerializerMethodField()
+    image = MediaImageField()
+    imageVariants = serializers.SerializerMethodField()
 
     class Meta:
         model = HighlightItem
-        fields = ['id', 'type', 'image', 'imageDuration']
+        fields = ['id', 'type', 'image', 'imageVariants', 'imageDuration']
 
     def get_type(self, obj):
         return "image"
 
+    def get_imageVariants(self, obj):
+        return variant_urls(obj.image, self.context.get('request'))
+
 
 class HighlightSerializer(serializers.ModelSerializer):
     slides = HighlightItemSerializer(many=True, read_only=True)
@@ -41,24 +81,27 @@ class ProductFeatureSerializer(serializers.ModelSerializer):
     img1 = serializers.SerializerMethodField()
     img2 = serializers.SerializerMethodField()
     img3 = serializers.SerializerMethodField()
+    img1_variants = serializers.SerializerMethodField()
+    img2_variants = serializers.SerializerMethodField()
+    img3_variants = serializers.SerializerMethodField()
 
     def get_img1(self, obj):
-        request = self.context.get('request')
-        if obj.img1:
-            return request.build_absolute_uri(obj.img1.url) if request else obj.img1.url
-        return None
+        return media_resolver(self.context.get('request')).url(obj.img1)
 
     def get_img2(self, obj):
-        request = self.context.get('request')
-        if obj.img2:
-            return request.build_absolute_uri(obj.img2.url) if request else obj.img2.url
-        return None
+        return media_resolver(self.context.get('request')).url(obj.img2)
 
     def get_img3(self, obj):
-        request = self.context.get('request')
-        if obj.img3:
-            return request.build_absolute_uri(obj.img3.url) if request else obj.img3.url
-        return None
+        return media_resolver(self.context.get('request')).url(obj.img3)
+
+    def get_img1_variants(self, obj):
+        return variant_urls(obj.img1, self.context.get('request'))
+
+    def get_img2_variants(self, obj):
+        return variant_urls(obj.img2, self.context.get('request'))
+
+    def get_img3_variants(self, obj):
+        return variant_urls(obj.img3, self.context.get('request'))
 
     class Meta:
         model = ProductFeature
@@ -67,6 +110,9 @@ class ProductFeatureSerializer(serializers.ModelSerializer):
                   'img1',
                   'img2',
                   'img3',
+                  'img1_variants',
+                  'img2_variants',
+                  'img3_variants',
                   'paragraphs']
 
 
@@ -78,6 +124,8 @@ class ProductSerializer(serializers.ModelSerializer):
     highlights = HighlightSerializer(source='highlight', read_only=True)
     product_category_name = serializers.SerializerMethodField()
     product_category_slug = serializers.SlugField(source='product_category.slug', read_only=True)
+    product_image = MediaImageField()
+    product_image_variants = serializers.SerializerMethodField()
 
     def get_product_category_name(self, obj):
         lang = self.context['request'].META.get('HTTP_ACCEPT_LANGUAGE', 'en')[:2]
@@ -91,6 +139,7 @@ class ProductSerializer(serializers.ModelSerializer):
             'product_name',  # локализуется автоматически через modeltranslation
             'product_description',  # то же самое
             'product_image',
+            'product_image_variants',
             'product_category_name',  # мультиязычный вывод категории
             'product_category_slug',
             'specs',
@@ -118,61 +167,11 @@ class ProductSerializer(serializers.ModelSerializer):
 
     def get_specs(self, obj):
         lang = self.context['request'].META.get('HTTP_ACCEPT_LANGUAGE', 'en')[:2]
-        lang = lang if lang in ['en', 'ru', 'uz'] else 'en'
-
-        labels = {
-            "en": {
-                "speed": "Maximum speed",
-                "capacity": "Carrying capacity",
-                "wireless": "Wireless module",
-                "autonomy": "Autonomous work"
-            },
-            "ru": {
-                "speed": "Максимальная скорость",
-                "capacity": "Грузоподъёмность",
-                "wireless": "Беспроводной модуль",
-                "autonomy": "Автономная работа"
-            },
-            "uz": {
-                "speed": "Maksimal tezlik",
-                "capacity": "Yuk ko‘tarish qobiliyati",
-                "wireless": "Simsiz aloqa moduli",
-                "autonomy": "Avtonom ish vaqti"
-            }
-        }
-
-        specs = []
-
-        if obj.product_speed:
-            specs.append({
-                "label": labels[lang]["speed"],
-                "value": f"{obj.product_speed} km/h"
-            })
-
-        if obj.product_weight_lifting:
-            specs.append({
-                "label": labels[lang]["capacity"],
-                "value": obj.product_weight_lifting
-            })
+        lang = lang if lang in SPEC_LANGUAGES else 'en'
+        return spec_sheet(obj, lang)["specs"]
 
-        connectivity = []
-        if obj.wifi:
-            connectivity.append("WiFi 6")
-        if obj.bluetooth_version:
-            connectivity.append(f"Bluetooth {obj.bluetooth_version}")
-        if connectivity:
-            specs.append({
-                "label": labels[lang]["wireless"],
-                "value": " and ".join(connectivity)
-            })
-
-        if obj.battery_life_hours:
-            specs.append({
-                "label": labels[lang]["autonomy"],
-                "value": f"{obj.battery_life_hours} hours"
-            })
-
-        return specs
+    def get_product_image_variants(self, obj):
+        return variant_urls(obj.product_image, self.context.get('request'))
 
 
 EMAIL_REGEX = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
@@ -219,10 +218,10 @@ class OrderSerializer(serializers.ModelSerializer):
         return value
 
     def to_representation(self, instance):
-        data = super().to_representation(instance)
-        # Optional: shape response for frontend
+        # Shape response for frontend. A spooled order has no id yet, only its reference.
         return {
             "id": instance.id,
+            "reference": instance.intake_ref,
             "status": "ok",
             "message": "Your request has been received. We’ll contact you soon.",
             "order": {
@@ -295,6 +294,7 @@ class ContactMessageSerializer(serializers.ModelSerializer):
             "message": "Your message has been received. We’ll contact you soon.",
             "data": {
                 "id": data["id"],
+                "reference": instance.intake_ref,
                 "fullName": data["full_name"],
                 "email": data["email"],
                 "phoneNumber": data["phone_number"],
@@ -407,8 +407,8 @@ class AboutCompanySerializer(serializers.ModelSerializer):
 
     def get_imageSrc(self, obj):
         request = self.context.get('request')
-        if obj.image and hasattr(obj.image, 'url') and request:
-            return request.build_absolute_uri(obj.image.url)
+        if request:
+            return media_resolver(request).url(obj.image)
         return None
 
     def get_featureList(self, obj):
@@ -490,42 +490,42 @@ class ProductCardSerializer(serializers.ModelSerializer):
     description = serializers.SerializerMethodField()
     slug = serializers.SlugField()
     image = serializers.SerializerMethodField()
+    imageVariants = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
-        fields = ('title', 'slug', 'description', 'image')
+        fields = ('title', 'slug', 'description', 'image', 'imageVariants')
 
     def get_description(self, obj):
         desc = obj.product_description or ''
         return desc[:50] + '...' if len(desc) > 50 else desc
 
     def get_image(self, obj):
-        request = self.context.get('request')  # 👈 get request context
-
-        image_url = None
-        if obj.landing_image and hasattr(obj.landing_image, 'url'):
-            image_url = obj.landing_image.url
-        elif obj.product_image and hasattr(obj.product_image, 'url'):
-            image_url = obj.product_image.url
-        else:
-            image_url = '/media/defaults/default-card.jpg'
+        return media_resolver(self.context.get('request')).url(
+            obj.landing_image or obj.product_image,
+            default=DEFAULT_CARD_IMAGE,
+        )
 
-        if request:
-            return request.build_absolute_uri(image_url)  # 👈 full URL
-        return image_url
+    def get_imageVariants(self, obj):
+        return variant_urls(obj.landing_image or obj.product_image, self.context.get('request'))
 
 
 class AdditionalDeviceSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    imageVariants = serializers.SerializerMethodField()
 
     class Meta:
         model = AdditionalDevice
-        fields = ['title', 'description', 'image']
+        fields = ['title', 'description', 'image', 'imageVariants']
 
     def get_image(self, obj):
-        request = self.context.get('request')
-        image_url = obj.image.url if obj.image else '/media/defaults/default-additional.jpg'
-        return request.build_absolute_uri(image_url) if request else image_url
+        return media_resolver(self.context.get('request')).url(
+            obj.image,
+            default=DEFAULT_ADDITIONAL_IMAGE,
+        )
+
+    def get_imageVariants(self, obj):
+        return variant_urls(obj.image, self.context.get('request'))
 
 
 class IntegrationAccordionSerializer(serializers.Serializer):
@@ -537,10 +537,11 @@ class NavigationShowcaseSerializer(serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
+    imageVariants = serializers.SerializerMethodField()
 
     class Meta:
         model = NavigationShowcase
-        fields = ['title', 'description', 'image']
+        fields = ['title', 'description', 'image', 'imageVariants']
 
     def get_language(self):
         request = self.context.get('request')
@@ -553,19 +554,13 @@ class NavigationShowcaseSerializer(serializers.ModelSerializer):
         return getattr(obj, f"description_{self.get_language()}", obj.description)
 
     def get_image(self, obj):
-        request = self.context.get('request')  # 👈 get request context
+        return media_resolver(self.context.get('request')).url(
+            obj.image,
+            default=DEFAULT_CARD_IMAGE,
+        )
 
-        image_url = None
-        if obj.image and hasattr(obj.image, 'url'):
-            image_url = obj.image.url
-        elif obj.product_image and hasattr(obj.image, 'url'):
-            image_url = obj.image.url
-        else:
-            image_url = '/media/defaults/default-card.jpg'
-
-        if request:
-            return request.build_absolute_uri(image_url)  # 👈 full URL
-        return image_url
+    def get_imageVariants(self, obj):
+        return variant_urls(obj.image, self.context.get('request'))
 
 
 # serializers.py
@@ -588,6 +583,8 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     product_category_name = serializers.SerializerMethodField()
     unitreeHero = serializers.SerializerMethodField()
     infoModel = serializers.SerializerMethodField()
+    product_image = MediaImageField()
+    product_image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
@@ -601,6 +598,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             'slug',
             'id',
             'product_image',
+            'product_image_variants',
             'product_category_name',
             'techSpecs',
             'product_speed',
@@ -633,72 +631,16 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         return request.LANGUAGE_CODE if request else 'en'
 
-    def translate(self, key):
-        return SPECS_TRANSLATIONS.get(key, {}).get(self.lang, key)
-
-    def bool_to_text(self, value):
-        return {
-            'en': 'Yes' if value else 'No',
-            'ru': 'Да' if value else 'Нет',
-            'uz': 'Ha' if value else 'Yo‘q'
-        }.get(self.lang, 'Yes' if value else 'No')
-
     def get_product_category_name(self, obj):
         return getattr(obj.product_category, f'name_{self.lang}', obj.product_category.name)
 
     def get_specifications(self, obj):
-        return [
-            {
-                "category": self.translate("physical"),
-                "items": [
-                    {"label": self.translate("dimensions"), "value": obj.dimensions_cm},
-                    {"label": self.translate("protection"), "value": obj.protection_level},
-                    {"label": self.translate("weight"), "value": f"{obj.weight_kg} кг"},
-                ],
-            },
-            {
-                "category": self.translate("mobility"),
-                "items": [
-                    {"label": self.translate("speed"), "value": f"{obj.product_speed} км/ч"},
-                    {"label": self.translate("lifting"), "value": obj.product_weight_lifting},
-                ],
-            },
-            {
-                "category": self.translate("electric"),
-                "items": [
-                    {"label": self.translate("battery_capacity"), "value": obj.battery_capacity or "—"},
-                    {"label": self.translate("battery_life"), "value": f"{obj.battery_life_hours} ч"},
-                ],
-            },
-            {
-                "category": self.translate("connectivity"),
-                "items": [
-                    {"label": self.translate("wifi"), "value": self.bool_to_text(obj.wifi)},
-                    {"label": self.translate("bluetooth"), "value": obj.bluetooth_version or "—"},
-                ],
-            },
-            {
-                "category": self.translate("hardware"),
-                "items": [
-                    {"label": self.translate("processor"), "value": obj.processor or "—"},
-                    {"label": self.translate("sensors"), "value": obj.cameras_sensors or "—"},
-                    {"label": self.translate("camera_specs"), "value": obj.camera_specs or "—"},
-                ],
-            },
-            {
-                "category": self.translate("functions"),
-                "items": [
-                    {"label": self.translate("voice"), "value": self.bool_to_text(obj.voice_recognition)},
-                    {"label": self.translate("light"), "value": self.bool_to_text(obj.front_light)},
-                    {"label": self.translate("strap"), "value": self.bool_to_text(obj.carrying_strap)},
-                ],
-            },
-        ]
+        return spec_sheet(obj, self.lang)["specifications"]
 
     def get_featureCards(self, obj):
         cards = obj.feature_cards.all()
         return {
-            "title": f"Advantages of {getattr(obj, f'product_name_{self.lang}', obj.product_name)}",
+            "title": FEATURE_CARDS_TITLE.format(name=getattr(obj, f'product_name_{self.lang}', obj.product_name)),
             "features": FeatureCardSerializer(cards, many=True).data
         }
 
@@ -708,77 +650,27 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     def get_integrationAccordion(self, obj):
         items = obj.additionals.all()
         return {
-            "title": {
-                "en": "Purchase additionally:",
-                "ru": "Купить дополнительно:",
-                "uz": "Qo‘shimcha xarid qilish:"
-            }.get(self.lang, "Purchase additionally:"),
+            "title": ACCORDION_TITLES.get(self.lang, ACCORDION_TITLES["en"]),
             "items": AdditionalDeviceSerializer(items, many=True, context=self.context).data
         }
 
     def get_specs(self, obj):
-        labels = {
-            "speed": {"en": "Maximum speed", "ru": "Максимальная скорость", "uz": "Maksimal tezlik"},
-            "capacity": {"en": "Carrying capacity", "ru": "Грузоподъёмность", "uz": "Yuk ko‘tarish qobiliyati"},
-            "wireless": {"en": "Wireless module", "ru": "Беспроводной модуль", "uz": "Simsiz aloqa moduli"},
-            "autonomy": {"en": "Autonomous work", "ru": "Автономная работа", "uz": "Avtonom ish vaqti"},
-        }
-        result = []
-        if obj.product_speed:
-            result.append({"label": labels["speed"][self.lang], "value": f"{obj.product_speed} km/h"})
-        if obj.product_weight_lifting:
-            result.append({"label": labels["capacity"][self.lang], "value": obj.product_weight_lifting})
-        wireless = []
-        if obj.wifi:
-            wireless.append("WiFi 6")
-        if obj.bluetooth_version:
-            wireless.append(f"Bluetooth {obj.bluetooth_version}")
-        if wireless:
-            result.append({"label": labels["wireless"][self.lang], "value": " and ".join(wireless)})
-        if obj.battery_life_hours:
-            result.append({"label": labels["autonomy"][self.lang], "value": f"{obj.battery_life_hours} hours"})
-        return result
+        return spec_sheet(obj, self.lang)["specs"]
 
     def get_techSpecs(self, obj):
-        blocks = []
-        if obj.processor:
-            blocks.append({"title": "Processors", "tags": [obj.processor]})
-        camera_tags = list(filter(None, [obj.cameras_sensors, obj.camera_specs]))
-        if camera_tags:
-            blocks.append({"title": "Cameras and sensors", "tags": camera_tags})
-        connectivity = []
-        if obj.wifi:
-            connectivity.append("WiFi 6")
-        if obj.bluetooth_version:
-            connectivity.append(f"Bluetooth {obj.bluetooth_version}")
-        if connectivity:
-            blocks.append({"title": "Additional devices", "tags": connectivity})
-        battery = list(filter(None, [
-            f"{obj.battery_life_hours} hours" if obj.battery_life_hours else None,
-            obj.battery_capacity,
-            obj.battery_model
-        ]))
-        if battery:
-            blocks.append({"title": "Battery", "tags": battery})
-        return {"blocks": blocks}
+        return spec_sheet(obj, self.lang)["techSpecs"]
 
     def get_image(self, obj):
-        request = self.context.get('request')
-        if obj.product_image and hasattr(obj.product_image, 'url'):
-            url = obj.product_image.url
-        else:
-            url = '/media/defaults/default-card.jpg'
-        return request.build_absolute_uri(url) if request else url
+        return media_resolver(self.context.get('request')).url(
+            obj.product_image,
+            default=DEFAULT_CARD_IMAGE,
+        )
+
+    def get_product_image_variants(self, obj):
+        return variant_urls(obj.product_image, self.context.get('request'))
 
     def get_unitreeHero(self, obj):
-        texts = {
-            "en": {"subtitle": "Bionic robot in basic configuration", "priceText": "Available for rent",
-                   "ctaText": "Make an order"},
-            "ru": {"subtitle": "Бионический робот в базовой комплектации", "priceText": "Доступен для аренды",
-                   "ctaText": "Сделать заказ"},
-            "uz": {"subtitle": "Asosiy konfiguratsiyadagi bionik robot", "priceText": "Ijaraga olish mumkin",
-                   "ctaText": "Buyurtma berish"},
-        }[self.lang]
+        texts = HERO_TEXTS[self.lang]
         return {
             "title": getattr(obj, f'product_name_{self.lang}', obj.product_name),
             "subtitle": texts["subtitle"],
@@ -790,18 +682,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         }
 
     def get_infoModel(self, obj):
-        texts = {
-            "en": "Available for sale",
-            "ru": "Доступен для продажи",
-            "uz": "Sotuvga mavjud"
-        }
-        return {
-            "chip": obj.battery_model,
-            "display": obj.processor,
-            "battery": obj.battery_capacity,
-            "material": obj.bluetooth_version,
-            "price": texts[self.lang]
-        }
+        return spec_sheet(obj, self.lang)["infoModel"]
 
 
 class RoboticsHeroSerializer(serializers.ModelSerializer):
@@ -816,8 +697,7 @@ class RoboticsHeroSerializer(serializers.ModelSerializer):
         fields = ['imageSrc', 'imageAlt', 'title', 'subtitle', 'ctaText']
 
     def get_imageSrc(self, obj):
-        request = self.context.get('request')
-        return request.build_absolute_uri(obj.image.url) if obj.image else None
+        return media_resolver(self.context.get('request')).url(obj.image)
 
     def get_title(self, obj):
         return getattr(obj, f"title_{get_language()}") or obj.title
@@ -829,6 +709,36 @@ class RoboticsHeroSerializer(serializers.ModelSerializer):
         return getattr(obj, f"cta_text_{get_language()}") or obj.cta_text
 
 
+class RobotModel3DSerializer(serializers.ModelSerializer):
+    lod = serializers.SerializerMethodField()
+    modelUrl = serializers.SerializerMethodField()
+    byteSize = serializers.IntegerField(source='byte_size', read_only=True)
+    meshCount = serializers.IntegerField(source='mesh_count', read_only=True)
+    primitiveCount = serializers.IntegerField(source='primitive_count', read_only=True)
+    triangleCount = serializers.IntegerField(source='triangle_count', read_only=True)
+    maxTextureSize = serializers.IntegerField(source='max_texture_size', read_only=True)
+    contentHash = serializers.CharField(source='content_hash', read_only=True)
+    textures = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RobotModel3D
+        fields = ['lod', 'modelUrl', 'byteSize', 'meshCount', 'primitiveCount', 'triangleCount',
+                  'maxTextureSize', 'contentHash', 'textures']
+
+    def get_lod(self, obj):
+        return LOD_NAMES[obj.lod]
+
+    def get_modelUrl(self, obj):
+        resolver = media_resolver(self.context.get('request'))
+        if obj.variants.get('source') == obj.glb_file.name:
+            # Immutable, range-capable copy served by robot_glb_file.
+            return resolver.absolute(reverse('robot-glb-file', args=[obj.content_hash]))
+        return resolver.url(obj.glb_file)
+
+    def get_textures(self, obj):
+        return obj.metadata.get('textures', [])
+
+
 class SplineModelUrlSerializer(serializers.ModelSerializer):
     class Meta:
         model = SplineModelUrl
@@ -0,0 +1,141 @@
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.timezone import now
+
+from .caching import bump_catalog_version, bump_content_version
+from .glb import generate_glb_variants
+from .images import IMAGE_FIELDS, generate_missing_derivatives
+from .models import (
+    AboutCompany,
+    AboutFeature,
+    AdditionalDevice,
+    Category,
+    ContactInfo,
+    CountStat,
+    Feature,
+    FeatureParagraph,
+    FeaturedService,
+    Highlight,
+    HighlightItem,
+    NavigationShowcase,
+    PhoneNumber,
+    Product,
+    ProductFeature,
+    ProductFeatureCard,
+    RobotModel3D,
+    RoboticsHero,
+    Service,
+    ShowroomLocation,
+    SplineModelUrl,
+)
+from .spool import INTAKE_SPOOL, intake_spool
+
+CATALOG_MODELS = (
+    Product,
+    ProductFeature,
+    FeatureParagraph,
+    Highlight,
+    HighlightItem,
+    AdditionalDevice,
+    NavigationShowcase,
+    ProductFeatureCard,
+    Category,
+)
+
+CONTENT_MODELS = (
+    AboutCompany,
+    AboutFeature,
+    FeaturedService,
+    CountStat,
+    Feature,
+    Service,
+    ContactInfo,
+    ShowroomLocation,
+    RoboticsHero,
+    PhoneNumber,
+    SplineModelUrl,
+    RobotModel3D,
+)
+
+# Rows whose edits refresh the updated_at of the rows that embed them: model -> (parent, lookup).
+PARENT_LOOKUPS = {
+    ProductFeature: (Product, lambda obj: {'pk': obj.product_id}),
+    FeatureParagraph: (Product, lambda obj: {'features__pk': obj.feature_id}),
+    Highlight: (Product, lambda obj: {'pk': obj.product_id}),
+    HighlightItem: (Product, lambda obj: {'highlight__pk': obj.highlight_id}),
+    AdditionalDevice: (Product, lambda obj: {'pk': obj.product_id}),
+    NavigationShowcase: (Product, lambda obj: {'pk': obj.product_id}),
+    ProductFeatureCard: (Product, lambda obj: {'pk': obj.product_id}),
+    # Feed records and search documents carry the category names.
+    Category: (Product, lambda obj: {'product_category_id': obj.pk}),
+    AboutFeature: (AboutCompany, lambda obj: {'pk': obj.about_id}),
+    FeaturedService: (AboutCompany, lambda obj: {'pk': obj.about_id}),
+    CountStat: (AboutCompany, lambda obj: {'pk': obj.about_id}),
+    Feature: (AboutCompany, lambda obj: {'pk': obj.about_id}),
+    Service: (AboutCompany, lambda obj: {'pk': obj.about_id}),
+    ShowroomLocation: (ContactInfo, lambda obj: {'locations__pk': obj.pk}),
+}
+
+
+def invalidate_catalog(sender, **kwargs):
+    # Bump after commit so a concurrent request can't re-cache pre-edit rows.
+    transaction.on_commit(bump_catalog_version)
+
+
+def invalidate_content(sender, **kwargs):
+    transaction.on_commit(bump_content_version)
+
+
+def touch_parent(sender, instance, **kwargs):
+    parent, lookup = PARENT_LOOKUPS[sender]
+    parent.objects.filter(**lookup(instance)).update(updated_at=now())
+
+
+def build_image_derivatives(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: generate_missing_derivatives(instance))
+
+
+def build_glb_variants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: generate_glb_variants(instance))
+
+
+def resume_intake_spool(sender, **kwargs):
+    intake_spool.resume()
+
+
+def touch_contact_info(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        contacts = ContactInfo.objects.filter(pk__in=pk_set or ())
+    else:
+        contacts = ContactInfo.objects.filter(pk=instance.pk)
+    contacts.update(updated_at=now())
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog, sender=model, dispatch_uid=f'catalog-save-{model.__name__}')
+    post_delete.connect(invalidate_catalog, sender=model, dispatch_uid=f'catalog-delete-{model.__name__}')
+
+for model in CONTENT_MODELS:
+    post_save.connect(invalidate_content, sender=model, dispatch_uid=f'content-save-{model.__name__}')
+    post_delete.connect(invalidate_content, sender=model, dispatch_uid=f'content-delete-{model.__name__}')
+
+for model in PARENT_LOOKUPS:
+    post_save.connect(touch_parent, sender=model, dispatch_uid=f'touch-save-{model.__name__}')
+    post_delete.connect(touch_parent, sender=model, dispatch_uid=f'touch-delete-{model.__name__}')
+
+for model in IMAGE_FIELDS:
+    post_save.connect(build_image_derivatives, sender=model, dispatch_uid=f'derivatives-save-{model.__name__}')
+
+post_save.connect(build_glb_variants, sender=RobotModel3D, dispatch_uid='glb-variants-save')
+
+m2m_changed.connect(invalidate_content, sender=ContactInfo.locations.through, dispatch_uid='content-m2m-locations')
+m2m_changed.connect(touch_contact_info, sender=ContactInfo.locations.through, dispatch_uid='touch-m2m-locations')
+
+if INTAKE_SPOOL:
+    # Rows spooled before a restart are drained even if no new submission arrives.
+    request_started.connect(resume_intake_spool, dispatch_uid='intake-spool-resume')
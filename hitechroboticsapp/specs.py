@@ -0,0 +1,171 @@
+"""
+Per-language spec blocks shown on product cards and detail pages.
+
+They depend only on the product's own columns and SPECS_TRANSLATIONS, so
+Product.save() materializes them into ``Product.spec_sheets`` for every site
+language and the serializers emit the stored JSON as-is. Run
+``manage.py rebuild_spec_sheets`` after editing the labels below or
+specs_translations.py.
+"""
+from .specs_translations import SPECS_TRANSLATIONS
+
+SPEC_LANGUAGES = ('en', 'ru', 'uz')
+
+SPEC_LABELS = {
+    "speed": {"en": "Maximum speed", "ru": "Максимальная скорость", "uz": "Maksimal tezlik"},
+    "capacity": {"en": "Carrying capacity", "ru": "Грузоподъёмность", "uz": "Yuk ko‘tarish qobiliyati"},
+    "wireless": {"en": "Wireless module", "ru": "Беспроводной модуль", "uz": "Simsiz aloqa moduli"},
+    "autonomy": {"en": "Autonomous work", "ru": "Автономная работа", "uz": "Avtonom ish vaqti"},
+}
+
+SALE_TEXTS = {
+    "en": "Available for sale",
+    "ru": "Доступен для продажи",
+    "uz": "Sotuvga mavjud"
+}
+
+
+class SpecValues:
+    """Product columns as they read back from the database (e.g. 15 -> 15.0 for floats)."""
+
+    def __init__(self, product):
+        self.product = product
+
+    def __getattr__(self, name):
+        return self.product._meta.get_field(name).to_python(getattr(self.product, name))
+
+
+def translate(key, lang):
+    return SPECS_TRANSLATIONS.get(key, {}).get(lang, key)
+
+
+def bool_to_text(value, lang):
+    return {
+        'en': 'Yes' if value else 'No',
+        'ru': 'Да' if value else 'Нет',
+        'uz': 'Ha' if value else 'Yo‘q'
+    }.get(lang, 'Yes' if value else 'No')
+
+
+def build_specs(obj, lang):
+    result = []
+    if obj.product_speed:
+        result.append({"label": SPEC_LABELS["speed"][lang], "value": f"{obj.product_speed} km/h"})
+    if obj.product_weight_lifting:
+        result.append({"label": SPEC_LABELS["capacity"][lang], "value": obj.product_weight_lifting})
+    wireless = []
+    if obj.wifi:
+        wireless.append("WiFi 6")
+    if obj.bluetooth_version:
+        wireless.append(f"Bluetooth {obj.bluetooth_version}")
+    if wireless:
+        result.append({"label": SPEC_LABELS["wireless"][lang], "value": " and ".join(wireless)})
+    if obj.battery_life_hours:
+        result.append({"label": SPEC_LABELS["autonomy"][lang], "value": f"{obj.battery_life_hours} hours"})
+    return result
+
+
+def build_specifications(obj, lang):
+    return [
+        {
+            "category": translate("physical", lang),
+            "items": [
+                {"label": translate("dimensions", lang), "value": obj.dimensions_cm},
+                {"label": translate("protection", lang), "value": obj.protection_level},
+                {"label": translate("weight", lang), "value": f"{obj.weight_kg} кг"},
+            ],
+        },
+        {
+            "category": translate("mobility", lang),
+            "items": [
+                {"label": translate("speed", lang), "value": f"{obj.product_speed} км/ч"},
+                {"label": translate("lifting", lang), "value": obj.product_weight_lifting},
+            ],
+        },
+        {
+            "category": translate("electric", lang),
+            "items": [
+                {"label": translate("battery_capacity", lang), "value": obj.battery_capacity or "—"},
+                {"label": translate("battery_life", lang), "value": f"{obj.battery_life_hours} ч"},
+            ],
+        },
+        {
+            "category": translate("connectivity", lang),
+            "items": [
+                {"label": translate("wifi", lang), "value": bool_to_text(obj.wifi, lang)},
+                {"label": translate("bluetooth", lang), "value": obj.bluetooth_version or "—"},
+            ],
+        },
+        {
+            "category": translate("hardware", lang),
+            "items": [
+                {"label": translate("processor", lang), "value": obj.processor or "—"},
+                {"label": translate("sensors", lang), "value": obj.cameras_sensors or "—"},
+                {"label": translate("camera_specs", lang), "value": obj.camera_specs or "—"},
+            ],
+        },
+        {
+            "category": translate("functions", lang),
+            "items": [
+                {"label": translate("voice", lang), "value": bool_to_text(obj.voice_recognition, lang)},
+                {"label": translate("light", lang), "value": bool_to_text(obj.front_light, lang)},
+                {"label": translate("strap", lang), "value": bool_to_text(obj.carrying_strap, lang)},
+            ],
+        },
+    ]
+
+
+def build_tech_specs(obj):
+    blocks = []
+    if obj.processor:
+        blocks.append({"title": "Processors", "tags": [obj.processor]})
+    camera_tags = list(filter(None, [obj.cameras_sensors, obj.camera_specs]))
+    if camera_tags:
+        blocks.append({"title": "Cameras and sensors", "tags": camera_tags})
+    connectivity = []
+    if obj.wifi:
+        connectivity.append("WiFi 6")
+    if obj.bluetooth_version:
+        connectivity.append(f"Bluetooth {obj.bluetooth_version}")
+    if connectivity:
+        blocks.append({"title": "Additional devices", "tags": connectivity})
+    battery = list(filter(None, [
+        f"{obj.battery_life_hours} hours" if obj.battery_life_hours else None,
+        obj.battery_capacity,
+        obj.battery_model
+    ]))
+    if battery:
+        blocks.append({"title": "Battery", "tags": battery})
+    return {"blocks": blocks}
+
+
+def build_info_model(obj, lang):
+    return {
+        "chip": obj.battery_model,
+        "display": obj.processor,
+        "battery": obj.battery_capacity,
+        "material": obj.bluetooth_version,
+        "price": SALE_TEXTS[lang]
+    }
+
+
+def build_spec_sheet(product, lang):
+    obj = SpecValues(product)
+    return {
+        "specs": build_specs(obj, lang),
+        "specifications": build_specifications(obj, lang),
+        "techSpecs": build_tech_specs(obj),
+        "infoModel": build_info_model(obj, lang),
+    }
+
+
+def build_spec_sheets(product):
+    return {lang: build_spec_sheet(product, lang) for lang in SPEC_LANGUAGES}
+
+
+def spec_sheet(product, lang):
+    """Stored sheet for ``lang``, built on the fly for rows saved before materialization."""
+    sheet = (product.spec_sheets or {}).get(lang)
+    if sheet is None:
+        sheet = build_spec_sheet(product, lang)
+    return sheet
@@ -0,0 +1,211 @@
+"""
+Write-behind intake for orders and contact messages.
+
+With ``INTAKE_SPOOL`` on, a validated submission is appended to a local SQLite
+spool in WAL mode with ``synchronous=FULL`` (so it is on disk before the 201 goes
+out) instead of being inserted into the main database. A drainer thread in each
+worker, or the ``drain_intake_spool`` command, moves the spooled rows into
+Order/ContactMessage with ``bulk_create`` every ``INTAKE_SPOOL_FLUSH_INTERVAL``
+seconds. A worker starts its drainer on its first append, or on its first
+request when an earlier process left rows behind. Every submission carries a
+unique ``intake_ref``, so a crash between the insert and the spool delete cannot
+create duplicates.
+"""
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils.timezone import now
+
+from .models import ContactMessage, Order
+
+logger = logging.getLogger(__name__)
+
+INTAKE_SPOOL = getattr(settings, 'INTAKE_SPOOL', False)
+INTAKE_SPOOL_PATH = Path(getattr(settings, 'INTAKE_SPOOL_PATH', settings.BASE_DIR / 'cache' / 'intake.sqlite3'))
+INTAKE_SPOOL_FLUSH_INTERVAL = getattr(settings, 'INTAKE_SPOOL_FLUSH_INTERVAL', 1)
+INTAKE_SPOOL_BATCH_SIZE = 500
+
+SPOOLED_MODELS = {model._meta.label_lower: model for model in (Order, ContactMessage)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    error TEXT NOT NULL
+);
+"""
+
+
+class IntakeSpool:
+
+    def __init__(self, path, interval, batch_size=INTAKE_SPOOL_BATCH_SIZE):
+        self.path = Path(path)
+        self.interval = interval
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._drainer_pid = None
+        self._drainer_lock = threading.Lock()
+        self._resumed_pid = None
+        # Rows this worker appended since its drainer last ran; a full batch wakes it early.
+        self._appended = 0
+        self._appended_lock = threading.Lock()
+
+    def connection(self):
+        # sqlite3 connections must stay in the thread that opened them.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            conn.executescript(SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def append(self, instance):
+        """Durably records an unsaved model instance; returns once it is on disk."""
+        # created_at is auto_now_add and gets stamped again by bulk_create.
+        payload = {
+            field.attname: field.value_from_object(instance)
+            for field in instance._meta.concrete_fields
+            if not field.primary_key and not getattr(field, 'auto_now_add', False)
+        }
+        self.connection().execute(
+            'INSERT INTO submissions (model, payload) VALUES (?, ?)',
+            (instance._meta.label_lower, json.dumps(payload, cls=DjangoJSONEncoder)),
+        )
+        self.start_drainer()
+        with self._appended_lock:
+            self._appended += 1
+            full = self._appended >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        return self.connection().execute('SELECT COUNT(*) FROM submissions').fetchone()[0]
+
+    @contextmanager
+    def _flock(self):
+        # One drainer per spool file at a time, across worker processes.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix('.lock'), 'a') as fh:
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def drain(self):
+        """Moves every spooled submission into the database; returns how many were moved."""
+        with self._flock() as acquired:
+            if not acquired:
+                return 0
+            conn = self.connection()
+            moved = 0
+            while True:
+                rows = conn.execute(
+                    'SELECT id, model, payload FROM submissions ORDER BY id LIMIT ?', (self.batch_size,)
+                ).fetchall()
+                if not rows:
+                    return moved
+                self._insert(conn, rows)
+                conn.execute('DELETE FROM submissions WHERE id <= ?', (rows[-1][0],))
+                moved += len(rows)
+
+    def _insert(self, conn, rows):
+        batches = {}
+        for row_id, label, payload in rows:
+            batches.setdefault(label, []).append((row_id, SPOOLED_MODELS[label](**json.loads(payload))))
+        try:
+            with transaction.atomic():
+                for label, entries in batches.items():
+                    SPOOLED_MODELS[label].objects.bulk_create(
+                        [obj for _, obj in entries], ignore_conflicts=True
+                    )
+            return
+        except DatabaseError:
+            logger.warning("Bulk insert of %d spooled submissions failed, retrying one by one", len(rows))
+
+        # A bad row (e.g. its product was deleted meanwhile) must not block the spool.
+        for label, entries in batches.items():
+            for row_id, obj in entries:
+                try:
+                    with transaction.atomic():
+                        type(obj).objects.bulk_create([obj], ignore_conflicts=True)
+                except DatabaseError as exc:
+                    logger.exception("Moving spooled %s %s to dead_letters", label, obj.intake_ref)
+                    conn.execute(
+                        'INSERT OR REPLACE INTO dead_letters (id, model, payload, error) '
+                        'SELECT id, model, payload, ? FROM submissions WHERE id = ?',
+                        (str(exc), row_id),
+                    )
+
+    def resume(self):
+        """Starts this worker's drainer if the spool still holds rows (left by a crash or a restart)."""
+        if self._resumed_pid == os.getpid():
+            return
+        self._resumed_pid = os.getpid()
+        if self.pending():
+            self.start_drainer()
+
+    def start_drainer(self):
+        # Started lazily in each worker process (after the fork).
+        if self._drainer_pid == os.getpid():
+            return
+        with self._drainer_lock:
+            if self._drainer_pid == os.getpid():
+                return
+            self._drainer_pid = os.getpid()
+            threading.Thread(target=self._run_drainer, name='intake-spool-drainer', daemon=True).start()
+
+    def _run_drainer(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._appended_lock:
+                self._appended = 0
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Draining the intake spool failed")
+            finally:
+                close_old_connections()
+
+
+intake_spool = IntakeSpool(INTAKE_SPOOL_PATH, INTAKE_SPOOL_FLUSH_INTERVAL)
+
+
+def save_submission(serializer):
+    """
+    ``serializer.save()``, or with ``INTAKE_SPOOL`` on, spool an unsaved instance
+    (``id`` stays None until the drainer inserts it) and hand it to the serializer
+    for the response.
+    """
+    if not INTAKE_SPOOL:
+        return serializer.save()
+    model = serializer.Meta.model
+    instance = model(**serializer.validated_data, intake_ref=uuid.uuid4().hex, created_at=now())
+    intake_spool.append(instance)
+    serializer.instance = instance
+    return instance
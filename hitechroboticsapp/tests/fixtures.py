@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from django.utils import translation
+
+from hitechroboticsapp.models import (
+    AdditionalDevice,
+    Category,
+    FeatureParagraph,
+    Highlight,
+    HighlightItem,
+    ImageDerivative,
+    NavigationShowcase,
+    Product,
+    ProductFeature,
+    ProductFeatureCard,
+)
+
+CREATED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def build_category(pk=1):
+    with translation.override('en'):
+        return Category.objects.create(
+            pk=pk, slug=f'robot-dogs-{pk}', name_en='Robot dogs', name_ru='Роботы-собаки', name_uz='Robot itlar',
+            description='Quadrupeds',
+        )
+
+
+def build_product(category, pk, children=2):
+    """A product with explicit ids and timestamps, and ``children`` rows of every related kind."""
+    with translation.override('en'):
+        product = Product.objects.create(
+            pk=pk, slug=f'robot-{pk}', product_category=category,
+            product_name_en=f'Robot {pk}', product_name_ru=f'Робот {pk}', product_name_uz=f'Robot {pk} uz',
+            product_description_en='Walks, runs and climbs.', product_description_ru='Ходит, бегает и лазает.',
+            product_description_uz='Yuradi, yuguradi va tirmashadi.',
+            product_quantity=3, product_image=f'product_image/robot-{pk}.jpg', product_speed=5,
+            product_weight_lifting='10 kg', weight_kg=15.0, dimensions_cm='70x31x40', protection_level='IP67',
+            voice_recognition=True, processor='8-core ARM', wifi=True, bluetooth_version='5.2',
+            battery_life_hours=2.5, battery_capacity='8000 mAh', is_available_for_rent=pk % 2 == 0,
+        )
+        feature = ProductFeature.objects.create(
+            pk=pk, product=product, title='Agile', subtitle='Moves anywhere',
+            img1=f'product_images/{pk}-1.jpg', img2=f'product_images/{pk}-2.jpg', img3='',
+        )
+        highlight = Highlight.objects.create(pk=pk, product=product, title='Highlights')
+        for n in range(children):
+            child = pk * 100 + n
+            FeatureParagraph.objects.create(pk=child, feature=feature, before='It', highlight='runs', after='fast')
+            HighlightItem.objects.create(pk=child, highlight=highlight, image=f'highlights/{child}.jpg',
+                                         order=children - n)
+            ProductFeatureCard.objects.create(pk=child, product=product, title=f'Card {n}', desc='Strong')
+            NavigationShowcase.objects.create(
+                pk=child, product=product, title_en=f'Showcase {n}', title_ru=f'Витрина {n}',
+                title_uz=f'Vitrina {n}', description_en='Sees', description_ru='Видит', description_uz="Ko'radi",
+                image=f'navigation_showcase/{child}.jpg' if n else '',
+            )
+            AdditionalDevice.objects.create(pk=child, product=product, title=f'Battery {n}', description='Spare',
+                                            image='' if n else f'additional_devices/{child}.jpg', order=n)
+    Product.objects.filter(pk=pk).update(created_at=CREATED_AT + timedelta(days=pk),
+                                         updated_at=CREATED_AT + timedelta(days=pk))
+    return Product.objects.get(pk=pk)
+
+
+def build_catalog(count, children=2):
+    category = build_category()
+    ImageDerivative.objects.create(
+        source='product_image/robot-1.jpg', width=1200, height=800,
+        variants={'webp': {'320': 'derivatives/robot-1-320.webp'}, 'jpeg': {'320': 'derivatives/robot-1-320.jpg'}},
+    )
+    return [build_product(category, pk, children) for pk in range(1, count + 1)]
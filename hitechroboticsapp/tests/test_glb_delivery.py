@@ -0,0 +1,81 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import translation
+
+from hitechroboticsapp.models import RobotModel3D
+
+DIGEST = '0123456789abcdef'
+BODY = bytes(range(256)) * 4
+BROTLI_BODY = b'brotli copy of the model'
+
+
+class GlbDeliveryTests(TestCase):
+    """Range, If-Range, 304/416 and encoding negotiation of glb_response (see glb.py)."""
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        storage = RobotModel3D._meta.get_field('glb_file').storage
+        encodings = {}
+        for encoding, suffix, body in (('identity', '', BODY), ('br', '.br', BROTLI_BODY)):
+            name = storage.save(f'models/delivery/{DIGEST}.glb{suffix}', ContentFile(body))
+            encodings[encoding] = {'name': name, 'size': len(body)}
+        RobotModel3D.objects.create(glb_file='models/robot.glb', content_hash=DIGEST,
+                                    variants={'source': 'models/robot.glb', 'encodings': encodings})
+
+    def setUp(self):
+        translation.activate('en')
+        self.addCleanup(translation.deactivate)
+
+    def get(self, **headers):
+        response = self.client.get(reverse('robot-glb-file', kwargs={'digest': DIGEST}), **headers)
+        self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def assertPartial(self, range_header, start, end):
+        response = self.get(HTTP_RANGE=range_header)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/{len(BODY)}')
+        self.assertEqual(response['Content-Length'], str(end - start + 1))
+        self.assertEqual(self.body(response), BODY[start:end + 1])
+
+    def test_ranges(self):
+        self.assertPartial('bytes=0-99', 0, 99)
+        self.assertPartial('bytes=-100', len(BODY) - 100, len(BODY) - 1)
+        self.assertPartial('bytes=500-', 500, len(BODY) - 1)
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE=f'bytes={len(BODY)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(BODY)}')
+
+    def test_if_range_mismatch_sends_whole_file(self):
+        response = self.get(HTTP_RANGE='bytes=0-99', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), BODY)
+
+    def test_if_none_match(self):
+        response = self.get(HTTP_IF_NONE_MATCH=f'"{DIGEST}"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], f'"{DIGEST}"')
+
+    def test_brotli_copy(self):
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['ETag'], f'"{DIGEST}-br"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(self.body(response), BROTLI_BODY)
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils import translation
+from rest_framework.request import Request
+
+from hitechroboticsapp.caching import catalog_version
+from hitechroboticsapp.payloads import CompiledProductDetailSerializer, CompiledProductSerializer
+from hitechroboticsapp.serializers import SPEC_LANGUAGES
+from hitechroboticsapp.tests.fixtures import build_catalog
+from hitechroboticsapp.views import product_detail_queryset, product_queryset
+
+# Rendered by ProductSerializer / ProductDetailSerializer before the compiled payloads existed,
+# from build_catalog(3) ordered by id.
+GOLDEN_DIR = Path(__file__).resolve().parent / 'golden'
+
+
+class CompiledPayloadTests(TestCase):
+    """The compiled payloads render exactly what the reference serializers rendered, in every language."""
+
+    @classmethod
+    def setUpTestData(cls):
+        build_catalog(3)
+
+    def setUp(self):
+        # The version row of an earlier test was rolled back; don't trust this process's copy of it.
+        catalog_version.expire()
+        cache.clear()
+
+    def assertMatchesGolden(self, kind, serializer_class, queryset, language):
+        with translation.override(language):
+            request = RequestFactory().get(f'/{language}/api/products/', HTTP_ACCEPT_LANGUAGE=language)
+            request.LANGUAGE_CODE = language
+            data = serializer_class(queryset.order_by('id'), many=True, context={'request': Request(request)}).data
+        golden = (GOLDEN_DIR / f'products.{kind}.{language}.json').read_text()
+        self.assertEqual(json.dumps(data, ensure_ascii=False, indent=2) + '\n', golden)
+
+    def test_product_list(self):
+        for language in SPEC_LANGUAGES:
+            with self.subTest(language=language):
+                self.assertMatchesGolden('list', CompiledProductSerializer, product_queryset(), language)
+
+    def test_product_detail(self):
+        for language in SPEC_LANGUAGES:
+            with self.subTest(language=language):
+                self.assertMatchesGolden('detail', CompiledProductDetailSerializer, product_detail_queryset(),
+                                         language)
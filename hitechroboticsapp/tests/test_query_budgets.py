@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import translation
+
+from hitechroboticsapp.caching import bump_catalog_version, catalog_version
+from hitechroboticsapp.tests.fixtures import build_catalog, build_category, build_product
+
+# Queries per request, whatever the number of products or of their child rows.
+LIST_QUERIES = 4      # count, page (category/features/highlight joined), paragraphs, slides
+SEARCH_QUERIES = 3    # page by id, paragraphs, slides
+DETAIL_QUERIES = 6    # product (joined), paragraphs, slides, cards, showcases, accessories
+
+
+class QueryBudgetTests(TestCase):
+    """The catalog endpoints cost a fixed number of queries (no N+1 through serializer fields)."""
+
+    def setUp(self):
+        # The version row of an earlier test was rolled back; don't trust this process's copy of it.
+        catalog_version.expire()
+        cache.clear()
+        translation.activate('en')
+        self.addCleanup(translation.deactivate)
+
+    def get(self, name, queries, query='', **kwargs):
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse(name, kwargs=kwargs) + query, HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def warm_up(self, name='product-list', query=''):
+        # Per-version work (image derivative manifest, search index sync) happens before the timed request.
+        self.client.get(reverse(name) + query)
+
+    def test_product_list(self):
+        build_catalog(3, children=1)
+        self.warm_up()
+        self.get('product-list', LIST_QUERIES)
+
+        category = build_category(pk=2)
+        for pk in range(10, 19):
+            build_product(category, pk, children=4)
+        self.get('product-list', LIST_QUERIES)
+        self.get('product-list', LIST_QUERIES, '?category=robot-dogs-2')
+        response = self.get('product-list', LIST_QUERIES - 1, '?cursor=')
+        self.assertEqual(len(response.json()['results']), 12)
+
+    def test_product_search(self):
+        build_catalog(2, children=1)
+        self.warm_up('product-search', '?q=robot')
+        self.get('product-search', SEARCH_QUERIES, '?q=robot')
+
+        category = build_category(pk=2)
+        for pk in range(10, 16):
+            build_product(category, pk, children=4)
+        bump_catalog_version()  # what the save signals do on commit
+        self.warm_up('product-search', '?q=robot')
+        response = self.get('product-search', SEARCH_QUERIES, '?q=robot')
+        self.assertEqual(response.json()['count'], 8)
+
+    def test_product_detail(self):
+        build_catalog(1, children=1)
+        category = build_category(pk=2)
+        build_product(category, 10, children=6)
+        self.warm_up()
+        self.get('product-detail', DETAIL_QUERIES, slug='robot-1')
+        self.get('product-detail', DETAIL_QUERIES, slug='robot-10')
+        # Served from the cached body afterwards.
+        self.get('product-detail', 0, slug='robot-10')
@@ -0,0 +1,17 @@
+from django.db import connection
+from django.test import TestCase
+
+from hitechroboticsapp.query_plans import explain, full_scans, hot_queries, is_top_n
+
+
+class QueryPlanTests(TestCase):
+    """Every hot query is served through an index condition (see query_plans.py)."""
+
+    def test_hot_queries_use_indexes(self):
+        for name, queryset in hot_queries().items():
+            with self.subTest(name):
+                plan = explain(queryset)
+                scans = full_scans(plan, connection.vendor, is_top_n(queryset))
+                if scans is None:
+                    self.skipTest(f"Don't know how to read {connection.vendor} query plans.")
+                self.assertEqual(scans, [], plan)
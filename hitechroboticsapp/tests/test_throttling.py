@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from hitechroboticsapp.throttling import SlidingWindowStore
+
+DURATION = 60
+
+
+class SlidingWindowStoreTests(SimpleTestCase):
+    """Window rollover and retry delays of the sliding-window estimate, driven with explicit clocks."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.store = SlidingWindowStore(Path(directory) / 'throttle.sqlite3')
+
+    def hit(self, now, limit):
+        return self.store.hit('client', limit, DURATION, now)
+
+    def assertBlocked(self, now, limit):
+        allowed, wait = self.hit(now, limit)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, DURATION)
+        return wait
+
+    def test_limit_within_one_window(self):
+        for now in (120, 121, 122):
+            self.assertEqual(self.hit(now, limit=3), (True, None))
+        wait = self.assertBlocked(123, limit=3)
+        self.assertAlmostEqual(wait, DURATION - 3)
+        # Two windows later nothing is left of these hits.
+        self.assertEqual(self.hit(240, limit=3), (True, None))
+
+    def test_previous_window_decays(self):
+        for now in range(60, 65):
+            self.assertTrue(self.hit(now, limit=5)[0])
+        # At the boundary the previous window still counts in full.
+        self.assertFalse(self.hit(120, limit=5)[0])
+        # A fifth of the way in it weighs 4: one more request fits, then another after a little while.
+        self.assertTrue(self.hit(132, limit=5)[0])
+        self.assertTrue(self.hit(140, limit=5)[0])
+        wait = self.assertBlocked(141, limit=5)
+        self.assertAlmostEqual(wait, 3)
+        self.assertTrue(self.hit(141 + wait + 0.1, limit=5)[0])
+
+    def test_wait_after_full_window(self):
+        for now in range(60, 65):
+            self.assertTrue(self.hit(now, limit=5)[0])
+        wait = self.assertBlocked(90, limit=5)
+        self.assertFalse(self.hit(90 + wait - 1, limit=5)[0])
+        self.assertTrue(self.hit(90 + wait + 0.1, limit=5)[0])
@@ -0,0 +1,133 @@
+"""
+Sliding-window rate limiting shared by all worker processes.
+
+DRF's stock throttles keep a list of request timestamps per client in the
+Django cache: O(n) in the rate per request, and per process with the default
+local-memory cache. Here every client key holds two counters (this fixed window
+and the previous one) in a local SQLite file, and the request count over the
+last ``duration`` seconds is estimated as
+``previous * (1 - elapsed fraction) + current``: one indexed row read and one
+upsert per request, whatever the rate, and the same count in every worker.
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.throttling import ScopedRateThrottle
+
+THROTTLE_DB_PATH = Path(getattr(settings, 'THROTTLE_DB_PATH', settings.BASE_DIR / 'cache' / 'throttle.sqlite3'))
+# Expired rows are purged once every this many hits per process.
+PURGE_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS windows (
+    key TEXT PRIMARY KEY,
+    window INTEGER NOT NULL,
+    current INTEGER NOT NULL,
+    previous INTEGER NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SlidingWindowStore:
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._hits = 0
+
+    def connection(self):
+        # sqlite3 connections must stay in the thread (and process) that opened them.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Counters are disposable: no fsync per request.
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.executescript(SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def hit(self, key, limit, duration, now):
+        """
+        Counts a request for ``key`` if it fits ``limit`` per ``duration`` seconds.
+        Returns ``(allowed, wait)`` where ``wait`` is the suggested retry delay.
+        """
+        conn = self.connection()
+        position = now / duration
+        window = int(position)
+        elapsed = position - window
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT window, current, previous FROM windows WHERE key = ?', (key,)
+            ).fetchone()
+            current = previous = 0
+            if row is not None:
+                if row[0] == window:
+                    current, previous = row[1], row[2]
+                elif row[0] == window - 1:
+                    previous = row[1]
+
+            if previous * (1 - elapsed) + current >= limit:
+                conn.execute('COMMIT')
+                return False, self._wait(limit, duration, elapsed, current, previous)
+
+            conn.execute(
+                'INSERT INTO windows (key, window, current, previous, expires) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET window = excluded.window, current = excluded.current, '
+                'previous = excluded.previous, expires = excluded.expires',
+                (key, window, current + 1, previous, (window + 2) * duration),
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._hits += 1
+        if self._hits % PURGE_EVERY == 0:
+            conn.execute('DELETE FROM windows WHERE expires < ?', (now,))
+        return True, None
+
+    @staticmethod
+    def _wait(limit, duration, elapsed, current, previous):
+        if current < limit and previous:
+            # The previous window's weight drops below the remaining budget at this fraction.
+            fraction = 1 - (limit - current) / previous
+            return max(0.0, (fraction - elapsed) * duration)
+        # Full in this window alone: wait until it has slid far enough out.
+        return (1 - elapsed + max(0.0, 1 - limit / current)) * duration
+
+
+throttle_store = SlidingWindowStore(THROTTLE_DB_PATH)
+
+
+class SlidingWindowThrottle(ScopedRateThrottle):
+    """
+    ``ScopedRateThrottle`` (rates from ``DEFAULT_THROTTLE_RATES[view.throttle_scope]``)
+    backed by the shared constant-time sliding-window store.
+    """
+    store = throttle_store
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self._wait = self.store.hit(self.key, self.num_requests, self.duration, self.timer())
+        return allowed
+
+    def wait(self):
+        return self._wait
@@ -2,107 +2,264 @@ from __future__ import annotations
 from typing import Any
 import requests
 from django.core.signing import TimestampSigner, BadSignature, SignatureExpired
-from django.http import HttpResponse, StreamingHttpResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.utils.timezone import now
-from django.views.decorators.http import require_GET
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_GET, require_safe
 from django.views.decorators.clickjacking import xframe_options_exempt
+from django.views.decorators.vary import vary_on_headers
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import ListAPIView, RetrieveAPIView
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
 from rest_framework import generics, status, permissions, viewsets
 from rest_framework.permissions import AllowAny, IsAdminUser
-from rest_framework.throttling import AnonRateThrottle
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
 from rest_framework.views import APIView
 from rest_framework.request import Request
 from rest_framework.response import Response
-from django.db.models import Q
-from rest_framework.throttling import AnonRateThrottle
+from django.db.models import Prefetch
 from django.conf import settings
+from django.core.cache import cache
 
 from .models import *
+from .caching import (
+    PRODUCT_DETAIL_CACHE_TIMEOUT,
+    catalog_etag,
+    catalog_last_modified,
+    content_etag,
+    content_last_modified,
+    product_detail_cache_key,
+    snapshot_response,
+)
+from .compression import compressed_variants
+from .feed import FEED_FORMATS, feed_lines, feed_queryset, next_watermark, parse_since
 from .filters import ProductFilter
+from .glb import HINT_HEADERS, client_lod, glb_response, pick_lod
+from .media import media_resolver
+from .metrics import registry as metrics_registry
+from .payloads import CompiledProductDetailSerializer, CompiledProductSerializer
+from .proxy import UpstreamError, UpstreamUnavailable, cached_response, spline_cache, spline_target_url
+from .renderers import EncodedResponse, encode_json
+from .search import product_index
+from .spool import save_submission
+from .throttling import SlidingWindowThrottle
 from .serializers import *
 
 
 # Create your views here.
 
+# Conditional GET: validators come from the version stamps, so a matching
+# If-None-Match / If-Modified-Since returns 304 before any query or serializer runs.
+content_condition = condition(etag_func=content_etag, last_modified_func=content_last_modified)
 
-class ProductPagination(PageNumberPagination):
+
+def catalog_condition(view):
+    # The ETag covers Accept-Language (see catalog_etag); shared caches must key on it too.
+    conditional = condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)(view)
+    return vary_on_headers('Accept-Language')(conditional)
+
+
+def robot_model_etag(request, *args, **kwargs):
+    # The payload also depends on the client hints, so no Last-Modified shortcut.
+    return '{}-{}'.format(content_etag(request), client_lod(request))
+
+
+robot_model_condition = condition(etag_func=robot_model_etag)
+
+
+def product_queryset():
+    """
+    Product queryset with every relation ProductSerializer touches loaded up front:
+    category, features and highlight are joined, paragraphs and slides are prefetched
+    (slides keep HighlightItem.Meta.ordering). Newest first, the order of the cursor
+    pages and of the catalog indexes, so page boundaries don't depend on the plan.
+    """
+    return Product.objects.order_by(*ProductCursorPagination.ordering).select_related(
+        'product_category',
+        'features',
+        'highlight',
+    ).prefetch_related(
+        'features__paragraphs',
+        Prefetch(
+            'highlight__slides',
+            queryset=HighlightItem.objects.order_by(*HighlightItem._meta.ordering),
+        ),
+    )
+
+
+def product_detail_queryset():
+    """
+    product_queryset() plus the collections ProductDetailSerializer renders, so a
+    single product costs the same number of queries however many cards, showcases
+    or accessories it has.
+    """
+    return product_queryset().prefetch_related(
+        'feature_cards',
+        'navigation_showcase',
+        Prefetch(
+            'additionals',
+            queryset=AdditionalDevice.objects.order_by(*AdditionalDevice._meta.ordering),
+        ),
+    )
+
+
+class ProductCursorPagination(CursorPagination):
+    """Keyset pagination on (created_at, id); no COUNT(*) and no OFFSET scan."""
     page_size = 12
+    ordering = ('-created_at', '-id')
+
+    def paginate_list(self, items, request):
+        # Ranked search hits are already in memory, so their cursor is a plain offset.
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request) or Cursor(offset=0, reverse=False, position=None)
+        offset = self.cursor.offset
+        self.page = items[offset:offset + self.page_size]
+        self.next_offset = offset + self.page_size if len(items) > offset + self.page_size else None
+        self.previous_offset = max(offset - self.page_size, 0) if offset else None
+        return self.page
+
+    def get_list_links(self):
+        next_link = previous_link = None
+        if self.next_offset is not None:
+            next_link = self.encode_cursor(Cursor(offset=self.next_offset, reverse=False, position=None))
+        if self.previous_offset is not None:
+            previous_link = self.encode_cursor(Cursor(offset=self.previous_offset, reverse=False, position=None))
+        return next_link, previous_link
 
 
+class ProductPagination(PageNumberPagination):
+    """
+    Page-number pagination by default. Passing ``?cursor=`` (empty for the first
+    page) switches to count-free keyset pagination, so existing page-number
+    clients keep working while others migrate.
+    """
+    page_size = 12
+    cursor_query_param = 'cursor'
+
+    def uses_cursor(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_pagination = None
+        if not self.uses_cursor(request):
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_pagination = ProductCursorPagination()
+        if isinstance(queryset, list):
+            return self.cursor_pagination.paginate_list(queryset, request)
+        return self.cursor_pagination.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is None:
+            return super().get_paginated_response(data)
+        if hasattr(self.cursor_pagination, 'next_offset'):
+            next_link, previous_link = self.cursor_pagination.get_list_links()
+            return Response({'next': next_link, 'previous': previous_link, 'results': data})
+        return self.cursor_pagination.get_paginated_response(data)
+
+
+@method_decorator(catalog_condition, name='get')
 class ProductListAPIView(ListAPIView):
-    queryset = Product.objects.all()
-    serializer_class = ProductSerializer
+    serializer_class = CompiledProductSerializer
     pagination_class = ProductPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = ProductFilter
 
+    def get_queryset(self):
+        return product_queryset()
+
 
 class OrderCreateAPIView(generics.CreateAPIView):
     serializer_class = OrderSerializer
     permission_classes = [AllowAny]
-    throttle_classes = [AnonRateThrottle]
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'orders'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        save_submission(serializer)
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
+@method_decorator(catalog_condition, name='get')
 class ProductSearchAPIView(ListAPIView):
-    serializer_class = ProductSerializer
+    """
+    Ranked search over names, descriptions, categories and specs in all three
+    languages (see search.py). Without ``q`` every product is listed.
+    """
+    serializer_class = CompiledProductSerializer
+    pagination_class = ProductPagination
+    throttle_classes = [SlidingWindowThrottle]
+    throttle_scope = 'search'
 
     def get_queryset(self):
-        queryset = Product.objects.all()
-        query = self.request.query_params.get('q')
-
-        if query:
-            queryset = queryset.filter(
-                Q(product_name__icontains=query) |
-                Q(product_category__name__icontains=query)
-            )
-        return queryset
+        return product_queryset()
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        if not queryset.exists():
+        query = self.request.query_params.get('q')
+        if not query:
+            return super().list(request, *args, **kwargs)
+
+        ranked_ids = product_index.search(query)
+        if not ranked_ids:
             return Response({
                 "message": "No robots found matching your search.",
                 "results": []
             }, status=200)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+
+        page_ids = self.paginate_queryset(ranked_ids)
+        products = self.get_queryset().in_bulk(page_ids)
+        serializer = self.get_serializer([products[pk] for pk in page_ids if pk in products], many=True)
+        return self.get_paginated_response(serializer.data)
 
 
+@method_decorator(catalog_condition, name='get')
 class CategoryListAPIView(ListAPIView):
-    queryset = Category.objects.all()
+    queryset = Category.objects.prefetch_related(
+        Prefetch('product_set', queryset=Product.objects.order_by('id')),
+    )
     serializer_class = CategorySerializer
 
 
+@method_decorator(catalog_condition, name='get')
 class ProductDetailAPIView(generics.RetrieveAPIView):
-    queryset = Product.objects.all()
-    serializer_class = ProductDetailSerializer
+    serializer_class = CompiledProductDetailSerializer
     lookup_field = 'slug'
 
+    def get_queryset(self):
+        return product_detail_queryset()
+
+    def retrieve(self, request, *args, **kwargs):
+        cache_key = product_detail_cache_key(request, kwargs[self.lookup_field])
+        variants = cache.get(cache_key)
+        if variants is None:
+            variants = compressed_variants(encode_json(super().retrieve(request, *args, **kwargs).data))
+            cache.set(cache_key, variants, PRODUCT_DETAIL_CACHE_TIMEOUT)
+        return EncodedResponse(variants)
+
 
 class ContactMessageCreateAPIView(generics.CreateAPIView):
     serializer_class = ContactMessageSerializer
     permission_classes = [AllowAny]
-    throttle_classes = [AnonRateThrottle]  # Optional: configure rate in settings
+    throttle_classes = [SlidingWindowThrottle]  # rates: DEFAULT_THROTTLE_RATES in settings
+    throttle_scope = 'contact'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        save_submission(serializer)
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
+@method_decorator(content_condition, name='get')
 class AboutCompanyAPIView(APIView):
     def get(self, request):
+        return snapshot_response(request, 'about-us', lambda: self.render(request))
+
+    def render(self, request):
         about = AboutCompany.objects.first()
         if not about:
             return Response({"error": "No about data found"}, status=404)
@@ -111,10 +268,7 @@ class AboutCompanyAPIView(APIView):
 
         depth_hero = {
             "title": about.depth_hero_title,
-            "backgroundImage": (
-                request.build_absolute_uri(about.depth_hero_image.url)
-                if about.depth_hero_image else None
-            )
+            "backgroundImage": media_resolver(request).url(about.depth_hero_image)
         }
 
         return Response({
@@ -123,6 +277,7 @@ class AboutCompanyAPIView(APIView):
         })
 
 
+@method_decorator(content_condition, name='get')
 class ContactInfoMainPageAPIView(RetrieveAPIView):
     queryset = ContactInfo.objects.all()
     serializer_class = ContactInfoSerializer
@@ -131,7 +286,12 @@ class ContactInfoMainPageAPIView(RetrieveAPIView):
         # Always return the first instance (single entry for main page)
         return ContactInfo.objects.first()
 
+    def retrieve(self, request, *args, **kwargs):
+        render = super().retrieve
+        return snapshot_response(request, 'contact-info', lambda: render(request, *args, **kwargs))
+
 
+@method_decorator(catalog_condition, name='get')
 class CategoryProductsAPIView(APIView):
 
     def get(self, request, slug):
@@ -140,8 +300,15 @@ class CategoryProductsAPIView(APIView):
         except Category.DoesNotExist:
             return Response({"error": "Category not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        products = Product.objects.filter(product_category=category)
-        serializer = ProductCardSerializer(products, many=True, context={'request': request})
+        # Explicit order: the (category, created_at) index would otherwise decide it.
+        products = Product.objects.filter(product_category=category).order_by('id')
+        paginator = ProductPagination()
+        page = None
+        if paginator.uses_cursor(request):
+            page = paginator.paginate_queryset(products, request, view=self)
+        serializer = ProductCardSerializer(
+            page if page is not None else products, many=True, context={'request': request}
+        )
 
         response_data = {
             "deviceLandingData": {
@@ -151,25 +318,57 @@ class CategoryProductsAPIView(APIView):
                 }
             }
         }
+        if page is not None:
+            cursor_pagination = paginator.cursor_pagination
+            response_data["deviceLandingData"][slug].update({
+                "next": cursor_pagination.get_next_link(),
+                "previous": cursor_pagination.get_previous_link(),
+            })
 
         return Response(response_data, status=status.HTTP_200_OK)
 
 
+@method_decorator(vary_on_headers(*HINT_HEADERS), name='get')
+@method_decorator(robot_model_condition, name='get')
 class RobotGLBModelAPIView(APIView):
+    """
+    The GLB variant that fits the client's hints (see glb.client_lod), with its
+    metadata and the other available LODs. ``?product=<slug>`` selects a product's
+    models instead of the site-wide one.
+    """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        model_instance = RobotModel3D.objects.last()
-        if model_instance and model_instance.glb_file:
-            model_url = request.build_absolute_uri(model_instance.glb_file.url)
-            return Response({"modelUrl": model_url}, status=status.HTTP_200_OK)
-        return Response({"detail": "No model uploaded."}, status=status.HTTP_404_NOT_FOUND)
-
-
+        lod = client_lod(request)
+        product = request.query_params.get('product')
+        if product:
+            # Per-product payloads are cheap to build and not worth a snapshot each.
+            response = self.render(request, lod, product)
+        else:
+            response = snapshot_response(request, f'robot-glb:{lod}', lambda: self.render(request, lod))
+        response['Accept-CH'] = ', '.join(HINT_HEADERS[1:])
+        return response
+
+    def render(self, request, lod, product=None):
+        models = RobotModel3D.objects.exclude(glb_file='')
+        models = models.filter(product__slug=product) if product else models.filter(product__isnull=True)
+        chosen, available = pick_lod(models, lod)
+        if chosen is None:
+            return Response({"detail": "No model uploaded."}, status=status.HTTP_404_NOT_FOUND)
+        context = {'request': request}
+        data = RobotModel3DSerializer(chosen, context=context).data
+        data['variants'] = RobotModel3DSerializer(available, many=True, context=context).data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+@method_decorator(content_condition, name='get')
 class RoboticsHeroView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
+        return snapshot_response(request, 'mobile-hero', lambda: self.render(request))
+
+    def render(self, request):
         hero = RoboticsHero.objects.first()
         if hero:
             serializer = RoboticsHeroSerializer(hero, context={'request': request})
@@ -177,15 +376,20 @@ class RoboticsHeroView(APIView):
         return Response({"detail": "Not found"}, status=404)
 
 
+@method_decorator(content_condition, name='get')
 class PhoneNumberView(APIView):
     permission_classes = [AllowAny]
 
-    def get(self, reqeust):
+    def get(self, request):
+        return snapshot_response(request, 'phone-number', self.render)
+
+    def render(self):
         queryset = PhoneNumber.objects.all()
         serializer = PhoneNumberSerializer(queryset, many=True)
         return Response(serializer.data)
 
 
+@method_decorator(content_condition, name='get')
 class SplineModelUrlView(APIView):
     """
     Returns all spline model URLs from the database as JSON.
@@ -194,6 +398,9 @@ class SplineModelUrlView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, *args, **kwargs):
+        return snapshot_response(request, 'spline-models', self.render)
+
+    def render(self):
         queryset = SplineModelUrl.objects.all()
         serializer = SplineModelUrlSerializer(queryset, many=True)
         return Response(serializer.data)
@@ -207,49 +414,78 @@ def spline_proxy(request):
     and avoid exposing it on the frontend.
 
     Logic:
+      - settings.SPLINE_PROXY_UPSTREAM, if set, wins (e.g. a staging stand-in)
       - If there is at least one SplineModelUrl in DB -> use the first().spline_url
       - Otherwise fall back to your hardcoded default URL.
     """
-    DEFAULT_SPLINE_URL = "https://my.spline.design/nexbotrobotcharacterconcept-U710QbcCaueudeie1QgVOCuU/"
-
     # Prefer DB value if present
     obj = SplineModelUrl.objects.first()
-    spline_url = obj.spline_url if obj and obj.spline_url else DEFAULT_SPLINE_URL
+    spline_url = spline_target_url(obj)
 
+    # Pass along a minimal set of headers; the body is cached on disk (see proxy.py)
+    headers = {
+        "User-Agent": request.META.get("HTTP_USER_AGENT", "Mozilla/5.0"),
+        "Accept": request.META.get("HTTP_ACCEPT", "*/*"),
+    }
     try:
-        # Pass along a minimal set of headers; stream to reduce memory usage
-        upstream = requests.get(
-            spline_url,
-            timeout=15,
-            stream=True,
-            headers={
-                "User-Agent": request.META.get("HTTP_USER_AGENT", "Mozilla/5.0"),
-                "Accept": request.META.get("HTTP_ACCEPT", "*/*"),
-            },
-        )
-    except requests.RequestException as e:
+        meta = spline_cache.get(spline_url, headers)
+        response = cached_response(request, meta)
+        if response is None:
+            # A refresh replaced the body after it was loaded; the new copy is in place.
+            response = cached_response(request, spline_cache.get(spline_url, headers))
+    except UpstreamError as e:
+        # If upstream error, return its payload/status to the client
+        return HttpResponse(e.content, status=e.status, content_type=e.content_type)
+    except (requests.RequestException, UpstreamUnavailable, OSError) as e:
         return HttpResponse(
             f"Upstream request failed: {e}",
             status=502,
             content_type="text/plain; charset=utf-8",
         )
 
-    # If upstream error, return its payload/status to the client
-    content_type = upstream.headers.get("Content-Type", "text/html; charset=utf-8")
-
-    if upstream.status_code != 200:
-        content = upstream.content if not upstream.raw.closed else b""
-        return HttpResponse(content, status=upstream.status_code, content_type=content_type)
-
-    # Stream success responses
-    def stream_generator():
-        for chunk in upstream.iter_content(chunk_size=64 * 1024):
-            if chunk:
-                yield chunk
-
-    resp = StreamingHttpResponse(stream_generator(), content_type=content_type)
-    # Forward a few useful headers if present
-    for hdr in ("Cache-Control", "ETag", "Last-Modified"):
-        if hdr in upstream.headers:
-            resp[hdr] = upstream.headers[hdr]
-    return resp
+    if response is None:
+        return HttpResponse("Cached copy changed while it was being read, retry", status=503,
+                            content_type="text/plain; charset=utf-8")
+    return response
+
+
+@require_safe
+def robot_glb_file(request, digest):
+    """Content-hash GLB with Range, gzip/brotli and sendfile support (see glb.py)."""
+    response = glb_response(request, digest)
+    if response is None:
+        raise Http404("No model with this hash.")
+    return response
+
+
+@require_GET
+@catalog_condition
+def product_feed(request):
+    """
+    Streams every product (or those updated after ``?since=``) with all languages,
+    specs and media URLs as NDJSON or, with ``?format=csv``, CSV. See feed.py.
+    """
+    fmt = request.GET.get('format', 'ndjson')
+    if fmt not in FEED_FORMATS:
+        return HttpResponse("format must be one of: " + ", ".join(FEED_FORMATS), status=400,
+                            content_type="text/plain; charset=utf-8")
+    try:
+        since = parse_since(request.GET['since']) if request.GET.get('since') else None
+    except ValueError as e:
+        return HttpResponse(str(e), status=400, content_type="text/plain; charset=utf-8")
+
+    watermark = next_watermark()
+    response = StreamingHttpResponse(feed_lines(feed_queryset(since), fmt, request), content_type=FEED_FORMATS[fmt])
+    response['X-Feed-Watermark'] = watermark.isoformat()
+    if fmt == 'csv':
+        response['Content-Disposition'] = 'attachment; filename="catalog.csv"'
+    return response
+
+
+class MetricsView(APIView):
+    """Per-view request histograms (metrics.py) in the Prometheus text format; admin users only."""
+    authentication_classes = [TokenAuthentication, SessionAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Serve the Spline proxy with the async, streaming view (see settings.ASYNC_SPLINE_PROXY).
+os.environ.setdefault('DJANGO_ASGI', '1')
 
 application = get_asgi_application()
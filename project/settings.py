@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    # Server-Timing headers and /api/metrics/; off unless METRICS_SAMPLE_RATE > 0.
+    'hitechroboticsapp.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -96,6 +98,57 @@ DATABASES = {
     }
 }
 
+# --------------------
+# ✅ CACHE
+# --------------------
+# Holds rendered product bodies. Local memory works, but each worker then renders
+# its own copies; point it at a backend shared by all workers (file-based, Redis,
+# ...) to share them. `check --deploy` warns about the local default.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+PRODUCT_DETAIL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Seconds a worker trusts its in-process singleton snapshots before re-reading
+# the ContentVersion row.
+CONTENT_SNAPSHOT_TTL = 5
+
+# Seconds a worker trusts its copy of the CatalogVersion row before re-reading it.
+CATALOG_VERSION_TTL = 5
+
+# Cached API bodies (snapshots, product detail) are stored with gzip/brotli copies
+# when at least this many bytes; smaller ones go out uncompressed.
+API_COMPRESSION_MIN_SIZE = 1024
+
+# spline_proxy keeps the upstream scene on disk and revalidates it after this many seconds.
+SPLINE_PROXY_CACHE_DIR = BASE_DIR / 'cache' / 'spline'
+SPLINE_PROXY_TTL = 300
+# Optional fixed upstream overriding the SplineModelUrl row (staging mirrors, load tests).
+SPLINE_PROXY_UPSTREAM = os.getenv('SPLINE_PROXY_UPSTREAM')
+
+# Set by project/asgi.py: use the async streaming Spline proxy (requires httpx).
+ASYNC_SPLINE_PROXY = os.getenv('DJANGO_ASGI') == '1'
+SPLINE_PROXY_MAX_UPSTREAM = 8
+
+# GLB delivery (glb.py): 'x-accel-redirect' (nginx, with an internal location
+# GLB_ACCEL_PREFIX aliased to MEDIA_ROOT), 'x-sendfile' (Apache/lighttpd), or unset
+# to stream from Django.
+GLB_SENDFILE = os.getenv('GLB_SENDFILE') or None
+GLB_ACCEL_PREFIX = '/protected-media/'
+
+# Write-behind intake (spool.py): orders and contact messages are appended to a
+# local SQLite WAL spool and bulk-inserted by a drainer within the flush interval.
+INTAKE_SPOOL = os.getenv('INTAKE_SPOOL') == '1'
+INTAKE_SPOOL_PATH = BASE_DIR / 'cache' / 'intake.sqlite3'
+INTAKE_SPOOL_FLUSH_INTERVAL = 1
+
+# Share of requests timed by metrics.RequestMetricsMiddleware (0 disables it, 1 times all).
+METRICS_SAMPLE_RATE = float(os.getenv('METRICS_SAMPLE_RATE', '0'))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -144,12 +197,26 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    # orjson when installed, else the stdlib encoder (see hitechroboticsapp/renderers.py).
+    'DEFAULT_RENDERER_CLASSES': [
+        'hitechroboticsapp.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
-    ]
+    ],
+    # Scopes of hitechroboticsapp.throttling.SlidingWindowThrottle (per client IP).
+    'DEFAULT_THROTTLE_RATES': {
+        'orders': '20/hour',
+        'contact': '20/hour',
+        'search': '120/min',
+    },
 }
 
+# Sliding-window throttle counters, shared by all workers on this host.
+THROTTLE_DB_PATH = BASE_DIR / 'cache' / 'throttle.sqlite3'
+
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",   # React (CRA)